@@ -4,6 +4,7 @@
 import os
 import sys
 import signal
+from collections import deque
 
 import objc
 from AppKit import *
@@ -64,6 +65,17 @@ from .listener import (
 from .listener import SWITCHER_TRIGGER
 from .components.platform_manager import PlatformManager
 from .components.config_manager import ConfigManager
+from .models.page_registry import PageRegistry, PAGE_ADDED, PAGE_REMOVED, PAGE_RENAMED, PAGE_ACTIVATED
+from .utils.suspend_policy import (
+    DEFAULT_WINDOW_COST_MB, SuspendHost, SuspendPolicy, advance_tier, scroll_restore_script, wake_window,
+)
+from .utils.load_scheduler import LoadScheduler, PRIORITY_BACKGROUND, PRIORITY_FOREGROUND, PRIORITY_RECENT, load_request
+from .utils.webview_pool import WebViewPool
+from .utils.nav_metrics import KIND_LOAD, KIND_RECREATE, KIND_RESUME, NavMetrics
+from .utils.asset_cache import AssetCache
+from .utils.bubble_scheme import BASE_URL as BUBBLE_SCHEME_BASE_URL, install_scheme_handler
+from .utils.host_matcher import registrable_domain
+from .components.webview_factory import SAFARI_USER_AGENT, WebViewFactory
 from .i18n import t as _t, set_language as _set_lang, get_language as _get_lang
 from .constants import LAUNCHER_TRIGGER
 
@@ -347,14 +359,48 @@ class AppDelegate(NSObject):
         self.platform_manager = None
         self.exit_check_timer = None  # 退出检查定时器
         # 单窗口多页面：同一 NSWindow 内持有多个后台 WKWebView
-        self._pages_map = {}
-        self._page_meta = {}
+        # 页面注册表：页面记录 + 平台/打开顺序/最近使用索引；写回配置与刷新 UI 通过订阅完成
+        self._pages = PageRegistry()
+        self._pages.subscribe(self._on_pages_changed)
+        # 页面活跃预算：超出 suspend.max_live / suspend.memory_mb 时挂起最久未用的后台页面
+        # 被挂起的页面再经过 suspend.deep_minutes 进入深度休眠：销毁 WKWebView，切换回来时重建
+        self._page_policy = SuspendPolicy(None)
+        try:
+            budget = ConfigManager.get_live_budget()
+            self._page_policy.set_live_budget(budget.get('max_live'), budget.get('memory_mb'))
+            self._page_policy.set_deep_timeout_minutes(ConfigManager.get_deep_suspend_minutes())
+        except Exception:
+            pass
+        self._page_host = SuspendHost(
+            self._pages.view,
+            self._pages.get,
+            self._pages_detach_view,
+            self._pages_recreate_view,
+            lambda wid, wv, url: self._pages_load(wid, wv, url, kind=KIND_RESUME),
+            # 休眠时的停止加载与空白页不计入导航计时
+            before_suspend=lambda wid: self._nav_metrics.ignore(wid),
+        )
+        self._page_suspend_timer = None
+        # 页面加载队列：限制同时进行的导航数，当前页 > 最近使用 > 后台预热；didFinish/didFail 释放名额
+        self._load_scheduler = LoadScheduler(start=self._start_page_load)
+        self._load_timer = None
+        # 导航计时：按页面/平台记录开始、提交、完成、失败，汇总各平台耗时直方图（调试菜单可导出 JSON）
+        self._nav_metrics = NavMetrics()
+        # 页面 WebView 统一经工厂创建（进程池策略：全局共享/按平台/按页面隔离）
+        self._webview_factory = WebViewFactory.shared()
+        # 预建 WebView 池：空闲时补充隐藏的已配置实例，新建页面直接取用（webview.pool_size，受活跃预算约束）
+        self._page_pool = WebViewPool(self._pages_build_webview, self._pages_discard_pooled,
+                                      size=ConfigManager.get_webview_pool_size())
+        self._pool_timer = None
         self._active_page_id = None
         # 批量关闭标记：用于一次性关闭大量页面时抑制重复 UI 刷新
         self._batch_closing = False
         # 批量恢复标记：启动时从配置恢复各平台页面，避免反复刷新
         self._batch_restoring = False
         self._restored_pages_done = False
+        # 恢复的页面以休眠占位登记，首次切换时才创建 WKWebView；可选按顺序后台预热（suspend.warmup_restored）
+        self._warmup_queue = deque()
+        self._warmup_timer = None
 
         # 多窗口管理器支持
         self.multiwindow_manager = None
@@ -363,6 +409,7 @@ class AppDelegate(NSObject):
         # 传统单窗口相关属性（向后兼容）
         self.window = None
         self.webview = None
+        self._homepage_scheme_handler = None  # bubble:// 主页资源（主 WebView 配置上注册）
         self.ai_selector = None  # 初始化为None，在applicationDidFinishLaunching_中创建
         self.ai_selector_map = {}  # 下拉选项索引 -> {platform_id, window_id}
         self.top_bar = None
@@ -370,6 +417,8 @@ class AppDelegate(NSObject):
         self.selector_bg = None
         self.back_button_bg = None
         self.last_loaded_is_homepage = False
+        # 主 WebView 中是否仍保留主页文档（切到多页面时文档隐藏但仍在，可直接打补丁）
+        self._homepage_resident = False
         self.root_view = None
         self.skeleton_view = None
         self._page_count_last = 0
@@ -414,12 +463,15 @@ class AppDelegate(NSObject):
             self._refresh_status_menu_titles()
         except Exception:
             pass
-        # Refresh homepage if showing
+        # Drop the cached homepage shell (localized), then refresh homepage if showing
+        try:
+            if self.homepage_manager and hasattr(self.homepage_manager, 'on_language_changed'):
+                self.homepage_manager.on_language_changed()
+        except Exception:
+            pass
         try:
             if self.navigation_controller and self.navigation_controller.current_page == 'homepage':
-                if self.homepage_manager and hasattr(self.homepage_manager, 'on_language_changed'):
-                    self.homepage_manager.on_language_changed()
-                self._load_homepage()
+                self._load_homepage(force=True)
         except Exception:
             pass
         # Notify navigation controller to update UI elements
@@ -513,25 +565,30 @@ class AppDelegate(NSObject):
                 ok = False
         return ok
 
-    def _cycle_pages(self, forward: bool = True) -> bool:
+    def _cycle_pages(self, forward: bool = True, skip=None) -> bool:
+        """按打开顺序环切页面；skip(page_id) 返回 True 的页面会被跳过（全部跳过时退回普通顺序）。"""
         try:
-            pages = list(getattr(self, '_pages_map', {}).keys())
+            pages = self._pages
             if len(pages) < 2:
                 return False
             cur = getattr(self, '_active_page_id', None)
-            try:
-                idx = pages.index(cur) if cur in pages else -1
-            except Exception:
-                idx = -1
-            if forward:
-                next_idx = 0 if idx == -1 else (idx + 1) % len(pages)
-            else:
-                next_idx = (idx - 1) % len(pages) if idx != -1 else 0
-            target = pages[next_idx]
+            target = pages.step(cur, forward, skip=skip) if skip is not None else None
+            if target is None:
+                target = pages.step(cur, forward)
+            if target is None:
+                return False
             return bool(self._pages_switch(target))
         except Exception:
             return False
 
+    def _jump_to_page(self, n: int) -> bool:
+        """切换到第 n 个页面（按打开顺序，从 1 开始；负数从末尾计）。"""
+        try:
+            target = self._pages.nth(n)
+            return bool(target) and bool(self._pages_switch(target))
+        except Exception:
+            return False
+
     # ---- Overlay helpers (dismiss) ----
     def _dismiss_overlay_ref(self, attr):
         try:
@@ -1065,6 +1122,13 @@ class AppDelegate(NSObject):
             except:
                 pass
 
+        # 落盘尚未写出的配置（后台写线程合并的快照）
+        try:
+            from .utils.config_writer import shared_writer
+            shared_writer().flush(timeout=0.8)
+        except Exception:
+            pass
+
         print("Bubble 清理完成")
         
         # 强制退出，确保不会卡住
@@ -1544,6 +1608,8 @@ class AppDelegate(NSObject):
     def applicationDidBecomeActive_(self, notification):
         # 防止重复创建
         if getattr(self, 'window_initialized', False):
+            # 激活时检查随包图标是否变化（开发模式替换资源），使共享资源缓存失效
+            self._refresh_changed_assets()
             return
         self.window_initialized = True
         # 再次确保 Dock 图标为自定义圆角版本
@@ -1640,8 +1706,11 @@ class AppDelegate(NSObject):
         self.window.setFrameAutosaveName_(FRAME_SAVE_NAME)
         # Create the webview for the main application.
         print("创建 WebView 配置...")
-        config = WKWebViewConfiguration.alloc().init()
-        config.preferences().setJavaScriptCanOpenWindowsAutomatically_(True)
+        # 经 WebView 工厂创建配置（共享进程池、不限平台的用户脚本）；限定平台的脚本（点击修复等）
+        # 在每次加载平台页前由 retarget_platform_scripts 换装
+        config = self._webview_factory.configuration()
+        # 主页资源（样式、脚本、图标）经 bubble:// 协议从内存缓存提供；注册失败时主页回退为内联
+        self._homepage_scheme_handler = install_scheme_handler(config)
         # Initialize the WebView with a frame
         print("创建 WebView...")
         webview_frame = ((0, 0), (800, 600))  # Frame: origin (0,0), size (800x600)
@@ -1677,8 +1746,7 @@ class AppDelegate(NSObject):
         except Exception:
             pass
         # Set a custom user agent
-        safari_user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15"
-        self.webview.setCustomUserAgent_(safari_user_agent)
+        self.webview.setCustomUserAgent_(SAFARI_USER_AGENT)
         # 设置窗口属性：窗口本身透明，圆角由根视图绘制
         try:
             self.window.setOpaque_(False)
@@ -2216,6 +2284,17 @@ class AppDelegate(NSObject):
             menu.addItem_(self.menu_debug_tour_item)
         except Exception:
             pass
+        # Debug: Dump navigation timing
+        try:
+            self.menu_debug_nav_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_("Dump Navigation Timing (Debug)", "dumpNavigationMetrics:", "")
+            self.menu_debug_nav_item.setTarget_(self)
+            try:
+                self.menu_debug_nav_item.setImage_(NSImage.imageWithSystemSymbolName_accessibilityDescription_("stopwatch", None))
+            except Exception:
+                pass
+            menu.addItem_(self.menu_debug_nav_item)
+        except Exception:
+            pass
         menu.addItem_(NSMenuItem.separatorItem())
         # Quit
         self.menu_quit_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_("Quit", "terminate:", "q")
@@ -2572,7 +2651,23 @@ class AppDelegate(NSObject):
     def goToWebsite_(self, sender):
         url = NSURL.URLWithString_(WEBSITE)
         request = NSURLRequest.requestWithURL_(url)
+        self._webview_factory.retarget_platform_scripts(self.webview, self._platform_for_url(WEBSITE))
         self.webview.loadRequest_(request)
+        self._homepage_resident = False
+
+    def _platform_for_url(self, url):
+        """URL 所属的平台 ID（按可注册域名匹配已知平台），未知时返回 None"""
+        try:
+            from urllib.parse import urlsplit
+            domain = registrable_domain(urlsplit(url).hostname)
+            platforms = self.homepage_manager.get_available_platforms() if self.homepage_manager else {}
+            for pid in platforms:
+                platform_url = self._get_platform_url(pid)
+                if platform_url and registrable_domain(urlsplit(platform_url).hostname) == domain:
+                    return pid
+        except Exception:
+            pass
+        return None
 
     # Clear the webview cache data (in case cookies cause errors).
     def clearWebViewData_(self, sender):
@@ -2636,6 +2731,28 @@ class AppDelegate(NSObject):
         except Exception as e:
             print(f"WARNING: 无法启动主页引导: {e}")
 
+    def dumpNavigationMetrics_(self, sender):
+        """调试：导出各平台导航耗时（JSON）到应用支持目录并在 Finder 中显示。"""
+        try:
+            path = os.path.join(ConfigManager._new_app_support_dir(), "nav_metrics.json")
+            self._nav_metrics.dump(path)
+            print(f"导航计时已导出: {path}")
+            import json as _json
+            print(_json.dumps(self._nav_metrics.summary(), ensure_ascii=False))
+            try:
+                NSWorkspace.sharedWorkspace().selectFile_inFileViewerRootedAtPath_(path, "")
+            except Exception:
+                pass
+        except Exception as e:
+            print(f"WARNING: 导出导航计时失败: {e}")
+
+    def _nav_page(self, webView):
+        """导航回调中的 WebView -> (页面ID, 平台ID)；主页等非页面 WebView 返回 (None, None)。"""
+        record = self._pages.find_by_view(webView)
+        if record is None:
+            return None, None
+        return record.page_id, record.platform_id
+
     # Refresh hint when menu opens (hotkey may have changed)
     def menuWillOpen_(self, menu):
         try:
@@ -2771,16 +2888,8 @@ class AppDelegate(NSObject):
                     if self.is_multiwindow_mode:
                         # 单窗口多页面：统一走导航控制器，避免手动切换导致 UI 不同步
                         try:
-                            # 优先最近创建/使用的一个
-                            ordered = []
-                            try:
-                                ordered = sorted(
-                                    [(wid, meta) for wid, meta in self._page_meta.items() if meta.get('platform_id') == platform_id],
-                                    key=lambda kv: kv[1].get('created_at') or 0
-                                )
-                            except Exception:
-                                ordered = []
-                            target_id = ordered[-1][0] if ordered else None
+                            # 优先该平台最近使用的页面
+                            target_id = self._pages.most_recent(platform_id)
                             self.navigation_controller.handle_ai_selector_change(platform_id, target_id)
                         except Exception:
                             pass
@@ -2842,7 +2951,7 @@ class AppDelegate(NSObject):
                         try:
                             # 批量关闭，避免重复刷新下拉
                             self._batch_closing = True
-                            targets = [wid for wid, meta in list(self._page_meta.items()) if meta.get('platform_id') == platform_id]
+                            targets = self._pages.page_ids(platform_id)
                             for wid in targets:
                                 try:
                                     self._pages_close(wid)
@@ -2867,19 +2976,15 @@ class AppDelegate(NSObject):
                             except Exception:
                                 pass
                         # 无刷新更新行状态、下拉与气泡
-                        self._update_homepage_platform_active(platform_id, False)
+                        self._sync_homepage((platform_id,))
                         try:
                             self._populate_ai_selector(include_home_first=True)
                         except Exception:
                             pass
-                        try:
-                            self._update_homepage_window_count(platform_id)
-                        except Exception:
-                            pass
                         return
                     # 非多页面模式：仅更新配置与 UI
                     self.homepage_manager.remove_platform(platform_id)
-                    self._update_homepage_platform_active(platform_id, False)
+                    self._sync_homepage((platform_id,))
                     try:
                         self._set_ai_selector_to_home()
                     except Exception:
@@ -2897,7 +3002,7 @@ class AppDelegate(NSObject):
                     if self.is_multiwindow_mode:
                         try:
                             # 若该平台暂无任何页面（运行时或配置中都没有），则后台创建一个
-                            runtime_exists = any((meta.get('platform_id') == platform_id) for meta in self._page_meta.values())
+                            runtime_exists = self._pages.count(platform_id) > 0
                             config_exists = False
                             try:
                                 config_exists = bool(self.homepage_manager.get_platform_windows(platform_id))
@@ -2915,8 +3020,7 @@ class AppDelegate(NSObject):
                         except Exception:
                             pass
                         # 同步主页行与下拉
-                        self._update_homepage_platform_active(platform_id, True)
-                        self._update_homepage_window_count(platform_id)
+                        self._sync_homepage((platform_id,))
                         try:
                             self._populate_ai_selector(include_home_first=True)
                         except Exception:
@@ -2935,8 +3039,7 @@ class AppDelegate(NSObject):
                             self.homepage_manager.add_platform_window(platform_id, new_id, { 'createdAt': str(NSDate.date()) })
                     except Exception:
                         pass
-                    self._update_homepage_platform_active(platform_id, True)
-                    self._update_homepage_window_count(platform_id)
+                    self._sync_homepage((platform_id,))
                     try:
                         self._set_ai_selector_to_home()
                     except Exception:
@@ -2968,7 +3071,7 @@ class AppDelegate(NSObject):
                             old_platform_cnt = 0
                         ok = self.homepage_manager.add_platform_window(platform_id, new_id, { 'createdAt': str(NSDate.date()) })
                         if ok:
-                            self._update_homepage_window_count(platform_id)
+                            self._sync_homepage((platform_id,))
                             try:
                                 self._set_ai_selector_to_home()
                             except Exception:
@@ -2994,7 +3097,7 @@ class AppDelegate(NSObject):
                                 old_cnt = 0
                             ok = self.homepage_manager.remove_platform_window(platform_id, wid)
                             if ok:
-                                self._update_homepage_window_count(platform_id)
+                                self._sync_homepage((platform_id,))
                                 try:
                                     self._set_ai_selector_to_home()
                                 except Exception:
@@ -3230,7 +3333,7 @@ class AppDelegate(NSObject):
                 pass
             # 调整单窗口多页面的 WebView 布局
             try:
-                for _wid, _wv in list(getattr(self, '_pages_map', {}).items()):
+                for _wv in self._pages.views():
                     _wv.setFrame_(NSMakeRect(0, 0, content_bounds.size.width, content_bounds.size.height))
                 
             except Exception:
@@ -3267,18 +3370,10 @@ class AppDelegate(NSObject):
                         self.navigation_controller.handle_ai_selector_change(platform_id, window_id)
                     else:
                         # 兜底：直接切换到指定/现有/新建页面
-                        if window_id and window_id in getattr(self, '_pages_map', {}):
+                        if window_id and window_id in self._pages:
                             self._pages_switch(window_id)
                         else:
-                            target = None
-                            try:
-                                ordered = sorted(
-                                    [(wid, meta) for wid, meta in self._page_meta.items() if meta.get('platform_id') == platform_id],
-                                    key=lambda kv: kv[1].get('created_at') or 0
-                                )
-                                target = ordered[0][0] if ordered else None
-                            except Exception:
-                                target = None
+                            target = self._pages.most_recent(platform_id)
                             if target:
                                 self._pages_switch(target)
                             else:
@@ -3300,6 +3395,126 @@ class AppDelegate(NSObject):
                 return
 
     # -------- 单窗口多页面：核心实现 --------
+    def _on_pages_changed(self, event, record):
+        """页面注册表变更：写回配置，并同步下拉、主页气泡与页面计数（批量操作期间由调用方统一刷新）。"""
+        pid = record.platform_id
+        hm = getattr(self, 'homepage_manager', None)
+        if event in (PAGE_ADDED, PAGE_ACTIVATED):
+            self._note_page_activity(record)
+        elif event == PAGE_REMOVED:
+            self._page_policy.forget(record.page_id)
+            self._load_scheduler.cancel(record.page_id)
+            self._webview_factory.release(record.page_id)
+            self._nav_metrics.forget(record.page_id)
+        if event == PAGE_ADDED:
+            if hm and not record.restored:
+                hm.add_platform_window(pid, record.page_id, { 'createdAt': str(NSDate.date()) })
+        elif event == PAGE_REMOVED:
+            if hm:
+                hm.remove_platform_window(pid, record.page_id)
+        elif event == PAGE_RENAMED:
+            if hm:
+                hm.rename_platform_window(pid, record.page_id, record.title)
+            return
+        else:
+            return
+        if getattr(self, '_batch_restoring', False) or getattr(self, '_batch_closing', False):
+            return
+        new_count = len(self._pages)
+        old_count = new_count - 1 if event == PAGE_ADDED else new_count + 1
+        if not record.restored or event == PAGE_REMOVED:
+            try:
+                self._populate_ai_selector(include_home_first=True)
+            except Exception:
+                pass
+            try:
+                self._sync_homepage((pid,))
+            except Exception:
+                pass
+        # 触发页面计数变化回调（用于阈值 toast）
+        self.notify_page_count_changed(old_count, new_count)
+
+    def _note_page_activity(self, record):
+        """页面被创建/切换：必要时恢复该页，并在超出活跃预算时挂起最久未用的后台页面。"""
+        policy = self._page_policy
+        wid = record.page_id
+        if record.view is None and not policy.is_suspended(wid):
+            # 休眠占位（启动恢复的页面）：不计入活跃预算，切换时再创建
+            policy.mark_suspended(wid, deep=True)
+            return
+        try:
+            if policy.is_suspended(wid):
+                wake_window(policy, wid, self._page_host)
+            policy.note_window_activity(wid)
+            foreground = getattr(self, '_active_page_id', None)
+            for victim in policy.pick_evictions(foreground=foreground):
+                advance_tier(policy, victim, self._page_host, foreground=foreground)
+            # 预算紧张时收缩预建池
+            limit = self._page_pool_limit()
+            if limit is not None:
+                self._page_pool.trim(limit)
+        except Exception as e:
+            print(f"WARNING: 页面活跃预算处理失败: {e}")
+        self._arm_page_suspend_timer()
+
+    def _arm_page_suspend_timer(self):
+        """单次定时器对准页面策略中最早的截止时间（到期后轻度休眠的页面升级为深度休眠）。"""
+        try:
+            if self._page_suspend_timer is not None:
+                self._page_suspend_timer.invalidate()
+        except Exception:
+            pass
+        self._page_suspend_timer = None
+        try:
+            due = self._page_policy.next_deadline()
+            if due is None:
+                return
+            interval = max(0.5, float(due) - self._page_policy.now())
+            self._page_suspend_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+                interval, self, 'tickPageSuspend:', None, False
+            )
+        except Exception:
+            pass
+
+    def tickPageSuspend_(self, _timer):
+        self._page_suspend_timer = None
+        try:
+            foreground = getattr(self, '_active_page_id', None)
+            for wid in self._page_policy.pop_due():
+                advance_tier(self._page_policy, wid, self._page_host, foreground=foreground)
+        except Exception as e:
+            print(f"WARNING: 页面休眠处理失败: {e}")
+        self._arm_page_suspend_timer()
+
+    def _pages_detach_view(self, window_id):
+        """深度休眠：移除并释放页面的 WKWebView，记录保留为占位。"""
+        record = self._pages.get(window_id)
+        if record is None or record.view is None:
+            return
+        wv = record.view
+        record.view = None
+        self._load_scheduler.cancel(window_id)
+        self._webview_factory.release(window_id)
+        try:
+            wv.setUIDelegate_(None)
+            wv.setNavigationDelegate_(None)
+            wv.removeFromSuperview()
+        except Exception:
+            pass
+
+    def _pages_recreate_view(self, window_id, url=None):
+        """深度休眠唤醒：为页面重建 WKWebView（隐藏），按后台优先级排队加载休眠前的 URL（切换时再提升）。"""
+        record = self._pages.get(window_id)
+        if record is None:
+            return None
+        wv = self._pages_new_webview(True, record.platform_id, window_id)
+        if wv is None:
+            return None
+        record.view = wv
+        self._pages_load(window_id, wv, url or self._get_platform_url(record.platform_id), PRIORITY_BACKGROUND,
+                         kind=KIND_RECREATE)
+        return wv
+
     def _pages_frame(self):
         try:
             b = self.root_view.bounds()
@@ -3307,83 +3522,153 @@ class AppDelegate(NSObject):
         except Exception:
             return NSMakeRect(0, 0, 800, 600)
 
+    def _pages_new_webview(self, background: bool = True, platform_id=None, page_id=None):
+        """取一个页面 WKWebView，background 为 False 时显示。
+
+        预建池中的实例使用全局共享进程池；平台配置为独立进程池时直接新建。
+        """
+        if self._webview_factory.pool_key(platform_id, page_id) == self._webview_factory.pool_key():
+            wv = self._page_pool.acquire()
+            # 预建实例创建时平台未知，补装该平台的用户脚本（首次加载前）
+            self._webview_factory.attach_platform_scripts(wv, platform_id)
+            self._schedule_pool_replenish()
+        else:
+            wv = self._pages_build_webview(platform_id, page_id)
+        if wv is None:
+            return None
+        try:
+            wv.setHidden_(bool(background))
+        except Exception:
+            pass
+        return wv
+
+    def _pages_build_webview(self, platform_id=None, page_id=None):
+        """经工厂创建并配置页面 WKWebView，隐藏放到顶栏之下。"""
+        try:
+            wv = self._webview_factory.create(self._pages_frame(), platform_id, page_id,
+                                              ui_delegate=self, navigation_delegate=self)
+        except Exception as e:
+            print(f"WARNING: 创建页面 WKWebView 失败: {e}")
+            return None
+        try:
+            wv.setAcceptsTouchEvents_(True)
+            wv.setOpaque_(True)
+            wv.setValue_forKey_(True, "drawsBackground")
+        except Exception:
+            pass
+        # 添加到 root_view（先隐藏）
+        try:
+            # 将页面视图放在顶栏之下，确保顶栏始终可见
+            if hasattr(self.root_view, 'addSubview_positioned_relativeTo_') and getattr(self, 'top_bar', None) is not None:
+                self.root_view.addSubview_positioned_relativeTo_(wv, NSWindowBelow, self.top_bar)
+            else:
+                self.root_view.addSubview_(wv)
+                # 最后再把顶栏移到最上层
+                try:
+                    if hasattr(self.root_view, 'addSubview_positioned_relativeTo_') and self.webview is not None:
+                        self.top_bar.removeFromSuperview()
+                        self.root_view.addSubview_positioned_relativeTo_(self.top_bar, NSWindowAbove, wv)
+                except Exception:
+                    pass
+        except Exception:
+            pass
+        try:
+            wv.setHidden_(True)
+        except Exception:
+            pass
+        return wv
+
+    def _pages_discard_pooled(self, wv):
+        try:
+            wv.setUIDelegate_(None)
+            wv.setNavigationDelegate_(None)
+            wv.removeFromSuperview()
+        except Exception:
+            pass
+
+    def _page_pool_limit(self):
+        """活跃预算剩余可容纳的 WebView 数（无预算时为 None），预建池不超过该值。"""
+        policy = self._page_policy
+        max_live, memory_mb = policy.get_live_budget()
+        limits = []
+        if max_live is not None:
+            limits.append(max_live - len(policy.live_window_ids()))
+        if memory_mb is not None:
+            limits.append(int((memory_mb - policy.estimated_live_mb()) // DEFAULT_WINDOW_COST_MB))
+        return max(0, min(limits)) if limits else None
+
+    def _schedule_pool_replenish(self, delay: float = 1.0):
+        if self._pool_timer is not None:
+            return
+        try:
+            if not self._page_pool.needs_replenish(self._page_pool_limit()):
+                return
+            self._pool_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+                delay, self, 'replenishPagePool:', None, False
+            )
+        except Exception:
+            self._pool_timer = None
+
+    def replenishPagePool_(self, _timer):
+        """定时器回调：空闲时补充一个预建 WebView，未满则继续排下一次。"""
+        self._pool_timer = None
+        try:
+            self._page_pool.replenish(self._page_pool_limit())
+        except Exception as e:
+            print(f"WARNING: 预建 WebView 失败: {e}")
+            return
+        self._schedule_pool_replenish()
+
+    def _pages_load(self, window_id, wv, url, priority=PRIORITY_RECENT, kind=KIND_LOAD):
+        """经加载队列加载页面（名额已满时排队）；kind 用于导航计时区分新加载/休眠恢复/重建。"""
+        try:
+            self._nav_metrics.expect(window_id, kind)
+            self._load_scheduler.request(window_id, wv, url, priority)
+        except Exception as e:
+            print(f"WARNING: 页面加载排队失败: {e}")
+
+    def _start_page_load(self, wv, url):
+        """加载队列分配到名额时调用：发起导航并对准超时检查定时器。"""
+        load_request(wv, url)
+        self._arm_load_timer()
+
+    def _arm_load_timer(self):
+        if self._load_timer is not None:
+            return
+        try:
+            due = self._load_scheduler.next_timeout()
+            if due is None:
+                return
+            interval = max(0.5, float(due) - self._load_scheduler.now())
+            self._load_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+                interval, self, 'tickPageLoads:', None, False
+            )
+        except Exception:
+            self._load_timer = None
+
+    def tickPageLoads_(self, _timer):
+        """定时器回调：释放超时仍未完成的导航名额。"""
+        self._load_timer = None
+        try:
+            self._load_scheduler.expire()
+        except Exception:
+            pass
+        self._arm_load_timer()
+
     def _pages_create(self, platform_id: str, background: bool = True):
         """在同一窗口内创建一个新的 WKWebView 页面，后台加载并加入下拉。返回 window_id 或 None。"""
         try:
-            # 记录变更前页面数量（基于 _pages_map）
-            try:
-                _old_pages_count = int(len(getattr(self, '_pages_map', {})))
-            except Exception:
-                _old_pages_count = 0
             from uuid import uuid4
             wid = str(uuid4())
-            cfg = WKWebViewConfiguration.alloc().init()
-            try:
-                cfg.preferences().setJavaScriptCanOpenWindowsAutomatically_(True)
-            except Exception:
-                pass
-            wv = WKWebView.alloc().initWithFrame_configuration_(self._pages_frame(), cfg)
-            try:
-                wv.setUIDelegate_(self)
-                wv.setNavigationDelegate_(self)
-                wv.setAutoresizingMask_(NSViewWidthSizable | NSViewHeightSizable)
-                wv.setAcceptsTouchEvents_(True)
-                wv.setOpaque_(True)
-                wv.setValue_forKey_(True, "drawsBackground")
-                safari_user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15"
-                wv.setCustomUserAgent_(safari_user_agent)
-            except Exception:
-                pass
-            # 添加到 root_view（先隐藏）
-            try:
-                # 将页面视图放在顶栏之下，确保顶栏始终可见
-                if hasattr(self.root_view, 'addSubview_positioned_relativeTo_') and getattr(self, 'top_bar', None) is not None:
-                    self.root_view.addSubview_positioned_relativeTo_(wv, NSWindowBelow, self.top_bar)
-                else:
-                    self.root_view.addSubview_(wv)
-                    # 最后再把顶栏移到最上层
-                    try:
-                        if hasattr(self.root_view, 'addSubview_positioned_relativeTo_') and self.webview is not None:
-                            self.top_bar.removeFromSuperview()
-                            self.root_view.addSubview_positioned_relativeTo_(self.top_bar, NSWindowAbove, wv)
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-            try:
-                wv.setHidden_(bool(background))
-            except Exception:
-                pass
-            # 记录与加载
-            self._pages_map[wid] = wv
-            from Foundation import NSDate
-            try:
-                created_at = NSDate.date()
-            except Exception:
-                created_at = None
-            self._page_meta[wid] = { 'platform_id': platform_id, 'created_at': created_at }
-            try:
-                url = self._get_platform_url(platform_id)
-                if url:
-                    nsurl = NSURL.URLWithString_(url)
-                    req = NSURLRequest.requestWithURL_(nsurl)
-                    wv.loadRequest_(req)
-            except Exception:
-                pass
-            # 实时同步下拉与主页气泡
+            wv = self._pages_new_webview(background, platform_id, wid)
+            if wv is None:
+                return None
+            # 登记（订阅者写回配置并同步下拉、主页气泡与页面计数）与加载
+            self._pages.add(wid, platform_id, wv)
+            self._pages_load(wid, wv, self._get_platform_url(platform_id),
+                             PRIORITY_RECENT if background else PRIORITY_FOREGROUND)
             try:
-                if self.homepage_manager:
-                    from Foundation import NSDate as _NSDate
-                    self.homepage_manager.add_platform_window(platform_id, wid, { 'createdAt': str(_NSDate.date()) })
                 if not getattr(self, '_batch_restoring', False):
-                    self._populate_ai_selector(include_home_first=True)
-                    self._update_homepage_window_count(platform_id)
-                    # 触发页面计数变化回调（用于阈值 toast）
-                    try:
-                        _new_pages_count = int(len(getattr(self, '_pages_map', {})))
-                    except Exception:
-                        _new_pages_count = _old_pages_count
-                    self.notify_page_count_changed(_old_pages_count, _new_pages_count)
                     # 成功提示（小号淡色）
                     try:
                         msg = self._i18n_or_default('toast.added', '已添加')
@@ -3398,74 +3683,27 @@ class AppDelegate(NSObject):
             print(f"WARNING: _pages_create 失败: {e}")
             return None
 
-    def _pages_create_for_id(self, platform_id: str, window_id: str, background: bool = True):
-        """使用指定的 window_id 在当前窗口创建 WKWebView（用于从配置恢复）。"""
+    def _pages_create_for_id(self, platform_id: str, window_id: str, background: bool = True,
+                             dormant: bool = False):
+        """使用指定的 window_id 在当前窗口创建 WKWebView（用于从配置恢复）。
+
+        dormant 为 True 时只登记占位记录（出现在下拉与主页气泡中），首次切换或预热时才创建并加载。
+        """
         try:
             if not platform_id or not window_id:
                 return None
             # 已存在则跳过
-            if window_id in self._pages_map:
+            if window_id in self._pages:
                 return window_id
-            # 记录变更前计数
-            try:
-                _old_pages_count = int(len(getattr(self, '_pages_map', {})))
-            except Exception:
-                _old_pages_count = 0
-            cfg = WKWebViewConfiguration.alloc().init()
-            try:
-                cfg.preferences().setJavaScriptCanOpenWindowsAutomatically_(True)
-            except Exception:
-                pass
-            wv = WKWebView.alloc().initWithFrame_configuration_(self._pages_frame(), cfg)
-            try:
-                wv.setUIDelegate_(self)
-                wv.setNavigationDelegate_(self)
-                wv.setAutoresizingMask_(NSViewWidthSizable | NSViewHeightSizable)
-                wv.setAcceptsTouchEvents_(True)
-                wv.setOpaque_(True)
-                wv.setValue_forKey_(True, "drawsBackground")
-                safari_user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15"
-                wv.setCustomUserAgent_(safari_user_agent)
-            except Exception:
-                pass
-            # 添加到 root_view（先隐藏）
-            try:
-                if hasattr(self.root_view, 'addSubview_positioned_relativeTo_') and getattr(self, 'top_bar', None) is not None:
-                    self.root_view.addSubview_positioned_relativeTo_(wv, NSWindowBelow, self.top_bar)
-                else:
-                    self.root_view.addSubview_(wv)
-                    try:
-                        if hasattr(self.root_view, 'addSubview_positioned_relativeTo_') and self.webview is not None:
-                            self.top_bar.removeFromSuperview()
-                            self.root_view.addSubview_positioned_relativeTo_(self.top_bar, NSWindowAbove, wv)
-                    except Exception:
-                        pass
-                wv.setHidden_(bool(background))
-            except Exception:
-                pass
-            # 记录与加载（不写回 HomepageManager）
-            self._pages_map[window_id] = wv
-            from Foundation import NSDate
-            try:
-                created_at = NSDate.date()
-            except Exception:
-                created_at = None
-            self._page_meta[window_id] = { 'platform_id': platform_id, 'created_at': created_at }
-            try:
-                url = self._get_platform_url(platform_id)
-                if url:
-                    nsurl = NSURL.URLWithString_(url)
-                    req = NSURLRequest.requestWithURL_(nsurl)
-                    wv.loadRequest_(req)
-            except Exception:
-                pass
-            # 变更后计数提示（恢复阶段只在非批量时提示）
-            try:
-                if not getattr(self, '_batch_restoring', False):
-                    _new_pages_count = int(len(getattr(self, '_pages_map', {})))
-                    self.notify_page_count_changed(_old_pages_count, _new_pages_count)
-            except Exception:
-                pass
+            if dormant:
+                self._pages.add(window_id, platform_id, None, restored=True)
+                return window_id
+            wv = self._pages_new_webview(background, platform_id, window_id)
+            if wv is None:
+                return None
+            # 登记与加载（restored=True：已在配置中，不写回 HomepageManager）
+            self._pages.add(window_id, platform_id, wv, restored=True)
+            self._pages_load(window_id, wv, self._get_platform_url(platform_id), PRIORITY_BACKGROUND)
             return window_id
         except Exception:
             return None
@@ -3479,6 +3717,8 @@ class AppDelegate(NSObject):
                 return
             if not getattr(self, 'homepage_manager', None):
                 return
+            # 启动后空闲时预建 WebView，首次“添加页面”即可直接取用
+            self._schedule_pool_replenish(delay=2.0)
             all_windows = {}
             try:
                 all_windows = self.homepage_manager.get_all_windows() or {}
@@ -3493,7 +3733,8 @@ class AppDelegate(NSObject):
                 try:
                     for wid in list(win_map.keys()):
                         try:
-                            self._pages_create_for_id(pid, wid, background=True)
+                            if self._pages_create_for_id(pid, wid, background=True, dormant=True):
+                                self._warmup_queue.append(wid)
                         except Exception:
                             pass
                 except Exception:
@@ -3505,12 +3746,47 @@ class AppDelegate(NSObject):
             except Exception:
                 pass
             self._restored_pages_done = True
+            if ConfigManager.get_warmup_restored():
+                self._schedule_page_warmup()
+            else:
+                self._warmup_queue.clear()
         except Exception:
             pass
 
+    def _schedule_page_warmup(self, delay: float = 1.5):
+        if self._warmup_timer is not None or not self._warmup_queue:
+            return
+        try:
+            self._warmup_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+                delay, self, 'warmUpNextPage:', None, False
+            )
+        except Exception:
+            self._warmup_timer = None
+
+    def warmUpNextPage_(self, _timer):
+        """定时器回调：后台物化下一个休眠占位页面（一次一个；活跃预算已满时停止）。"""
+        self._warmup_timer = None
+        policy = self._page_policy
+        while self._warmup_queue:
+            wid = self._warmup_queue.popleft()
+            record = self._pages.get(wid)
+            # 已关闭或已被用户切换物化的页面直接跳过
+            if record is None or record.view is not None:
+                continue
+            if not policy.has_live_capacity(wid):
+                self._warmup_queue.clear()
+                return
+            try:
+                wake_window(policy, wid, self._page_host)
+            except Exception as e:
+                print(f"WARNING: 预热页面失败: {e}")
+            break
+        self._schedule_page_warmup()
+
     def _pages_switch(self, window_id: str) -> bool:
         try:
-            if window_id not in self._pages_map:
+            target = self._pages.get(window_id)
+            if target is None:
                 return False
             # 隐藏主页 WebView
             try:
@@ -3519,21 +3795,30 @@ class AppDelegate(NSObject):
             except Exception:
                 pass
             # 隐藏当前页
-            if self._active_page_id and self._active_page_id in self._pages_map:
+            current = self._pages.view(self._active_page_id)
+            if current is not None:
                 try:
-                    self._pages_map[self._active_page_id].setHidden_(True)
+                    current.setHidden_(True)
                 except Exception:
                     pass
+            # 深度休眠的页面先重建 WKWebView，轻度休眠的恢复原 URL
+            try:
+                if target.view is None or self._page_policy.is_suspended(window_id):
+                    wake_window(self._page_policy, window_id, self._page_host)
+                self._load_scheduler.promote(window_id, PRIORITY_FOREGROUND)
+            except Exception as e:
+                print(f"WARNING: 唤醒页面失败: {e}")
             # 显示目标
             try:
-                self._pages_map[window_id].setHidden_(False)
+                target.view.setHidden_(False)
             except Exception:
                 pass
             self._active_page_id = window_id
+            self._pages.activate(window_id)
+            pid = target.platform_id
             # 窗口标题与返回键
             try:
                 self.update_back_button_visibility(True)
-                pid = self._page_meta.get(window_id, {}).get('platform_id')
                 base = self._i18n_or_default('app.name', 'Bubble')
                 chat = self._i18n_or_default('nav.chat', 'Chat')
                 name = self._i18n_or_default(f'platform.{pid}', (pid or 'AI').title()) if pid else 'AI'
@@ -3555,7 +3840,6 @@ class AppDelegate(NSObject):
                 pass
             # 下拉选中该页
             try:
-                pid = self._page_meta.get(window_id, {}).get('platform_id')
                 self._suppress_ai_action = True
                 try:
                     self._select_ai_item(pid, window_id)
@@ -3565,7 +3849,7 @@ class AppDelegate(NSObject):
                 pass
             # 若目标页仍在加载中，显示骨架；否则隐藏
             try:
-                wv = self._pages_map.get(window_id)
+                wv = target.view
                 loading = False
                 try:
                     loading = bool(wv.isLoading()) if hasattr(wv, 'isLoading') else False
@@ -3583,28 +3867,21 @@ class AppDelegate(NSObject):
 
     def _pages_close(self, window_id: str) -> bool:
         try:
-            try:
-                _old_pages_count = int(len(getattr(self, '_pages_map', {})))
-            except Exception:
-                _old_pages_count = 0
-            meta = self._page_meta.get(window_id) or {}
-            pid = meta.get('platform_id')
-            wv = self._pages_map.get(window_id)
-            if wv is not None:
-                try:
-                    wv.removeFromSuperview()
-                except Exception:
-                    pass
-            self._pages_map.pop(window_id, None)
-            self._page_meta.pop(window_id, None)
-            if getattr(self, '_active_page_id', None) == window_id:
+            record = self._pages.get(window_id)
+            pid = record.platform_id if record is not None else None
+            was_active = getattr(self, '_active_page_id', None) == window_id
+            if was_active:
                 self._active_page_id = None
-                # 切到该平台其他页，或回主页
-                alt = None
+            if record is not None and record.view is not None:
                 try:
-                    alt = next((wid for wid, mm in self._page_meta.items() if mm.get('platform_id') == pid), None)
+                    record.view.removeFromSuperview()
                 except Exception:
-                    alt = None
+                    pass
+            # 注销（订阅者写回配置并同步下拉、主页气泡与页面计数）
+            self._pages.remove(window_id)
+            if was_active:
+                # 切到该平台最近使用的其他页，或回主页
+                alt = self._pages.most_recent(pid) if pid else None
                 if alt:
                     self._pages_switch(alt)
                 else:
@@ -3621,19 +3898,8 @@ class AppDelegate(NSObject):
                         self._load_homepage()
                     except Exception:
                         pass
-            # 同步 UI（支持批量关闭时抑制重复刷新）
             try:
-                if self.homepage_manager and pid and window_id:
-                    self.homepage_manager.remove_platform_window(pid, window_id)
                 if not getattr(self, '_batch_closing', False):
-                    self._populate_ai_selector(include_home_first=True)
-                    if pid:
-                        self._update_homepage_window_count(pid)
-                    try:
-                        _new_pages_count = int(len(getattr(self, '_pages_map', {})))
-                    except Exception:
-                        _new_pages_count = max(0, _old_pages_count - 1)
-                    self.notify_page_count_changed(_old_pages_count, _new_pages_count)
                     # 删除成功提示（小号淡色）
                     try:
                         msg = self._i18n_or_default('toast.removed', '已删除')
@@ -3681,22 +3947,10 @@ class AppDelegate(NSObject):
                 pass
 
         # 优先使用单窗口多页面的实时列表；否则回退到 HomepageManager 配置
-        if self.is_multiwindow_mode and getattr(self, '_page_meta', None) is not None:
-            # 按平台分组 self._page_meta（window_id -> meta）
-            grouped = {}
-            for wid, meta in self._page_meta.items():
-                try:
-                    pid = meta.get('platform_id')
-                    if not pid:
-                        continue
-                    grouped.setdefault(pid, []).append((wid, meta))
-                except Exception:
-                    pass
+        if self.is_multiwindow_mode and getattr(self, '_pages', None) is not None:
+            # 注册表已按平台分组并保持创建顺序
+            grouped = self._pages.grouped()
             for pid, items in grouped.items():
-                try:
-                    items.sort(key=lambda kv: kv[1].get('created_at') or 0)
-                except Exception:
-                    pass
                 try:
                     base_name = self._i18n_or_default(f'platform.{pid}', pid.title())
                 except Exception:
@@ -3706,7 +3960,7 @@ class AppDelegate(NSObject):
                         base_name = str(base_name).capitalize()
                 except Exception:
                     pass
-                for idx, (wid, _m) in enumerate(items, start=1):
+                for idx, wid in enumerate(items, start=1):
                     title = base_name if idx == 1 else f"{base_name} {idx}"
                     self._ai_selector_add_item(title, pid, wid)
             if not grouped and self.platform_manager:
@@ -3768,10 +4022,10 @@ class AppDelegate(NSObject):
         desired_platform = None
         desired_window = None
         try:
-            if self.is_multiwindow_mode and getattr(self, '_active_page_id', None) in self._page_meta:
+            if self.is_multiwindow_mode and getattr(self, '_active_page_id', None) in self._pages:
                 apid = self._active_page_id
                 desired_window = apid
-                desired_platform = self._page_meta.get(apid, {}).get('platform_id')
+                desired_platform = self._pages.platform_of(apid)
             elif getattr(self, 'navigation_controller', None) and self.navigation_controller.current_page == 'chat':
                 desired_platform = self.navigation_controller.current_platform
                 desired_window = getattr(self.navigation_controller, 'current_window_id', None)
@@ -3980,7 +4234,7 @@ class AppDelegate(NSObject):
         # 刷新主页气泡
         try:
             if pid:
-                self._update_homepage_window_count(pid)
+                self._sync_homepage((pid,))
         except Exception:
             pass
 
@@ -3996,7 +4250,7 @@ class AppDelegate(NSObject):
             pass
         try:
             if platform_id:
-                self._update_homepage_window_count(platform_id)
+                self._sync_homepage((platform_id,))
         except Exception:
             pass
 
@@ -4038,23 +4292,22 @@ class AppDelegate(NSObject):
                 return cache.get(platform_id)
             # 仅使用随包本地图标（assets/icons/<id>.png）；不做联网与运行时生成
             img = None
-            # 1) 尝试读取打包资源 assets/icons/<id>.png
+            # 1) 共享资源缓存（与主页共用同一份字节，pkgutil 优先，开发模式回退 src/bubble/assets/icons）
             try:
-                bundle = NSBundle.mainBundle()
-                base_dir = bundle.resourcePath()
-                if base_dir:
-                    p = os.path.join(str(base_dir), 'assets', 'icons', f'{platform_id}.png')
-                    if os.path.exists(p):
-                        img = NSImage.alloc().initWithContentsOfFile_(p)
+                data = AssetCache.shared().get_bytes(f'assets/icons/{platform_id}.png')
+                if data:
+                    img = NSImage.alloc().initWithData_(NSData.dataWithBytes_length_(data, len(data)))
             except Exception:
                 img = None
-            # 1b) 开发模式：src/bubble/assets/icons
+            # 1b) 打包资源目录 Resources/assets/icons
             if img is None:
                 try:
-                    script_dir = os.path.dirname(os.path.abspath(__file__))
-                    p = os.path.join(script_dir, 'assets', 'icons', f'{platform_id}.png')
-                    if os.path.exists(p):
-                        img = NSImage.alloc().initWithContentsOfFile_(p)
+                    bundle = NSBundle.mainBundle()
+                    base_dir = bundle.resourcePath()
+                    if base_dir:
+                        p = os.path.join(str(base_dir), 'assets', 'icons', f'{platform_id}.png')
+                        if os.path.exists(p):
+                            img = NSImage.alloc().initWithContentsOfFile_(p)
                 except Exception:
                     img = None
             if img is not None:
@@ -4070,6 +4323,26 @@ class AppDelegate(NSObject):
         except Exception:
             return None
 
+    def _refresh_changed_assets(self):
+        """图标文件变化时使共享资源缓存与下拉图标缓存失效，并把新图标同步到主页"""
+        try:
+            changed = AssetCache.shared().refresh_changed()
+        except Exception as e:
+            print(f"WARNING: 检查资源变化失败: {e}")
+            return
+        if not changed:
+            return
+        cache = getattr(self, '_ai_selector_icon_cache', None)
+        if isinstance(cache, dict):
+            for rel in changed:
+                name = os.path.basename(rel)
+                if rel.startswith('assets/icons/') and name.endswith('.png'):
+                    cache.pop(name[:-4], None)
+        print(f"DEBUG: 资源已变化，缓存失效: {', '.join(changed)}")
+        if any(rel.startswith('assets/icons/') for rel in changed):
+            # 主页行的图标 URL/data URL 随内容摘要变化，补丁同步
+            self._sync_homepage()
+
     def _update_ai_selector_ui(self, visible):
         """更新AI选择器显示状态（顶部栏）/内部实现"""
         try:
@@ -4112,6 +4385,7 @@ class AppDelegate(NSObject):
         """导航开始提交时调用"""
         try:
             print("DEBUG: WKWebView didCommitNavigation")
+            self._nav_metrics.commit(self._nav_page(webView)[0])
             if getattr(self, '_skeleton_suppress_until_finish', False):
                 # 抑制到完成
                 pass
@@ -4129,6 +4403,7 @@ class AppDelegate(NSObject):
         """开始加载时显示骨架屏。"""
         try:
             print("DEBUG: WKWebView didStartProvisionalNavigation")
+            self._nav_metrics.start(*self._nav_page(webView))
             # 新的加载开始时，隐藏错误提示
             try:
                 self._hide_error_overlay()
@@ -4150,19 +4425,21 @@ class AppDelegate(NSObject):
     def webView_didFinishNavigation_(self, webView, navigation):
         """导航完成时调用，确保页面可交互"""
         print("DEBUG: WKWebView didFinishNavigation")
-        # 注入 JavaScript 确保页面元素可点击
-        script = """
-        // 确保所有元素都可以接收点击事件
-        document.body.style.pointerEvents = 'auto';
-        var elements = document.querySelectorAll('*');
-        for (var i = 0; i < elements.length; i++) {
-            if (elements[i].style.pointerEvents === 'none') {
-                elements[i].style.pointerEvents = 'auto';
-            }
-        }
-        console.log('页面交互性已恢复');
-        """
-        webView.evaluateJavaScript_completionHandler_(script, None)
+        self._load_scheduler.finished(webView)
+        try:
+            self._nav_metrics.finish(self._nav_page(webView)[0])
+        except Exception:
+            pass
+        # 页面可点击性由 WebView 工厂安装的用户脚本处理（POINTER_EVENTS_FIX_JS，按平台启用）
+        # 从休眠唤醒的页面：恢复休眠前的滚动位置（只执行一次）
+        try:
+            record = self._pages.get(getattr(self, '_active_page_id', None))
+            if record is not None and record.view is webView:
+                restore = scroll_restore_script(record)
+                if restore:
+                    webView.evaluateJavaScript_completionHandler_(restore, None)
+        except Exception:
+            pass
         # 如果是主页，确保内容下移不被顶栏遮挡
         try:
             if self.last_loaded_is_homepage:
@@ -4201,6 +4478,11 @@ class AppDelegate(NSObject):
     def webView_didFailNavigation_withError_(self, webView, navigation, error):
         """导航失败时调用"""
         print(f"导航失败: {error}")
+        self._load_scheduler.failed(webView)
+        try:
+            self._nav_metrics.fail(self._nav_page(webView)[0])
+        except Exception:
+            pass
         try:
             self._hide_skeleton_overlay()
         except Exception:
@@ -4223,6 +4505,11 @@ class AppDelegate(NSObject):
             print(f"导航失败: {error}")
         except Exception:
             pass
+        self._load_scheduler.failed(webView)
+        try:
+            self._nav_metrics.fail(self._nav_page(webView)[0])
+        except Exception:
+            pass
         try:
             self._hide_skeleton_overlay()
         except Exception:
@@ -4242,8 +4529,8 @@ class AppDelegate(NSObject):
         decisionHandler(1)  # WKNavigationActionPolicyAllow
 
     # 加载主页
-    def _load_homepage(self):
-        """加载主页内容"""
+    def _load_homepage(self, force: bool = False):
+        """加载主页内容；主页文档仍常驻时只同步变化的行（force=True 时总是整页加载）"""
         if self.homepage_manager:
             try:
                 self._hide_error_overlay()
@@ -4253,6 +4540,9 @@ class AppDelegate(NSObject):
                 self._hide_skeleton_overlay()
             except Exception:
                 pass
+            if not force and self._patch_homepage():
+                self._show_homepage_chrome()
+                return
             # 主页加载不显示骨架屏
             try:
                 # 抑制整个加载生命周期，避免 didStart/didCommit 双事件造成闪烁
@@ -4260,7 +4550,9 @@ class AppDelegate(NSObject):
                 self._skeleton_suppress_until_finish = True
             except Exception:
                 pass
+            use_scheme = self._homepage_scheme_handler is not None
             try:
+                self.homepage_manager.set_asset_scheme(use_scheme)
                 html_content = self.homepage_manager.show_homepage()
             except Exception as e:
                 try:
@@ -4276,25 +4568,34 @@ class AppDelegate(NSObject):
                     "<div style=\"opacity:.8\">Homepage rendering encountered an error. Please try again or check logs.</div>"
                     "</div></body>"
                 )
-            self.webview.loadHTMLString_baseURL_(html_content, None)
+            # 以 bubble://app/ 为基址：文档与其引用的资源同源
+            base_url = NSURL.URLWithString_(BUBBLE_SCHEME_BASE_URL) if use_scheme else None
+            # 主页不需要平台脚本
+            self._webview_factory.retarget_platform_scripts(self.webview, None)
+            self.webview.loadHTMLString_baseURL_(html_content, base_url)
             try:
                 print(f"DEBUG: 主页HTML长度: {len(html_content)}")
             except Exception:
                 pass
-            self.last_loaded_is_homepage = True
-            # 在主页时无条件将下拉框显示为“主页”，避免混淆
-            try:
-                self._set_ai_selector_to_home()
-            except Exception:
-                pass
-            # 主页不显示返回按钮
-            try:
-                self.update_back_button_visibility(False)
-            except Exception:
-                pass
+            self._homepage_resident = True
+            self._show_homepage_chrome()
             # 已禁用联网图标下载：使用离线生成的字母图标，无需预取
             print("主页已加载")
 
+    def _show_homepage_chrome(self):
+        """主页可见时的顶栏状态"""
+        self.last_loaded_is_homepage = True
+        # 在主页时无条件将下拉框显示为“主页”，避免混淆
+        try:
+            self._set_ai_selector_to_home()
+        except Exception:
+            pass
+        # 主页不显示返回按钮
+        try:
+            self.update_back_button_visibility(False)
+        except Exception:
+            pass
+
     # 刷新主页
     def _refresh_homepage(self):
         """刷新主页内容"""
@@ -4309,61 +4610,44 @@ class AppDelegate(NSObject):
         except Exception:
             pass
 
-    def _update_homepage_platform_active(self, platform_id: str, active: bool):
-        """切换某平台的 active 状态 + 显隐右侧按钮（无刷新）。"""
-        if not getattr(self, 'last_loaded_is_homepage', False):
-            return
-        active_js = 'true' if active else 'false'
-        inactive_js = 'false' if active else 'true'
-        js = f"""
-            (function(){{
-                const row = document.querySelector('.hrow[data-pid=\"{platform_id}\"]');
-                if (!row) return;
-                row.classList.toggle('active', {active_js});
-                const btn = row.querySelector('button.more');
-                try {{
-                    const wl = JSON.parse(row.dataset.windows||'[]')||[];
-                    const count = Array.isArray(wl) ? wl.length : 0;
-                    if (btn) btn.classList.toggle('hidden', !({active_js}));
-                }} catch (err) {{ if (btn) btn.classList.toggle('hidden', true); }}
-                if (!{active_js}) {{ const b = row.querySelector('.bubble'); if (b) {{ b.textContent='0'; b.classList.add('hidden'); }} }}
-            }})();
-        """
-        self._js_eval(js)
+    def _patch_homepage(self, touched=()) -> bool:
+        """把行状态变化以补丁发送给常驻的主页文档；文档不在或需整页加载（基线失效/补丁过大）时返回 False"""
+        if not (self.homepage_manager and self._homepage_resident and self.webview):
+            return False
+        patch = self.homepage_manager.homepage_patch(touched)
+        if patch is None:
+            return False
+        if not patch["rows"]:
+            return True
+        import json as _json
+        script = f"window.applyPatch && window.applyPatch({_json.dumps(patch, ensure_ascii=False)})"
+
+        def _done(result, error):
+            # 页面拒绝补丁（版本不符：文档被重载/替换）时丢弃基线，主页可见则立即整页加载
+            if result and error is None:
+                return
+            try:
+                self.homepage_manager.homepage_view.invalidate()
+                if self.last_loaded_is_homepage:
+                    self._load_homepage(force=True)
+            except Exception as e:
+                print(f"WARNING: 主页补丁回退失败: {e}")
 
-    def _update_homepage_window_count(self, platform_id: str):
-        """更新指定平台多页面气泡数量与 data-windows（无刷新）。"""
-        if not getattr(self, 'last_loaded_is_homepage', False):
-            return
         try:
-            win_map = self.homepage_manager.get_platform_windows(platform_id) if self.homepage_manager else {}
-        except Exception:
-            win_map = {}
-        items = list(win_map.items())  # (window_id, info)
+            self.webview.evaluateJavaScript_completionHandler_(script, _done)
+        except Exception as e:
+            print(f"WARNING: 发送主页补丁失败: {e}")
+            self.homepage_manager.homepage_view.invalidate()
+            return False
+        return True
+
+    def _sync_homepage(self, touched=()):
+        """平台/页面状态变化后同步主页行（无刷新）；无法打补丁且主页正显示时整页加载"""
         try:
-            items.sort(key=lambda kv: kv[1].get('createdAt', ''))
-        except Exception:
-            pass
-        # 构造 [{id, idx}]
-        idx_items = []
-        for idx, (wid, _) in enumerate(items, start=1):
-            idx_items.append({'id': wid, 'idx': idx})
-        import json as _json
-        js_data = _json.dumps(idx_items)
-        count = len(idx_items)
-        display_count = ("9+" if count > 9 else str(count))
-        js = f"""
-            (function(){{
-                const row = document.querySelector('.hrow[data-pid=\"{platform_id}\"]');
-                if (!row) return;
-                row.dataset.windows = '{js_data.replace("'", "\\'")}';
-                const b = row.querySelector('.bubble');
-                if (b) {{ b.textContent = '{display_count}'; if ({count} > 0) b.classList.remove('hidden'); else b.classList.add('hidden'); }}
-                const btn = row.querySelector('button.more');
-                if (btn) btn.classList.toggle('hidden', !row.classList.contains('active'));
-            }})();
-        """
-        self._js_eval(js)
+            if not self._patch_homepage(touched) and self.last_loaded_is_homepage:
+                self._load_homepage(force=True)
+        except Exception as e:
+            print(f"WARNING: 同步主页失败: {e}")
 
     # 加载AI服务
     def _load_ai_service(self, platform_id):
@@ -4398,7 +4682,9 @@ class AppDelegate(NSObject):
                 self._show_skeleton_overlay()
             except Exception:
                 pass
+            self._webview_factory.retarget_platform_scripts(self.webview, platform_id)
             self.webview.loadRequest_(request)
+            self._homepage_resident = False
             # 确保返回按钮在平台页可见
             try:
                 self.update_back_button_visibility(True)
@@ -4712,30 +4998,8 @@ class AppDelegate(NSObject):
         return False
 
     def _update_homepage_icon(self, platform_id: str):
-        if not getattr(self, 'last_loaded_is_homepage', False):
-            return
-        try:
-            from .components.config_manager import ConfigManager as _CM
-            icon_dir = os.path.join(os.path.dirname(_CM.config_path()), 'icons')
-            icon_path = None
-            for ext in ('png', 'ico'):
-                p = os.path.join(icon_dir, f"{platform_id}.{ext}")
-                if os.path.exists(p):
-                    icon_path = 'file://' + p
-                    break
-            if not icon_path:
-                return
-            js = f"""
-                (function(){{
-                    const row = document.querySelector('.hrow[data-pid="{platform_id}"]');
-                    if (!row) return;
-                    const img = row.querySelector('.title img.icon');
-                    if (img) img.src = '{icon_path.replace("'", "\\'")}';
-                }})();
-            """
-            self._js_eval(js)
-        except Exception:
-            pass
+        # 主页图标只使用打包资源（WKWebView 不加载 file://），经行状态补丁同步
+        self._sync_homepage()
 
     # 错误覆盖层按钮事件
     def errorRetry_(self, sender):
@@ -4790,7 +5054,7 @@ class AppDelegate(NSObject):
             # 多页面模式：仅当该 webView 是当前活动页面且可见
             if getattr(self, 'is_multiwindow_mode', False):
                 apid = getattr(self, '_active_page_id', None)
-                active = self._pages_map.get(apid) if apid else None
+                active = self._pages.view(apid)
                 if active is None:
                     return False
                 # 避免隐藏中的页面触发骨架
@@ -4823,7 +5087,7 @@ class AppDelegate(NSObject):
         if page_type == "homepage":
             # 单窗口多页面：回到主页时隐藏所有后台页面，显示主页 WebView
             try:
-                for _wid, _wv in list(getattr(self, '_pages_map', {}).items()):
+                for _wv in self._pages.views():
                     _wv.setHidden_(True)
                 self._active_page_id = None
                 if getattr(self, 'webview', None):
@@ -4854,17 +5118,10 @@ class AppDelegate(NSObject):
                     pass
                 # 优先指定的 window_id；否则选取已有；否则创建
                 target = None
-                if window_id and window_id in getattr(self, '_pages_map', {}):
+                if window_id and window_id in self._pages:
                     target = window_id
                 else:
-                    try:
-                        ordered = sorted(
-                            [(wid, meta) for wid, meta in self._page_meta.items() if meta.get('platform_id') == platform_id],
-                            key=lambda kv: kv[1].get('created_at') or 0
-                        )
-                        target = ordered[0][0] if ordered else None
-                    except Exception:
-                        target = None
+                    target = self._pages.most_recent(platform_id)
                 if target:
                     self._pages_switch(target)
                 else:
@@ -3,14 +3,24 @@ ConfigManager: manages user configuration persistence for Bubble.
 
 Uses the new Bubble path; retains migration support from BubbleBot.
 Responsibilities here focus on default language detection and language get/set.
+
+ConfigManager is a view over the process-wide ConfigStore, which owns the
+parsed config.json (shared with HomepageManager), re-reads it only when the
+file's (mtime, size, inode) signature changes, and persists through the
+write-behind writer. Getters read cached read-only views; setters update one
+sub-document at a time so concurrent writers do not clobber each other.
 """
 
 from __future__ import annotations
 
 import json
 import os
+import threading
+from collections.abc import Mapping
 from typing import Any, Dict, Optional
 
+from .config_store import ConfigStore
+
 try:
     # Optional dependency; only available on macOS with PyObjC
     from Foundation import NSLocale
@@ -21,6 +31,9 @@ except Exception:  # pragma: no cover
 class ConfigManager:
     _FILENAME = "config.json"
 
+    _store: Optional[ConfigStore] = None
+    _store_lock = threading.Lock()
+
     @classmethod
     def _new_app_support_dir(cls) -> str:
         return os.path.expanduser("~/Library/Application Support/Bubble")
@@ -44,44 +57,67 @@ class ConfigManager:
         d = os.path.dirname(cls.config_path())
         os.makedirs(d, exist_ok=True)
 
+    @classmethod
+    def store(cls) -> ConfigStore:
+        """The shared store behind config.json (also used by HomepageManager)."""
+        with cls._store_lock:
+            if cls._store is None:
+                cls._store = ConfigStore(cls.config_path, cls.legacy_config_path)
+            return cls._store
+
     @classmethod
     def load(cls) -> Dict[str, Any]:
-        p = cls.config_path()
+        """Return a private, mutable copy of the config (callers may modify and save it)."""
         try:
-            if os.path.exists(p):
-                with open(p, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            # Fallback read from legacy path (no writeback here; migration handles that)
-            lp = cls.legacy_config_path()
-            if os.path.exists(lp):
-                with open(lp, "r", encoding="utf-8") as f:
-                    return json.load(f)
+            return cls.store().to_dict()
         except Exception:
-            pass
-        return {}
+            return {}
+
+    @classmethod
+    def view(cls) -> Mapping:
+        """Return a read-only view of the cached config; cheap to call on hot paths."""
+        return cls.store().snapshot()
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        cls.store().invalidate()
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, int]:
+        return cls.store().stats()
 
     @classmethod
     def save(cls, cfg: Dict[str, Any]) -> None:
+        """Write back the top-level keys `cfg` changed; other keys are left untouched."""
         try:
-            cls._ensure_dir()
-            with open(cls.config_path(), "w", encoding="utf-8") as f:
-                json.dump(cfg, f, indent=2, ensure_ascii=False)
+            cls.store().merge(cfg)
         except Exception as e:  # pragma: no cover
             print(f"WARNING[config]: failed to save config: {e}")
 
+    @classmethod
+    def flush(cls, timeout: Optional[float] = 5.0) -> bool:
+        """Block until queued config writes have reached disk."""
+        return cls.store().flush(timeout)
+
+    @classmethod
+    def _update_section(cls, key: str, **values: Any) -> None:
+        def _apply(section: Any) -> Dict[str, Any]:
+            section = section if isinstance(section, dict) else {}
+            section.update(values)
+            return section
+
+        cls.store().update(key, _apply, default={})
+
     @classmethod
     def get_language(cls) -> Optional[str]:
-        cfg = cls.load()
-        lang = cfg.get("language")
+        lang = cls.store().get("language")
         if isinstance(lang, str) and lang:
             return lang
         return None
 
     @classmethod
     def set_language(cls, lang: str) -> None:
-        cfg = cls.load()
-        cfg["language"] = lang
-        cls.save(cfg)
+        cls.store().set("language", lang)
 
     # ----- Suspend (sleep) minutes -----
     @classmethod
@@ -91,8 +127,7 @@ class ConfigManager:
         If key missing or invalid, return default (30).
         """
         try:
-            cfg = cls.load()
-            val = cfg.get("suspend", {}).get("minutes", default)
+            val = cls.store().get("suspend", {}).get("minutes", default)
             minutes = int(val)
             # 0 or greater allowed; negative treated as default
             return minutes if minutes >= 0 else default
@@ -101,40 +136,173 @@ class ConfigManager:
 
     @classmethod
     def set_suspend_minutes(cls, minutes: int) -> None:
-        cfg = cls.load()
-        suspend = cfg.get("suspend") if isinstance(cfg.get("suspend"), dict) else {}
         try:
-            suspend["minutes"] = int(minutes)
+            minutes = int(minutes)
         except Exception:
-            suspend["minutes"] = minutes
-        cfg["suspend"] = suspend
-        cls.save(cfg)
+            pass
+        cls._update_section("suspend", minutes=minutes)
+
+    @classmethod
+    def get_deep_suspend_minutes(cls, default: int = 60) -> int:
+        """Minutes a lightly suspended page waits before its WebView is torn down; 0 disables."""
+        try:
+            val = cls.store().get("suspend", {}).get("deep_minutes", default)
+            minutes = int(val)
+            return minutes if minutes >= 0 else default
+        except Exception:
+            return default
+
+    @classmethod
+    def set_deep_suspend_minutes(cls, minutes: int) -> None:
+        try:
+            minutes = max(0, int(minutes))
+        except Exception:
+            minutes = 0
+        cls._update_section("suspend", deep_minutes=minutes)
+
+    @classmethod
+    def get_warmup_restored(cls) -> bool:
+        """Whether restored pages are materialized in the background after startup (default off)."""
+        try:
+            return bool(cls.store().get("suspend", {}).get("warmup_restored", False))
+        except Exception:
+            return False
+
+    @classmethod
+    def set_warmup_restored(cls, enabled: bool) -> None:
+        cls._update_section("suspend", warmup_restored=bool(enabled))
+
+    @classmethod
+    def get_live_budget(cls) -> Dict[str, int]:
+        """Return {"max_live": int, "memory_mb": int} from the suspend section; 0 means unlimited."""
+        section = cls.store().get("suspend", {})
+        section = section if isinstance(section, Mapping) else {}
+        out = {}
+        for key in ("max_live", "memory_mb"):
+            try:
+                value = int(section.get(key, 0) or 0)
+            except Exception:
+                value = 0
+            out[key] = value if value > 0 else 0
+        return out
+
+    @classmethod
+    def set_live_budget(cls, max_live: int = 0, memory_mb: int = 0) -> None:
+        values = {}
+        for key, value in (("max_live", max_live), ("memory_mb", memory_mb)):
+            try:
+                values[key] = max(0, int(value or 0))
+            except Exception:
+                values[key] = 0
+        cls._update_section("suspend", **values)
+
+    # ----- WebView creation -----
+    @classmethod
+    def get_webview_pool_size(cls, default: int = 1) -> int:
+        """Number of pre-built hidden webviews kept ready for new pages; 0 disables the pool."""
+        try:
+            size = int(cls.store().get("webview", {}).get("pool_size", default))
+            return size if size >= 0 else default
+        except Exception:
+            return default
+
+    @classmethod
+    def set_webview_pool_size(cls, size: int) -> None:
+        try:
+            size = max(0, int(size))
+        except Exception:
+            size = 0
+        cls._update_section("webview", pool_size=size)
+
+    @classmethod
+    def get_process_pool_strategy(cls) -> Dict[str, Any]:
+        """Return {"default": str, "platforms": {platform_id: str}} for WebView process pools.
+
+        Strategies are "shared" (default), "platform" or "isolated"; unknown values are dropped.
+        """
+        valid = ("shared", "platform", "isolated")
+        section = cls.store().get("webview", {})
+        section = section if isinstance(section, Mapping) else {}
+        default = section.get("process_pool", "shared")
+        platforms = section.get("platform_process_pool", {})
+        platforms = platforms if isinstance(platforms, Mapping) else {}
+        return {
+            "default": default if default in valid else "shared",
+            "platforms": {str(k): v for k, v in platforms.items() if v in valid},
+        }
+
+    @classmethod
+    def set_process_pool_strategy(cls, strategy: str, platform_id: Optional[str] = None) -> None:
+        """Set the default strategy, or one platform's override (strategy None removes it)."""
+        if platform_id is None:
+            cls._update_section("webview", process_pool=strategy or "shared")
+            return
+
+        def _apply(section: Any) -> Dict[str, Any]:
+            section = section if isinstance(section, dict) else {}
+            overrides = dict(section.get("platform_process_pool") or {})
+            if strategy:
+                overrides[platform_id] = strategy
+            else:
+                overrides.pop(platform_id, None)
+            section["platform_process_pool"] = overrides
+            return section
+
+        cls.store().update("webview", _apply, default={})
+
+    @classmethod
+    def get_pointer_fix_enabled(cls, platform_id: Optional[str] = None) -> bool:
+        """Whether pages re-enable inline `pointer-events: none` nodes (default on).
+
+        webview.platform_pointer_fix[platform_id] overrides webview.pointer_fix.
+        """
+        try:
+            section = cls.store().get("webview", {})
+            overrides = section.get("platform_pointer_fix", {})
+            if platform_id is not None and isinstance(overrides, Mapping) and platform_id in overrides:
+                return bool(overrides[platform_id])
+            return bool(section.get("pointer_fix", True))
+        except Exception:
+            return True
+
+    @classmethod
+    def set_pointer_fix_enabled(cls, enabled: Optional[bool], platform_id: Optional[str] = None) -> None:
+        """Set the default, or one platform's override (None removes the override)."""
+        if platform_id is None:
+            cls._update_section("webview", pointer_fix=bool(enabled))
+            return
+
+        def _apply(section: Any) -> Dict[str, Any]:
+            section = section if isinstance(section, dict) else {}
+            overrides = dict(section.get("platform_pointer_fix") or {})
+            if enabled is None:
+                overrides.pop(platform_id, None)
+            else:
+                overrides[platform_id] = bool(enabled)
+            section["platform_pointer_fix"] = overrides
+            return section
+
+        cls.store().update("webview", _apply, default={})
 
     # ----- Navigation allow hosts -----
     @classmethod
     def get_allowed_hosts(cls) -> list:
         try:
-            cfg = cls.load()
-            val = cfg.get("navigation", {}).get("allow_hosts", [])
+            val = cls.store().get("navigation", {}).get("allow_hosts", [])
             return list(val) if isinstance(val, (list, tuple)) else []
         except Exception:
             return []
 
     @classmethod
     def set_allowed_hosts(cls, hosts: list[str]) -> None:
-        cfg = cls.load()
-        nav = cfg.get("navigation") if isinstance(cfg.get("navigation"), dict) else {}
-        nav["allow_hosts"] = list(hosts or [])
-        cfg["navigation"] = nav
-        cls.save(cfg)
+        cls._update_section("navigation", allow_hosts=list(hosts or []))
 
     # ----- Hotkeys: switcher (cycle window) -----
     @classmethod
     def get_switcher_hotkey(cls) -> dict:
         try:
-            cfg = cls.load()
-            hk = cfg.get("hotkeys", {}).get("switcher", {})
-            if isinstance(hk, dict) and "flags" in hk and "key" in hk:
+            hk = cls.store().get("hotkeys", {}).get("switcher", {})
+            if isinstance(hk, Mapping) and "flags" in hk and "key" in hk:
                 return {"flags": hk["flags"], "key": hk["key"]}
         except Exception:
             pass
@@ -142,11 +310,7 @@ class ConfigManager:
 
     @classmethod
     def set_switcher_hotkey(cls, flags: int, key: int) -> None:
-        cfg = cls.load()
-        hot = cfg.get("hotkeys") if isinstance(cfg.get("hotkeys"), dict) else {}
-        hot["switcher"] = {"flags": int(flags), "key": int(key)}
-        cfg["hotkeys"] = hot
-        cls.save(cfg)
+        cls._update_section("hotkeys", switcher={"flags": int(flags), "key": int(key)})
 
     @classmethod
     def migrate_config_if_needed(cls) -> bool:
@@ -207,24 +371,22 @@ class ConfigManager:
             print(f"WARNING[config]: migration failed: {e}")
             return False
 
+    @classmethod
+    def _meta(cls) -> Mapping:
+        meta = cls.store().get("meta", {})
+        return meta if isinstance(meta, Mapping) else {}
+
     @classmethod
     def needs_migration_notice(cls) -> bool:
         try:
-            cfg = cls.load()
-            meta = cfg.get("meta") if isinstance(cfg.get("meta"), dict) else {}
-            return bool(meta.get("migration_notice_pending", False))
+            return bool(cls._meta().get("migration_notice_pending", False))
         except Exception:
             return False
 
     @classmethod
     def mark_migration_notice_shown(cls) -> None:
         try:
-            cfg = cls.load()
-            meta = cfg.get("meta") if isinstance(cfg.get("meta"), dict) else {}
-            meta["migration_notice_pending"] = False
-            meta["migration_notice_shown"] = True
-            cfg["meta"] = meta
-            cls.save(cfg)
+            cls._update_section("meta", migration_notice_pending=False, migration_notice_shown=True)
         except Exception:
             pass
 
@@ -232,40 +394,28 @@ class ConfigManager:
     @classmethod
     def is_onboarding_shown(cls) -> bool:
         try:
-            cfg = cls.load()
-            meta = cfg.get("meta") if isinstance(cfg.get("meta"), dict) else {}
-            return bool(meta.get("onboarding_shown", False))
+            return bool(cls._meta().get("onboarding_shown", False))
         except Exception:
             return False
 
     @classmethod
     def mark_onboarding_shown(cls) -> None:
         try:
-            cfg = cls.load()
-            meta = cfg.get("meta") if isinstance(cfg.get("meta"), dict) else {}
-            meta["onboarding_shown"] = True
-            cfg["meta"] = meta
-            cls.save(cfg)
+            cls._update_section("meta", onboarding_shown=True)
         except Exception:
             pass
 
     @classmethod
     def is_permissions_prompted(cls) -> bool:
         try:
-            cfg = cls.load()
-            meta = cfg.get("meta") if isinstance(cfg.get("meta"), dict) else {}
-            return bool(meta.get("permissions_prompted", False))
+            return bool(cls._meta().get("permissions_prompted", False))
         except Exception:
             return False
 
     @classmethod
     def mark_permissions_prompted(cls) -> None:
         try:
-            cfg = cls.load()
-            meta = cfg.get("meta") if isinstance(cfg.get("meta"), dict) else {}
-            meta["permissions_prompted"] = True
-            cfg["meta"] = meta
-            cls.save(cfg)
+            cls._update_section("meta", permissions_prompted=True)
         except Exception:
             pass
 
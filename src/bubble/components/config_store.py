@@ -0,0 +1,344 @@
+"""
+ConfigStore: single in-memory owner of config.json.
+
+Both ConfigManager (language, suspend, hotkeys, navigation, meta) and
+HomepageManager (platform_windows, ui_preferences, enabled platforms) used to
+load/modify/save the whole file independently and clobber each other's keys.
+The store owns the parsed document instead and versions every top-level key
+("sub-document"), so writers either update one key atomically (`update`) or
+detect that someone else got there first (`compare_and_swap`).
+
+- Reads hand out read-only views (dict -> mappingproxy, list -> tuple), cached per version.
+- The file is only re-parsed when its (mtime, size, inode) signature changes.
+- Writes are persisted through the shared write-behind writer; while a write
+  is queued (or a change is deliberately held in memory with persist=False,
+  e.g. because it is journaled elsewhere), the in-memory document is authoritative.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..utils.config_writer import ConfigWriter, shared_writer
+
+_MISSING = object()
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only deep view of parsed JSON (dict -> mappingproxy, list -> tuple)."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Inverse of `freeze`: a private, mutable deep copy."""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    return value
+
+
+class ConfigDocument(dict):
+    """Mutable copy returned by `ConfigStore.to_dict`; remembers what it was copied from."""
+
+    __slots__ = ("base", "versions")
+
+    def __init__(self, data: Dict[str, Any], base: Mapping, versions: Dict[str, int]):
+        super().__init__(data)
+        self.base = base
+        self.versions = versions
+
+
+class ConfigStore:
+    # Sub-documents with a well-known owner; other top-level keys are versioned the same way
+    SUBDOCS = ("platform_windows", "ui_preferences", "meta", "suspend", "hotkeys", "navigation")
+
+    def __init__(
+        self,
+        path_provider: Callable[[], str],
+        legacy_path_provider: Optional[Callable[[], str]] = None,
+        writer: Optional[ConfigWriter] = None,
+    ):
+        self._path_provider = path_provider
+        self._legacy_path_provider = legacy_path_provider
+        self._writer = writer
+        self._lock = threading.RLock()
+        self._doc: Optional[Dict[str, Any]] = None  # values are never mutated in place
+        self._versions: Dict[str, int] = {}
+        self._views: Dict[str, Any] = {}
+        self._snapshot: Optional[Mapping] = None
+        self._sig: Optional[Tuple[Any, ...]] = None
+        self._pending_write: Optional[object] = None
+        self._unpersisted = False
+        self._hits = 0
+        self._misses = 0
+        self._conflicts = 0
+
+    # ----- disk -----
+    @staticmethod
+    def _stat_signature(path: str) -> Optional[Tuple[Any, ...]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (path, st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _current_signature(self) -> Optional[Tuple[Any, ...]]:
+        # New path first, then legacy (migration copies it over on first launch)
+        sig = self._stat_signature(self._path_provider())
+        if sig is None and self._legacy_path_provider is not None:
+            sig = self._stat_signature(self._legacy_path_provider())
+        return sig
+
+    def _refresh_locked(self) -> None:
+        if self._doc is not None and (self._pending_write is not None or self._unpersisted):
+            self._hits += 1
+            return
+        sig = self._current_signature()
+        if self._doc is not None and sig == self._sig:
+            self._hits += 1
+            return
+        self._misses += 1
+        data: Dict[str, Any] = {}
+        if sig is not None:
+            try:
+                with open(sig[0], "r", encoding="utf-8") as f:
+                    parsed = json.load(f)
+                if isinstance(parsed, dict):
+                    data = parsed
+            except Exception:
+                data = {}
+        old = self._doc or {}
+        # Someone else rewrote the file: bump versions of exactly the keys that changed
+        for key in set(old) | set(data):
+            if old.get(key, _MISSING) != data.get(key, _MISSING):
+                self._versions[key] = self._versions.get(key, 0) + 1
+                self._views.pop(key, None)
+        self._doc = data
+        self._sig = sig
+        self._snapshot = None
+
+    def _persist_locked(self, on_done: Optional[Callable[[bool], None]] = None) -> None:
+        path = self._path_provider()
+        token = object()
+        self._pending_write = token
+        self._unpersisted = False
+        # Shallow copy is enough: committed values are replaced, never mutated
+        snapshot = dict(self._doc or {})
+
+        def _written(ok: bool) -> None:
+            with self._lock:
+                # Only the most recent write settles the signature
+                if self._pending_write is token:
+                    self._pending_write = None
+                    self._sig = self._stat_signature(path) if ok else None
+                    if not ok:
+                        # Keep the in-memory document (it may hold journaled changes that
+                        # were never written) and let the next persist retry the whole snapshot
+                        self._unpersisted = True
+            if on_done is not None:
+                on_done(ok)
+
+        (self._writer or shared_writer()).schedule(path, snapshot, on_done=_written)
+
+    def _commit_locked(self, key: str, value: Any, persist: bool = True) -> int:
+        doc = dict(self._doc or {})
+        if value is _MISSING:
+            doc.pop(key, None)
+        else:
+            doc[key] = copy.deepcopy(value)
+        self._doc = doc
+        self._versions[key] = self._versions.get(key, 0) + 1
+        self._views.pop(key, None)
+        self._snapshot = None
+        if persist:
+            self._persist_locked()
+        else:
+            self._unpersisted = True
+        return self._versions[key]
+
+    # ----- reads -----
+    def is_empty(self) -> bool:
+        with self._lock:
+            self._refresh_locked()
+            return not self._doc
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Read-only view of a top-level key, or `default` when absent."""
+        with self._lock:
+            self._refresh_locked()
+            return self._view_locked(key, default)
+
+    def _view_locked(self, key: str, default: Any = None) -> Any:
+        if key not in self._doc:  # type: ignore[operator]
+            return default
+        view = self._views.get(key, _MISSING)
+        if view is _MISSING:
+            view = freeze(self._doc[key])  # type: ignore[index]
+            self._views[key] = view
+        return view
+
+    def read(self, key: str, default: Any = None) -> Tuple[int, Any]:
+        """(version, read-only value) for use with `compare_and_swap`."""
+        with self._lock:
+            self._refresh_locked()
+            return self._versions.get(key, 0), self._view_locked(key, default)
+
+    def version(self, key: str) -> int:
+        with self._lock:
+            self._refresh_locked()
+            return self._versions.get(key, 0)
+
+    def snapshot(self) -> Mapping:
+        """Read-only view of the whole document."""
+        with self._lock:
+            self._refresh_locked()
+            if self._snapshot is None:
+                self._snapshot = MappingProxyType({k: self._view_locked(k) for k in self._doc})  # type: ignore[union-attr]
+            return self._snapshot
+
+    def to_dict(self) -> ConfigDocument:
+        """Private mutable copy of the whole document; pass it back to `merge` to save."""
+        with self._lock:
+            base = self.snapshot()
+            return ConfigDocument(thaw(base), base, dict(self._versions))
+
+    # ----- writes -----
+    def compare_and_swap(self, key: str, expected_version: int, value: Any, persist: bool = True) -> bool:
+        """Replace `key` only if nobody changed it since `expected_version` was read."""
+        with self._lock:
+            self._refresh_locked()
+            if self._versions.get(key, 0) != expected_version:
+                self._conflicts += 1
+                return False
+            self._commit_locked(key, value, persist)
+            return True
+
+    def set(self, key: str, value: Any, persist: bool = True) -> int:
+        """Unconditionally replace `key`; returns the new version."""
+        with self._lock:
+            self._refresh_locked()
+            return self._commit_locked(key, value, persist)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._refresh_locked()
+            if key in self._doc:  # type: ignore[operator]
+                self._commit_locked(key, _MISSING)
+
+    def update(self, key: str, fn: Callable[[Any], Any], default: Any = None, persist: bool = True) -> Any:
+        """Read-modify-write one key with a CAS retry loop.
+
+        `fn` receives a private mutable copy of the current value (or a copy of
+        `default`) and returns the new value (it may mutate and return its argument).
+        Returning the argument unchanged skips the write.
+        """
+        while True:
+            version, current = self.read(key, _MISSING)
+            base = copy.deepcopy(default) if current is _MISSING else thaw(current)
+            new_value = fn(base)
+            if current is not _MISSING and new_value == thaw(current):
+                return new_value
+            if self.compare_and_swap(key, version, new_value, persist):
+                return new_value
+
+    def merge(self, doc: Mapping) -> List[str]:
+        """Save a whole-document dict by writing back only the top-level keys it changed.
+
+        For a `ConfigDocument` (from `to_dict`) "changed" means changed since it
+        was copied; concurrent edits to other keys - or to other fields of the
+        same dict-valued key - are preserved.
+        """
+        changed: List[str] = []
+        base = doc.base if isinstance(doc, ConfigDocument) else None
+        with self._lock:
+            self._refresh_locked()
+            current = self._doc or {}
+            for key, value in doc.items():
+                cur = current.get(key, _MISSING)
+                if base is not None:
+                    before = thaw(base[key]) if key in base else _MISSING
+                    if value == before:
+                        continue
+                    if (
+                        doc.versions.get(key, 0) != self._versions.get(key, 0)
+                        and isinstance(value, dict)
+                        and isinstance(before, dict)
+                        and isinstance(cur, dict)
+                    ):
+                        value = _three_way(before, value, cur)
+                if value == cur:
+                    continue
+                self._commit_locked(key, value)
+                changed.append(key)
+        return changed
+
+    def seed(self, defaults: Mapping) -> List[str]:
+        """Set keys that are absent (first launch); existing values are left alone."""
+        added: List[str] = []
+        with self._lock:
+            self._refresh_locked()
+            for key, value in defaults.items():
+                if key not in self._doc:  # type: ignore[operator]
+                    self._commit_locked(key, value)
+                    added.append(key)
+        return added
+
+    @contextmanager
+    def locked(self) -> Iterator["ConfigStore"]:
+        """Hold the store lock across several calls (e.g. two keys that must move together)."""
+        with self._lock:
+            yield self
+
+    def persist(self, on_done: Optional[Callable[[bool], None]] = None) -> None:
+        """Queue a snapshot of the current document, including changes held with persist=False."""
+        with self._lock:
+            self._refresh_locked()
+            self._persist_locked(on_done)
+
+    # ----- housekeeping -----
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        return (self._writer or shared_writer()).flush(timeout)
+
+    def invalidate(self) -> None:
+        """Drop the in-memory document; the next read re-parses the file."""
+        with self._lock:
+            self._doc = None
+            self._sig = None
+            self._pending_write = None
+            self._unpersisted = False
+            self._views.clear()
+            self._snapshot = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "conflicts": self._conflicts}
+
+    def keys(self) -> Iterable[str]:
+        return tuple(self.snapshot().keys())
+
+
+def _three_way(before: Dict[str, Any], mine: Dict[str, Any], theirs: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply the field-level edits `before -> mine` on top of `theirs`."""
+    merged = dict(theirs)
+    for field in set(before) | set(mine):
+        old = before.get(field, _MISSING)
+        new = mine.get(field, _MISSING)
+        if old == new:
+            continue
+        if new is _MISSING:
+            merged.pop(field, None)
+        else:
+            merged[field] = new
+    return merged
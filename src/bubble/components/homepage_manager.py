@@ -16,7 +16,12 @@ from typing import Dict, List, Optional
 import objc
 from Foundation import NSObject, NSUserDefaults
 from .config_manager import ConfigManager
-from ..i18n import t as _t
+from ..utils.window_journal import WindowJournal, apply_record, OP_CREATE, OP_CLOSE, OP_RENAME
+from .homepage_template import TemplateCache, current_appearance, script_tag, slot, style_tag
+from ..utils.asset_cache import AssetCache
+from ..utils.bubble_scheme import asset_url, publish
+from ..models.homepage_view_model import HomepageViewModel, count_label, row_state
+from ..i18n import t as _t, get_language as _get_language
 
 
 class HomepageManager(NSObject):
@@ -114,6 +119,12 @@ class HomepageManager(NSObject):
         self._load_user_config()
         # Runtime-only flag：调试用，强制显示一次导览
         self._force_tour_once = False
+        # 主页静态外壳缓存（按语言与外观编译一次，渲染时只生成平台行）
+        self._homepage_templates = TemplateCache(self._build_homepage_shell)
+        # 主页资源是否经 bubble:// 协议提供（由宿主 WebView 注册 scheme handler 后开启）
+        self._asset_scheme = False
+        # 已发送给主页文档的行状态基线：状态变化时只发送补丁（window.applyPatch）
+        self.homepage_view = HomepageViewModel()
         # 尝试加载内置logo为 data URL，供主页展示
         try:
             self._load_logo_data_url()
@@ -123,40 +134,28 @@ class HomepageManager(NSObject):
 
     def on_language_changed(self):
         """Hook for language change; homepage will be re-rendered on next load."""
-        # No persistent state to update here; UI will rebuild via AppDelegate._load_homepage()
+        # 外壳内含本地化文案：丢弃已编译的外壳，下次渲染按新语言重新编译
+        self._homepage_templates.invalidate()
+        self.homepage_view.invalidate()
         return True
 
+    def set_asset_scheme(self, enabled: bool) -> None:
+        """切换主页资源提供方式：bubble:// 引用（True）或内联（False）；切换时丢弃已编译外壳"""
+        enabled = bool(enabled)
+        if enabled != self._asset_scheme:
+            self._asset_scheme = enabled
+            self._homepage_templates.invalidate()
+            self.homepage_view.invalidate()
+
     def _load_logo_data_url(self):
-        import base64
-        import pkgutil
-        # Try pkg data first (py2app zip-safe)
-        for name in (
+        # 共享资源缓存：pkgutil 优先（py2app zip-safe），开发模式回退文件系统；编码结果全局复用
+        assets = AssetCache.shared()
+        rel = assets.first_available((
             'logo/icon.iconset/icon_64x64.png',
             'logo/icon.iconset/icon_128x128.png',
             'logo/icon.iconset/icon_32x32.png',
-        ):
-            try:
-                data = pkgutil.get_data('bubble', name)
-                if data:
-                    b64 = base64.b64encode(data).decode('ascii')
-                    self.logo_data_url = f"data:image/png;base64,{b64}"
-                    return
-            except Exception:
-                pass
-        # Fallback to filesystem in dev
-        # components/ -> package root (../)
-        base = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
-        for p in (
-            os.path.join(base, 'logo', 'icon.iconset', 'icon_64x64.png'),
-            os.path.join(base, 'logo', 'icon.iconset', 'icon_128x128.png'),
-            os.path.join(base, 'logo', 'icon.iconset', 'icon_32x32.png'),
-        ):
-            if os.path.exists(p):
-                with open(p, 'rb') as f:
-                    b64 = base64.b64encode(f.read()).decode('ascii')
-                self.logo_data_url = f"data:image/png;base64,{b64}"
-                return
-        self.logo_data_url = None
+        ))
+        self.logo_data_url = assets.data_url(rel) if rel else None
     
     def _ensure_config_directory(self):
         """确保配置目录存在"""
@@ -165,14 +164,12 @@ class HomepageManager(NSObject):
             os.makedirs(config_dir, exist_ok=True)
     
     def _load_user_config(self):
-        """加载用户配置"""
+        """加载用户配置（共享 ConfigStore；首次启动写入默认值）"""
+        self._store = ConfigManager.store()
         try:
-            if os.path.exists(self.config_file_path):
-                with open(self.config_file_path, 'r', encoding='utf-8') as f:
-                    self.user_config = json.load(f)
-            else:
+            if self._store.is_empty():
                 # 首次启动，创建默认配置
-                self.user_config = {
+                self._store.seed({
                     "default_ai": None,  # 用户首次启动时需要选择
                     "enabled_platforms": [],  # 首次启动不启用任何平台
                     "window_positions": {},
@@ -182,45 +179,89 @@ class HomepageManager(NSObject):
                         "hide_memory_bubble": False
                     },
                     "platform_windows": {}  # 记录每个平台的窗口信息
-                }
-                self._save_user_config()
+                })
         except Exception as e:
             print(f"加载用户配置失败，使用默认配置: {e}")
-            self.user_config = {
-                "default_ai": None,
-                "enabled_platforms": [],  # 首次启动不启用任何平台
-                "window_positions": {},
-                "ui_preferences": {
-                    "transparency": 1.0,
-                    "show_homepage_on_startup": True,
-                    "hide_memory_bubble": False
-                },
-                "platform_windows": {}
-            }
+        self._open_window_journal()
+    
+    def _open_window_journal(self):
+        """打开窗口生命周期日志，并把快照之后的记录回放到内存"""
+        self._window_journal = None
+        try:
+            journal_path = os.path.join(os.path.dirname(self.config_file_path), "config.windows.jsonl")
+            journal = WindowJournal(journal_path)
+            base_seq = int(self._store.get("platform_windows_seq", 0) or 0)
+            journal.ensure_seq_at_least(base_seq)
+            self._window_journal = journal
+            pending = list(journal.records(base_seq))
+            if pending:
+                def _replay(platform_windows):
+                    for rec in pending:
+                        apply_record(platform_windows, rec)
+                    return platform_windows
+                with self._store.locked():
+                    self._store.update("platform_windows", _replay, default={}, persist=False)
+                    self._store.set("platform_windows_seq", pending[-1]["seq"], persist=False)
+            if journal.needs_compaction() or pending:
+                self._compact_window_journal()
+        except Exception as e:
+            print(f"加载窗口日志失败，回退为整份写入: {e}")
+    
+    def _journal_window_op(self, op, platform_id, window_id, mutate, **fields):
+        """记录一次窗口变更：追加一行日志 + 更新内存快照（不整份重写 config.json）"""
+        journal = getattr(self, '_window_journal', None)
+        if journal is None:
+            return self._update_config("platform_windows", mutate, default={})
+        try:
+            with self._store.locked():
+                seq = journal.append(op, platform_id, window_id, **fields)
+                self._store.update("platform_windows", mutate, default={}, persist=False)
+                self._store.set("platform_windows_seq", seq, persist=False)
+        except Exception as e:
+            print(f"写入窗口日志失败，回退为整份写入: {e}")
+            return self._update_config("platform_windows", mutate, default={})
+        if journal.needs_compaction():
+            self._compact_window_journal()
+    
+    def _compact_window_journal(self):
+        """把日志折叠进 config.json 快照，写盘成功后截断已折叠的记录"""
+        journal = getattr(self, '_window_journal', None)
+        if journal is None or getattr(self, '_journal_compaction_pending', False):
+            return
+        self._journal_compaction_pending = True
+
+        def _done(ok, seq):
+            self._journal_compaction_pending = False
+            if ok:
+                journal.compact_through(seq)
+
+        with self._store.locked():
+            seq = int(self._store.get("platform_windows_seq", 0) or 0)
+            self._store.persist(on_done=lambda ok: _done(ok, seq))
     
-    def _save_user_config(self):
-        """保存用户配置"""
+    def _update_config(self, key, fn, default=None):
+        """对单个子文档做读-改-写（CAS），返回新值；失败时返回 None"""
         try:
-            with open(self.config_file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.user_config, f, indent=2, ensure_ascii=False)
+            return self._store.update(key, fn, default=default)
         except Exception as e:
             print(f"保存用户配置失败: {e}")
+            return None
     
     def is_first_launch(self) -> bool:
         """检查是否为首次启动"""
-        return self.user_config.get("default_ai") is None
+        return self._store.get("default_ai") is None
 
     def should_show_homepage_on_startup(self) -> bool:
         """是否在启动时显示主页（由用户偏好控制，默认 True）"""
         try:
-            return bool(self.user_config.get("ui_preferences", {}).get("show_homepage_on_startup", True))
+            return bool(self._store.get("ui_preferences", {}).get("show_homepage_on_startup", True))
         except Exception:
             return True
     
     def get_enabled_platforms(self) -> Dict[str, Dict]:
         """获取已启用的AI平台列表"""
         enabled = {}
-        for platform_id in self.user_config.get("enabled_platforms", []):
+        for platform_id in self._store.get("enabled_platforms", ()):
             if platform_id in self.default_ai_platforms:
                 enabled[platform_id] = self.default_ai_platforms[platform_id].copy()
         return enabled
@@ -243,10 +284,13 @@ class HomepageManager(NSObject):
             print(f"不支持的平台: {platform_id}")
             return False
         
-        if platform_id not in self.user_config.get("enabled_platforms", []):
+        if platform_id not in self._store.get("enabled_platforms", ()):
             # 默认不限制启用平台数量
-            self.user_config.setdefault("enabled_platforms", []).append(platform_id)
-            self._save_user_config()
+            def _add(enabled):
+                if platform_id not in enabled:
+                    enabled.append(platform_id)
+                return enabled
+            self._update_config("enabled_platforms", _add, default=[])
             return True
         
         print(f"平台 {platform_id} 已经启用")
@@ -262,12 +306,14 @@ class HomepageManager(NSObject):
         Returns:
             bool: 移除是否成功
         """
-        if platform_id in self.user_config.get("enabled_platforms", []):
-            self.user_config["enabled_platforms"].remove(platform_id)
+        if platform_id in self._store.get("enabled_platforms", ()):
+            self._update_config("enabled_platforms", lambda enabled: [p for p in enabled if p != platform_id], default=[])
             # 同时清理该平台的窗口信息
-            if platform_id in self.user_config.get("platform_windows", {}):
-                del self.user_config["platform_windows"][platform_id]
-            self._save_user_config()
+            if platform_id in self._store.get("platform_windows", {}):
+                def _drop(windows):
+                    windows.pop(platform_id, None)
+                    return windows
+                self._update_config("platform_windows", _drop, default={})
             return True
         
         print(f"平台 {platform_id} 未启用")
@@ -284,11 +330,10 @@ class HomepageManager(NSObject):
             bool: 设置是否成功
         """
         if platform_id in self.default_ai_platforms:
-            self.user_config["default_ai"] = platform_id
+            self._update_config("default_ai", lambda _cur: platform_id)
             # 确保默认AI在启用列表中
-            if platform_id not in self.user_config.get("enabled_platforms", []):
+            if platform_id not in self._store.get("enabled_platforms", ()):
                 self.add_platform(platform_id)
-            self._save_user_config()
             return True
         
         print(f"不支持的平台: {platform_id}")
@@ -296,7 +341,7 @@ class HomepageManager(NSObject):
     
     def get_default_ai(self) -> Optional[str]:
         """获取默认AI平台"""
-        return self.user_config.get("default_ai")
+        return self._store.get("default_ai")
     
     def add_platform_window(self, platform_id: str, window_id: str, window_info: Dict) -> bool:
         """
@@ -313,12 +358,11 @@ class HomepageManager(NSObject):
         if platform_id not in self.default_ai_platforms:
             return False
         
-        platform_windows = self.user_config.setdefault("platform_windows", {})
-        platform_windows.setdefault(platform_id, {})
-        
         # 默认不限制同一平台窗口数量，由上层通过内存提示进行引导
-        platform_windows[platform_id][window_id] = window_info
-        self._save_user_config()
+        record = {"op": OP_CREATE, "pid": platform_id, "wid": window_id, "info": window_info}
+        self._journal_window_op(OP_CREATE, platform_id, window_id,
+                                lambda platform_windows: apply_record(platform_windows, record),
+                                info=window_info)
         return True
     
     def remove_platform_window(self, platform_id: str, window_id: str) -> bool:
@@ -332,29 +376,44 @@ class HomepageManager(NSObject):
         Returns:
             bool: 移除是否成功
         """
-        platform_windows = self.user_config.get("platform_windows", {})
+        platform_windows = self._store.get("platform_windows", {})
         if platform_id in platform_windows and window_id in platform_windows[platform_id]:
-            del platform_windows[platform_id][window_id]
-            # 如果该平台没有窗口了，清理空字典
-            if not platform_windows[platform_id]:
-                del platform_windows[platform_id]
-            self._save_user_config()
+            # 该平台没有窗口时一并清理空字典（见 apply_record）
+            record = {"op": OP_CLOSE, "pid": platform_id, "wid": window_id}
+            self._journal_window_op(OP_CLOSE, platform_id, window_id,
+                                    lambda platform_windows: apply_record(platform_windows, record))
             return True
         
         return False
     
+    def rename_platform_window(self, platform_id: str, window_id: str, title: str) -> bool:
+        """
+        重命名平台窗口（记录在窗口信息的 title 字段）
+        
+        Returns:
+            bool: 窗口存在且已记录
+        """
+        platform_windows = self._store.get("platform_windows", {})
+        if platform_id in platform_windows and window_id in platform_windows[platform_id]:
+            record = {"op": OP_RENAME, "pid": platform_id, "wid": window_id, "title": title}
+            self._journal_window_op(OP_RENAME, platform_id, window_id,
+                                    lambda platform_windows: apply_record(platform_windows, record),
+                                    title=title)
+            return True
+        return False
+    
     def get_platform_windows(self, platform_id: str) -> Dict[str, Dict]:
-        """获取指定平台的所有窗口"""
-        return self.user_config.get("platform_windows", {}).get(platform_id, {})
+        """获取指定平台的所有窗口（只读视图）"""
+        return self._store.get("platform_windows", {}).get(platform_id, {})
     
     def get_all_windows(self) -> Dict[str, Dict[str, Dict]]:
-        """获取所有平台的窗口信息"""
-        return self.user_config.get("platform_windows", {})
+        """获取所有平台的窗口信息（只读视图）"""
+        return self._store.get("platform_windows", {})
     
     def get_total_window_count(self) -> int:
         """获取总窗口数量"""
         total = 0
-        for platform_windows in self.user_config.get("platform_windows", {}).values():
+        for platform_windows in self._store.get("platform_windows", {}).values():
             total += len(platform_windows)
         return total
 
@@ -362,7 +421,7 @@ class HomepageManager(NSObject):
     def should_show_homepage_tour(self) -> bool:
         """是否需要显示主页导览（仅显示一次）。"""
         try:
-            ui = self.user_config.get("ui_preferences", {})
+            ui = self._store.get("ui_preferences", {})
             # 未设置或显式为 False 时显示
             return not bool(ui.get("homepage_tour_done", False))
         except Exception:
@@ -372,6 +431,8 @@ class HomepageManager(NSObject):
         """请求在下一次主页渲染时强制显示一次导览（不改持久化配置）。"""
         try:
             self._force_tour_once = True
+            # 导览开关只在整页渲染时写入：丢弃行状态基线，确保下次加载整页渲染
+            self.homepage_view.invalidate()
         except Exception:
             pass
 
@@ -388,9 +449,10 @@ class HomepageManager(NSObject):
     def mark_homepage_tour_done(self) -> None:
         """标记主页导览已完成并持久化。"""
         try:
-            ui = self.user_config.setdefault("ui_preferences", {})
-            ui["homepage_tour_done"] = True
-            self._save_user_config()
+            def _done(ui):
+                ui["homepage_tour_done"] = True
+                return ui
+            self._update_config("ui_preferences", _done, default={})
         except Exception as _e:
             print(f"保存主页导览完成状态失败: {_e}")
     
@@ -411,47 +473,39 @@ class HomepageManager(NSObject):
         同时在顶部显示品牌区（包含 Bubble logo），保证开发与打包后显示一致：
         - 优先使用打包资源（pkgutil.get_data）生成 data URL
         - 开发模式回退到文件系统路径（src/bubble/logo/...）
+
+        静态外壳按 (语言, 外观) 编译缓存，每次渲染只生成平台行与导览开关。
         """
-        enabled = self.get_enabled_platforms()
         available = self.get_available_platforms()
-        # Load local driver.js/css text for inline embedding (fallback to CDN when empty)
-        def _read_asset_text(rel: str) -> str:
-            try:
-                import pkgutil
-                data = pkgutil.get_data('bubble', rel)
-                if data:
-                    return data.decode('utf-8', 'ignore')
-            except Exception:
-                pass
-            # dev filesystem fallback
-            try:
-                base = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
-                p = os.path.join(base, rel)
-                if os.path.exists(p):
-                    with open(p, 'r', encoding='utf-8') as f:
-                        return f.read()
-            except Exception:
-                pass
-            return ''
-        self._driver_css_text = _read_asset_text('assets/vendor/driver.js/driver.min.css')
-        self._driver_js_text = _read_asset_text('assets/vendor/driver.js/driver.min.js')
-        # helpers used in HTML template
-        def _get_driver_css():
-            return self._driver_css_text or ''
-        def _get_driver_js_json():
-            try:
-                import json as _json
-                return _json.dumps(self._driver_js_text or '')
-            except Exception:
-                return '""'
-        # expose helpers to f-string via bound methods
-        self._get_driver_css = _get_driver_css
-        self._get_driver_js_json = _get_driver_js_json
         # 选择一个用于导览的首个平台（用于定位示例元素）
         try:
             tour_first_pid = next(iter(available.keys())) if available else "openai"
         except Exception:
             tour_first_pid = "openai"
+        try:
+            _show_tour_js = 'true' if self.should_show_homepage_tour() else 'false'
+        except Exception:
+            _show_tour_js = 'false'
+        try:
+            _force_tour_js = 'true' if self.consume_force_homepage_tour() else 'false'
+        except Exception:
+            _force_tour_js = 'false'
+        shell = self._homepage_templates.get(_get_language(), current_appearance())
+        rows = self._render_platform_rows(available)
+        return shell.render(
+            rows=rows,
+            version=self.homepage_view.version,
+            show_tour=_show_tour_js,
+            force_tour=_force_tour_js,
+            first_pid=json.dumps(tour_first_pid),
+        )
+
+    def _platform_row_states(self, available: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+        """各平台行的可变状态（启用、页面列表、数量、图标、默认平台），供整页渲染与补丁比较共用"""
+        enabled = self.get_enabled_platforms()
+        if available is None:
+            available = self.get_available_platforms()
+        default_pid = self.get_default_ai()
         def _windows_list(pid):
             m = self.get_platform_windows(pid)
             items = list(m.items())
@@ -463,18 +517,49 @@ class HomepageManager(NSObject):
             for idx,(wid,_) in enumerate(items, start=1):
                 arr.append({"id": wid, "idx": idx})
             return arr
+        states = {}
+        for pid in available:
+            # icon：仅使用打包资源（避免 WKWebView 对 file:// 的限制）：bubble:// 引用或 data URL；预热后无文件读取
+            try:
+                rel = f'assets/icons/{pid}.png'
+                icon_src = (asset_url(rel) if self._asset_scheme else AssetCache.shared().data_url(rel)) or ''
+            except Exception:
+                icon_src = ''
+            states[pid] = row_state(pid in enabled, _windows_list(pid), icon_src, pid == default_pid)
+        return states
+
+    def homepage_patch(self, touched=()) -> Optional[Dict]:
+        """与上次发送给主页的行状态比较，返回 applyPatch 补丁（rows 为空表示无变化）；需整页加载时返回 None
+
+        touched：刚由用户操作过的平台，页面已做乐观更新，总是重发其启用状态与页面数量。
+        """
+        try:
+            return self.homepage_view.diff(self._platform_row_states(), force=touched)
+        except Exception as e:
+            print(f"WARNING: 计算主页补丁失败，回退整页加载: {e}")
+            self.homepage_view.invalidate()
+            return None
+
+    def _render_platform_rows(self, available: Optional[Dict[str, Dict]] = None) -> str:
+        """平台行片段（启用状态、页面数量随操作变化，每次渲染重新生成）；同时记为视图模型的新基线"""
+        if available is None:
+            available = self.get_available_platforms()
+        states = self._platform_row_states(available)
+        self.homepage_view.reset(states)
         import json as _json
         rows = ""
         for pid, info in available.items():
-            is_on = pid in enabled
-            wl = _windows_list(pid)
-            wcnt = len(wl)
+            state = states[pid]
+            is_on = state["active"]
+            wl = state["windows"]
+            wcnt = state["count"]
+            icon_src = state["icon"]
             # 始终渲染按钮与气泡（隐藏时保留占位，避免布局抖动）
             # 省略号在平台启用时始终可见（即便为0页也可“新建页面”）
             # 将省略号替换为加号；选中卡片后显示加号，未选中隐藏
             more_btn = f'<button class="more{("" if is_on else " hidden")}">+</button>'
             # 首次添加也要有反馈：>=1 显示气泡
-            bubble = f'<span class="bubble{("" if wcnt>=1 else " hidden")}">{wcnt}</span>'
+            bubble = f'<span class="bubble{("" if wcnt>=1 else " hidden")}">{count_label(wcnt)}</span>'
             # 本地化名称（简洁）
             try:
                 title_txt = _t(f'platform.{pid}', default=info.get('display_name') or info.get('name') or pid.title())
@@ -503,42 +588,22 @@ class HomepageManager(NSObject):
                 sub_txt = _t(f'platform.desc.{pid}', default=_desc_defaults.get(pid, ''))
             except Exception:
                 sub_txt = _desc_defaults.get(pid, '')
-            # icon：仅使用打包资源，转为 data URL（避免 WKWebView 对 file:// 的限制）
-            icon_src = ''
-            try:
-                import pkgutil, base64
-                data = pkgutil.get_data('bubble', f'assets/icons/{pid}.png')
-                if data:
-                    icon_src = 'data:image/png;base64,' + base64.b64encode(data).decode('ascii')
-            except Exception:
-                icon_src = ''
-            if not icon_src:
-                try:
-                    import base64
-                    base = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
-                    p = os.path.join(base, 'assets', 'icons', f'{pid}.png')
-                    if os.path.exists(p):
-                        with open(p, 'rb') as f:
-                            icon_src = 'data:image/png;base64,' + base64.b64encode(f.read()).decode('ascii')
-                except Exception:
-                    icon_src = ''
             icon_html = f"<img class=\"icon\" src=\"{icon_src}\" alt=\"\">" if icon_src else ""
             rows += f"""
-            <div id=\"row-{pid}\" class=\"hrow{' active' if is_on else ''}\" data-pid=\"{pid}\" data-windows='{_json.dumps(wl)}'>
+            <div id=\"row-{pid}\" class=\"hrow{' active' if is_on else ''}{' default' if state['default'] else ''}\" data-pid=\"{pid}\" data-windows='{_json.dumps(wl)}'>
               <div class=\"title\">{icon_html}<span class=\"name\">{title_txt}</span><span class=\"desc\">{sub_txt}</span></div>
               <div class=\"right\">{bubble}{more_btn}</div>
             </div>
             """
-        html = f"""
-        <!DOCTYPE html>
-        <html lang=\"zh-CN\">
-        <head>
-            <meta charset=\"UTF-8\"> 
-            <meta name=\"viewport\" content=\"width=device-width, initial-scale=1, maximum-scale=1\">
-            <title>Bubble</title>
-            <!-- driver.js 样式：优先内嵌本地版本，失败则使用 CDN 兜底 -->
-            <style id=\"driverjs-css\">{self._get_driver_css()}</style>
-            <style>
+        return rows
+
+    def _build_homepage_shell(self, language: str, appearance: str) -> str:
+        """主页静态外壳（带插槽标记），由 TemplateCache 按 (语言, 外观) 编译并缓存
+
+        asset_scheme 开启时样式与脚本发布到 bubble:// 资源缓存，外壳只保留引用；否则全部内联。
+        导览开关、示例平台 ID 与行状态版本每次渲染通过内联的 window.__bbHome 传入。
+        """
+        css = f"""
                 :root {{ --bg:#fafafa; --card:#fff; --border:#eaeaea; --text:#111; --muted:#666; --accent:#111; --radius:12px; --rightW:64px; }}
                 * {{ box-sizing: border-box; }}
                 body {{ margin:0; padding:56px 14px 14px; font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,'Helvetica Neue',Arial,'Noto Sans',sans-serif; background:var(--bg); color:var(--text); overflow-x:hidden; }}
@@ -600,16 +665,9 @@ class HomepageManager(NSObject):
                 /* 让周围更暗、突出高亮区域，并设置高亮圆角 */
                 div#driver-page-overlay {{ opacity: .65 !important; background: #000 !important; }}
                 div#driver-highlighted-element-stage {{ border-radius: 12px !important; box-shadow: 0 10px 30px rgba(0,0,0,.22) !important; }}
-            </style>
-        </head>
-        <body>
-            <div class=\"list\">{rows}</div>
-            <div id=\"menu\" class=\"menu\"><div class=\"item\" data-action=\"duplicate\">重复添加</div></div>
-            <div id=\"popover\" class=\"popover\"></div>
-        """
+            """
         # 注入脚本：先写入公用工具与事件，再加入导览逻辑（依赖变量）
-        html += """
-            <script>
+        main_js = """
                 // 注：统一采用内置简易导览（不加载 driver.js），避免 DOM 差异引入歧义
                 // 让卡片高度随窗口高度线性缩放（无阈值跳变）
                 (function(){
@@ -699,6 +757,36 @@ class HomepageManager(NSObject):
                 menu.addEventListener('click', e=>{ const it = e.target.closest('.item'); if (!it) return; const pid = menu.dataset.pid; menu.style.display='none'; if (it.dataset.action==='duplicate' || it.dataset.action==='new') { post({action:'addWindow', platformId: pid}); } });
                 pop.addEventListener('click', e=>{ const del = e.target.closest('.pop-del'); if (!del) return; const pid = pop.dataset.pid; const wid = del.dataset.wid; pop.style.display='none'; post({action:'removeWindow', platformId: pid, windowId: wid}); });
                 document.addEventListener('click', ()=>{ menu.style.display='none'; pop.style.display='none'; });
+                // 原生推送的行状态补丁：{base, version, rows:{pid:{active,windows,count,icon,default}}}
+                // 仅接受基于当前版本的补丁；返回 false 时原生回退为整页加载
+                window.applyPatch = function(patch){
+                    try {
+                        if (typeof patch === 'string') patch = JSON.parse(patch);
+                        const state = window.__bbHome;
+                        if (!patch || !state || state.version !== patch.base) return false;
+                        Object.keys(patch.rows || {}).forEach(pid=>{
+                            const row = document.getElementById('row-' + pid);
+                            if (!row) return;
+                            const p = patch.rows[pid];
+                            if ('active' in p) row.classList.toggle('active', !!p.active);
+                            if ('default' in p) row.classList.toggle('default', !!p.default);
+                            if ('windows' in p) row.dataset.windows = JSON.stringify(p.windows || []);
+                            if ('count' in p) {
+                                const b = row.querySelector('.bubble');
+                                if (b) { b.textContent = p.count > 9 ? '9+' : String(p.count); b.classList.toggle('hidden', !(p.count >= 1)); }
+                            }
+                            if ('icon' in p) {
+                                const img = row.querySelector('img.icon');
+                                if (img && p.icon) img.src = p.icon;
+                            }
+                            const btn = row.querySelector('button.more');
+                            if (btn) btn.classList.toggle('hidden', !row.classList.contains('active'));
+                            if (pop.style.display === 'block' && pop.dataset.pid === pid) pop.style.display = 'none';
+                        });
+                        state.version = patch.version;
+                        return true;
+                    } catch(_e) { return false; }
+                };
                 // 顶部下拉锚点（用于导览高亮），放在页面顶部中间附近
                 (function(){
                     var anchor = document.createElement('div');
@@ -725,20 +813,7 @@ class HomepageManager(NSObject):
                     center.style.zIndex = '1';
                     document.body.appendChild(center);
                 })();
-            </script>
-        </body>
-        </html>
-        """
-        # 追加导览逻辑脚本，注入布尔与示例平台 ID
-        try:
-            _show_tour_js = 'true' if self.should_show_homepage_tour() else 'false'
-        except Exception:
-            _show_tour_js = 'false'
-        try:
-            _force_tour_js = 'true' if self.consume_force_homepage_tour() else 'false'
-        except Exception:
-            _force_tour_js = 'false'
-        _first_pid_js = json.dumps(tour_first_pid)
+            """
         # i18n strings for tour (with fallbacks)
         _i18n = {
             'step1_title': _t('tour.step1.title'),
@@ -750,13 +825,13 @@ class HomepageManager(NSObject):
         }
         import json as _json
         _i18n_js = _json.dumps(_i18n, ensure_ascii=False)
-        html += f"""
-        <script>
+        tour_js = f"""
             // 一次性主页引导（统一采用内置简易导览，避免 driver.js 版本差异）
             (function(){{
-                var SHOW_TOUR = {_show_tour_js}; // 由原生计算的开关
-                var FORCE_TOUR = {_force_tour_js}; // 调试强制开关（忽略本地完成标志）
-                var FIRST_PID = {_first_pid_js};  // 示例平台 ID，用于定位元素
+                var STATE = window.__bbHome || {{}}; // 每次渲染由原生写入（外壳内的插槽）
+                var SHOW_TOUR = !!STATE.showTour; // 由原生计算的开关
+                var FORCE_TOUR = !!STATE.forceTour; // 调试强制开关（忽略本地完成标志）
+                var FIRST_PID = STATE.firstPid || 'openai';  // 示例平台 ID，用于定位元素
                 var I18N = {_i18n_js};
                 var USE_SIMPLE_TOUR = true; // 始终使用内置简易导览，统一视觉与动效
                 try {{
@@ -1241,8 +1316,8 @@ class HomepageManager(NSObject):
                 // 等待页面渲染完成后启动
                 window.requestAnimationFrame ? requestAnimationFrame(function(){{ setTimeout(tryStartTour, 80); }}) : setTimeout(tryStartTour, 120);
             }})();
-        </script>
-        <script>
+        """
+        tip_js = f"""
             // 全局：返回主页后用于展示快捷键提示（双次显示/隐藏），适配 Driver 与简易导览两种路径
             (function(){{
                 // 统一覆盖为新版白色居中气泡版本
@@ -1340,7 +1415,41 @@ class HomepageManager(NSObject):
                     }} catch(_e) {{}}
                 }};
             }})();
-        </script>
+        """
+        driver_css = 'assets/vendor/driver.js/driver.min.css'
+        if self._asset_scheme:
+            driver_css_tag = style_tag(url=asset_url(driver_css), element_id='driverjs-css')
+            home_css_tag = style_tag(url=publish('homepage/home.css', css))
+            main_js_tag = script_tag(url=publish('homepage/home.js', main_js))
+            tour_js_tag = script_tag(url=publish(f'homepage/{language}/tour.js', tour_js))
+            tip_js_tag = script_tag(url=publish('homepage/hotkey_tip.js', tip_js))
+        else:
+            driver_css_tag = style_tag(AssetCache.shared().get_text(driver_css), element_id='driverjs-css')
+            home_css_tag = style_tag(css)
+            main_js_tag = script_tag(main_js)
+            tour_js_tag = script_tag(tour_js)
+            tip_js_tag = script_tag(tip_js)
+        html = f"""
+        <!DOCTYPE html>
+        <html lang=\"zh-CN\">
+        <head>
+            <meta charset=\"UTF-8\"> 
+            <meta name=\"viewport\" content=\"width=device-width, initial-scale=1, maximum-scale=1\">
+            <title>Bubble</title>
+            <!-- driver.js 样式：本地版本（内嵌或 bubble:// 引用） -->
+            {driver_css_tag}
+            {home_css_tag}
+        </head>
+        <body>
+            <div class=\"list\">{slot('rows')}</div>
+            <div id=\"menu\" class=\"menu\"><div class=\"item\" data-action=\"duplicate\">重复添加</div></div>
+            <div id=\"popover\" class=\"popover\"></div>
+            {main_js_tag}
+        </body>
+        </html>
+        <script>window.__bbHome = {{ showTour: {slot('show_tour')}, forceTour: {slot('force_tour')}, firstPid: {slot('first_pid')}, version: {slot('version')} }};</script>
+        {tour_js_tag}
+        {tip_js_tag}
         """
         return html
     
@@ -0,0 +1,113 @@
+"""
+主页模板
+
+主页 HTML 由两部分组成：
+- 静态外壳：样式、driver.js 样式、交互与导览脚本、本地化文案；按 (语言, 外观) 编译一次并缓存
+- 动态片段：平台行与导览开关，每次渲染只重新生成这些并填入外壳的插槽
+
+外壳中用 slot(name) 标记插槽，编译时切分为静态段与插槽名，渲染只做一次 join。
+样式与脚本可内联，也可引用 bubble:// 资源（style_tag / script_tag 传入 url）。
+语言变化时由 HomepageManager.on_language_changed 调用 invalidate() 丢弃缓存。
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+_SLOT_RE = re.compile(r"@@slot:([a-z_]+)@@")
+
+APPEARANCE_LIGHT = "light"
+APPEARANCE_DARK = "dark"
+
+
+def slot(name: str) -> str:
+    """外壳中的插槽标记（渲染时替换为同名参数）"""
+    return f"@@slot:{name}@@"
+
+
+def current_appearance() -> str:
+    """系统当前外观（light/dark）；无 AppKit 时视为 light"""
+    try:
+        from AppKit import NSApp
+        appearance = NSApp.effectiveAppearance() if NSApp is not None else None
+        name = appearance.bestMatchFromAppearancesWithNames_(["NSAppearanceNameDarkAqua", "NSAppearanceNameAqua"]) if appearance else None
+        return APPEARANCE_DARK if name == "NSAppearanceNameDarkAqua" else APPEARANCE_LIGHT
+    except Exception:
+        return APPEARANCE_LIGHT
+
+
+def style_tag(css: str = "", url: Optional[str] = None, element_id: str = "") -> str:
+    """内联 <style>，或给出 url 时引用外部样式表"""
+    id_attr = f' id="{element_id}"' if element_id else ""
+    if url:
+        return f'<link rel="stylesheet"{id_attr} href="{url}">'
+    return f"<style{id_attr}>{css}</style>"
+
+
+def script_tag(js: str = "", url: Optional[str] = None) -> str:
+    """内联 <script>，或给出 url 时引用外部脚本（同步执行，顺序与内联一致）"""
+    if url:
+        return f'<script src="{url}"></script>'
+    return f"<script>{js}</script>"
+
+
+class CompiledTemplate:
+    """切分好的模板：静态段与插槽交替，render 时按插槽名填值"""
+
+    __slots__ = ("_parts", "_slots")
+
+    def __init__(self, text: str):
+        pieces = _SLOT_RE.split(text)
+        self._parts: List[str] = pieces[0::2]
+        self._slots: Tuple[str, ...] = tuple(pieces[1::2])
+
+    @property
+    def slots(self) -> Tuple[str, ...]:
+        return self._slots
+
+    def static_size(self) -> int:
+        return sum(len(p) for p in self._parts)
+
+    def render(self, **values) -> str:
+        """填充插槽；缺少的插槽抛出 KeyError（避免把标记原样发给页面）"""
+        out = [self._parts[0]]
+        for name, part in zip(self._slots, self._parts[1:]):
+            out.append(str(values[name]))
+            out.append(part)
+        return "".join(out)
+
+
+class TemplateCache:
+    """按 (语言, 外观) 缓存编译后的外壳；build(language, appearance) 返回带插槽标记的 HTML"""
+
+    def __init__(self, build: Callable[[str, str], str]):
+        self._build = build
+        self._compiled: Dict[Tuple[str, str], CompiledTemplate] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, language: str, appearance: str = APPEARANCE_LIGHT) -> CompiledTemplate:
+        key = (language, appearance)
+        template = self._compiled.get(key)
+        if template is not None:
+            self._hits += 1
+            return template
+        self._misses += 1
+        template = CompiledTemplate(self._build(language, appearance))
+        self._compiled[key] = template
+        return template
+
+    def invalidate(self, language: Optional[str] = None) -> int:
+        """丢弃缓存（指定语言时只丢弃该语言），返回丢弃的数量"""
+        keys = [k for k in self._compiled if language is None or k[0] == language]
+        for k in keys:
+            del self._compiled[k]
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._compiled)
+
+    def stats(self) -> Dict[str, int]:
+        return {"compiled": len(self._compiled), "hits": self._hits, "misses": self._misses}
@@ -9,7 +9,7 @@ import objc
 from AppKit import *
 from WebKit import *
 from Quartz import *
-from Foundation import NSObject, NSURL, NSURLRequest, NSTimer
+from Foundation import NSObject, NSURL, NSTimer
 from typing import Dict, List, Optional, Tuple
 import os
 import uuid
@@ -17,8 +17,13 @@ from datetime import datetime
 
 # 导入数据模型
 from ..models.ai_window import AIWindow, WindowState, WindowType, WindowGeometry, WindowManager
-from ..utils.suspend_policy import SuspendPolicy, suspend_webview, resume_webview
+from ..utils.suspend_policy import SuspendHost, SuspendPolicy, advance_tier, wake_window
+from ..utils.load_scheduler import LoadScheduler, PRIORITY_FOREGROUND, PRIORITY_RECENT, load_request
 from ..utils.webview_guard import NavigationGuard
+from ..utils.host_matcher import domain_rule
+from ..utils.window_ring import WindowRing
+from .config_manager import ConfigManager
+from .webview_factory import SAFARI_USER_AGENT, WebViewFactory
 from ..models.platform_config import PlatformConfig, AIServiceConfig
 from ..constants import (
     APP_TITLE,
@@ -117,6 +122,8 @@ class MultiWindowManager(NSObject):
             self.ns_windows = {}  # window_id -> NSWindow instance
             self.webviews = {}    # window_id -> WebView instance
             self.drag_areas = {}  # window_id -> DragArea instance
+            # 切换顺序环（与 ns_windows 同步，O(1) 前后切换）
+            self._window_ring = WindowRing()
             
             # 活动窗口跟踪
             self.active_ns_window = None
@@ -135,21 +142,42 @@ class MultiWindowManager(NSObject):
             self.window_offset = 30  # 新窗口偏移量
 
             # 用户代理
-            self.safari_user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15"
+            self.safari_user_agent = SAFARI_USER_AGENT
+            # WebView 工厂（与单窗口多页面共用进程池策略、用户脚本与内容规则）
+            self.webview_factory = WebViewFactory.shared()
 
             # 休眠策略（默认30分钟；可通过 settings 调整）
+            # 轻度休眠后再经过 suspend.deep_minutes 进入深度休眠：销毁 WebView，仅保留窗口占位
             self.suspend_policy = SuspendPolicy(30)
+            try:
+                self.suspend_policy.set_deep_timeout_minutes(ConfigManager.get_deep_suspend_minutes())
+            except Exception:
+                pass
+            self._suspend_host = SuspendHost(
+                lambda wid: self.webviews.get(wid),
+                lambda wid: self.window_manager.get_window(wid),
+                self._detach_webview,
+                self._recreate_webview,
+                lambda wid, wv, url: self._load_scheduler.request(wid, wv, url, PRIORITY_RECENT),
+            )
+            # 活跃预算（同时存活的 WebView 数量/估算内存），来自配置 suspend.max_live / suspend.memory_mb
+            try:
+                budget = ConfigManager.get_live_budget()
+                self.suspend_policy.set_live_budget(budget.get("max_live"), budget.get("memory_mb"))
+            except Exception:
+                pass
 
             # 导航守卫（外域拦截、失败重试）
             self._nav_guard = NavigationGuard.alloc().init()
 
-            # 定时检查休眠（每60秒）
-            try:
-                NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
-                    60.0, self, 'tickSuspend:', None, True
-                )
-            except Exception:
-                pass
+            # 加载队列：限制同时进行的导航数，前台窗口优先；导航守卫的完成/失败回调释放名额
+            self._load_scheduler = LoadScheduler(start=self._start_load)
+            self._nav_guard.set_load_listener(self._load_scheduler)
+            self._load_timer = None
+
+            # 休眠定时器：单次触发，始终对准策略中最早的休眠截止时间（无待休眠窗口时不启用）
+            self._suspend_timer = None
+            self._suspend_timer_due = None
         
         return self
     
@@ -187,6 +215,7 @@ class MultiWindowManager(NSObject):
         try:
             if bring_to_front:
                 ai_window.activate()
+                self._load_scheduler.promote(ai_window.window_id, PRIORITY_FOREGROUND)
                 self.window_manager.set_active_window(ai_window.window_id)
                 # 显示窗口
                 nsw = self.ns_windows.get(ai_window.window_id)
@@ -206,11 +235,8 @@ class MultiWindowManager(NSObject):
         except Exception:
             pass
         print(f"成功创建窗口: {ai_window.window_id} for platform: {platform_id} (bring_to_front={bring_to_front})")
-        try:
-            # 记录活动
-            self.suspend_policy.note_window_activity(ai_window.window_id)
-        except Exception:
-            pass
+        # 记录活动
+        self._note_activity(ai_window.window_id)
         # 回调
         try:
             new_count = len(self.window_manager.windows)
@@ -311,16 +337,13 @@ class MultiWindowManager(NSObject):
         target_window.makeKeyAndOrderFront_(None)
         self.active_ns_window = target_window
         self.window_manager.set_active_window(window_id)
-        # 恢复被激活窗口；对其他窗口进行活动记录
+        # 唤醒被激活窗口（轻度休眠恢复原 URL，深度休眠重建 WebView）
         try:
-            self.suspend_policy.note_window_activity(window_id)
-            # Resume webview for active
-            wv = self.webviews.get(window_id)
-            aiw = self.window_manager.get_window(window_id)
-            if wv is not None and aiw is not None:
-                resume_webview(wv, aiw)
+            wake_window(self.suspend_policy, window_id, self._suspend_host)
+            self._load_scheduler.promote(window_id, PRIORITY_FOREGROUND)
         except Exception:
             pass
+        self._note_activity(window_id)
         print(f"切换到窗口: {window_id}")
         return True
     
@@ -408,6 +431,7 @@ class MultiWindowManager(NSObject):
             
             # 保存窗口引用（是否显示由创建流程控制）
             self.ns_windows[ai_window.window_id] = ns_window
+            self._window_ring.add(ai_window.window_id)
             
             return True
             
@@ -529,7 +553,8 @@ class MultiWindowManager(NSObject):
         increase_btn.setAutoresizingMask_(NSViewMinXMargin)
         drag_area.addSubview_(increase_btn)
     
-    def _create_webview(self, ns_window, ai_window, platform_config, content_view, content_bounds):
+    def _create_webview(self, ns_window, ai_window, platform_config, content_view, content_bounds,
+                        initial_url=None):
         """
         创建WebView
         
@@ -539,27 +564,21 @@ class MultiWindowManager(NSObject):
             platform_config: 平台配置
             content_view: 内容视图
             content_bounds: 内容边界
+            initial_url: 初始加载地址（深度休眠重建时为休眠前的 URL），默认平台首页
             
         Returns:
             bool: 创建是否成功
         """
         try:
-            # 创建WebView配置
-            config = WKWebViewConfiguration.alloc().init()
-            config.preferences().setJavaScriptCanOpenWindowsAutomatically_(True)
-            
-            # 创建WebView
-            webview = WKWebView.alloc().initWithFrame_configuration_(
+            # 创建WebView（配置、进程池与用户代理由工厂按平台策略提供）
+            webview = self.webview_factory.create(
                 NSMakeRect(0, 0, content_bounds.size.width, 
                           content_bounds.size.height - DRAG_AREA_HEIGHT),
-                config
+                platform_id=ai_window.platform_id,
+                page_id=ai_window.window_id,
+                ui_delegate=self,
             )
             
-            # 设置WebView属性
-            webview.setUIDelegate_(self)
-            webview.setAutoresizingMask_(NSViewWidthSizable | NSViewHeightSizable)
-            webview.setCustomUserAgent_(self.safari_user_agent)
-            
             # 添加到内容视图
             content_view.addSubview_(webview)
 
@@ -567,26 +586,27 @@ class MultiWindowManager(NSObject):
             self.webviews[ai_window.window_id] = webview
 
             # 加载平台URL
-            ai_window.update_url(platform_config.url)
-            url = NSURL.URLWithString_(platform_config.url)
-            request = NSURLRequest.requestWithURL_(url)
-            webview.loadRequest_(request)
+            load_url = initial_url or platform_config.url
+            ai_window.update_url(load_url)
+            url = NSURL.URLWithString_(load_url)
 
-            # 为当前平台设置导航白名单（域名）并安装守卫
+            # 为当前窗口设置导航白名单并安装守卫（每个 WebView 独立策略，不影响已创建的窗口）
+            # 规则：平台主机及其可注册域名下的所有子域（CDN 等），'*.x' / '.x' 语法见 host_matcher
             try:
                 host = url.host() if hasattr(url, 'host') else None
                 base_hosts = set()
                 if host:
-                    base_hosts.add(str(host).lower())
+                    h = str(host).lower()
+                    base_hosts.add(h)
+                    base_hosts.add(domain_rule(h))
                     # Add common sibling hosts for known platforms
                     try:
                         pid = getattr(platform_config, 'platform_id', '') or ''
                     except Exception:
                         pid = ''
-                    h = str(host).lower()
                     # OpenAI: chat.openai.com often redirects to chatgpt.com and serves media from oaiusercontent.com
                     if pid == 'openai' or 'openai' in h or 'chatgpt' in h:
-                        base_hosts |= { 'chatgpt.com', 'openai.com', 'oaiusercontent.com' }
+                        base_hosts |= { '.chatgpt.com', '.openai.com', '.oaiusercontent.com' }
                 # 合并自定义 allow_hosts（来自 ConfigManager）
                 try:
                     from ..components.config_manager import ConfigManager as _CM
@@ -594,20 +614,12 @@ class MultiWindowManager(NSObject):
                     base_hosts |= extra
                 except Exception:
                     pass
-                # Set navigation whitelist for this window
-                try:
-                    # Prefer Objective-C friendly setter if available
-                    if hasattr(self._nav_guard, 'setAllowedHosts_'):
-                        self._nav_guard.setAllowedHosts_(list(base_hosts))
-                    else:
-                        # Fallback to direct attribute in pure-Python runs
-                        setattr(self._nav_guard, '_allowed_hosts', base_hosts)
-                except Exception:
-                    setattr(self._nav_guard, '_allowed_hosts', base_hosts)
-                self._nav_guard.attach_to(webview, on_retry=lambda: webview.reload())
+                self._nav_guard.attach_to(webview, on_retry=lambda: webview.reload(), allowed_hosts=base_hosts)
             except Exception:
                 pass
 
+            self._load_scheduler.request(ai_window.window_id, webview, load_url, PRIORITY_RECENT)
+
             return True
             
         except Exception as e:
@@ -642,10 +654,17 @@ class MultiWindowManager(NSObject):
         # 清理NSWindow引用
         if window_id in self.ns_windows:
             del self.ns_windows[window_id]
+        self._window_ring.remove(window_id)
+        try:
+            self.suspend_policy.forget(window_id)
+            self._load_scheduler.cancel(window_id)
+            self.webview_factory.release(window_id)
+        except Exception:
+            pass
         
         # 清理WebView引用
         if window_id in self.webviews:
-            del self.webviews[window_id]
+            self._nav_guard.detach(self.webviews.pop(window_id))
         
         # 清理拖拽区域引用
         if window_id in self.drag_areas:
@@ -736,10 +755,7 @@ class MultiWindowManager(NSObject):
                     int(frame.size.height)
                 )
             # 活动记录（认为有用户交互）
-            try:
-                self.suspend_policy.note_window_activity(window_id)
-            except Exception:
-                pass
+            self._note_activity(window_id)
     
     # MARK: - 公共接口方法
     
@@ -794,13 +810,130 @@ class MultiWindowManager(NSObject):
         
         return window_list
 
-    # 定时器回调：周期性尝试对非活动窗口执行挂起
+    # 定时器回调：到达最早的休眠截止时间，对到期的非活动窗口执行挂起
     def tickSuspend_(self, _):
+        self._suspend_timer = None
+        self._suspend_timer_due = None
         try:
             self._apply_suspension_if_needed()
         except Exception:
             pass
 
+    def _note_activity(self, window_id):
+        """记录窗口活动；若产生了更早的截止时间则重新对准定时器，并检查活跃预算。"""
+        try:
+            self.suspend_policy.note_window_activity(window_id)
+            due = self.suspend_policy.next_deadline()
+            if due is not None and (self._suspend_timer_due is None or due < self._suspend_timer_due):
+                self._arm_suspend_timer()
+        except Exception:
+            pass
+        self._enforce_live_budget()
+
+    def _enforce_live_budget(self):
+        """超出活跃预算时，立即挂起最久未活动的非前台窗口。"""
+        try:
+            policy = self.suspend_policy
+            active_id = self.window_manager.active_window_id
+            for wid in policy.pick_evictions(foreground=active_id):
+                try:
+                    advance_tier(policy, wid, self._suspend_host, foreground=active_id)
+                except Exception:
+                    pass
+        except Exception:
+            pass
+
+    def _detach_webview(self, window_id):
+        """深度休眠：移除并释放 WebView，NSWindow 与拖拽区域保留为占位。"""
+        webview = self.webviews.pop(window_id, None)
+        if webview is None:
+            return
+        self._load_scheduler.cancel(window_id)
+        self.webview_factory.release(window_id)
+        self._nav_guard.detach(webview)
+        try:
+            webview.setUIDelegate_(None)
+            webview.setNavigationDelegate_(None)
+        except Exception:
+            pass
+        try:
+            webview.removeFromSuperview()
+        except Exception:
+            pass
+
+    def _recreate_webview(self, window_id, url=None):
+        """深度休眠唤醒：在原窗口中重建 WebView 并加载休眠前的 URL。"""
+        nsw = self.ns_windows.get(window_id)
+        aiw = self.window_manager.get_window(window_id)
+        if nsw is None or aiw is None:
+            return None
+        try:
+            platform_config = self.platform_config.get_platform(aiw.platform_id)
+            if not platform_config:
+                return None
+            content_view = nsw.contentView()
+            if self._create_webview(nsw, aiw, platform_config, content_view, content_view.bounds(),
+                                    initial_url=url):
+                print(f"深度休眠窗口已重建 WebView: {window_id}")
+                return self.webviews.get(window_id)
+        except Exception as e:
+            print(f"重建WebView失败: {e}")
+        return None
+
+    def _start_load(self, webview, url):
+        """加载队列分配到名额时调用：发起导航并对准超时检查定时器。"""
+        load_request(webview, url)
+        self._arm_load_timer()
+
+    def _arm_load_timer(self):
+        if self._load_timer is not None:
+            return
+        try:
+            due = self._load_scheduler.next_timeout()
+            if due is None:
+                return
+            interval = max(0.5, float(due) - self._load_scheduler.now())
+            self._load_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+                interval, self, 'tickLoads:', None, False
+            )
+        except Exception:
+            self._load_timer = None
+
+    # 定时器回调：释放超时仍未完成的导航名额
+    def tickLoads_(self, _):
+        self._load_timer = None
+        try:
+            self._load_scheduler.expire()
+        except Exception:
+            pass
+        self._arm_load_timer()
+
+    def load_stats(self):
+        """加载队列指标（排队数、进行中、等待时间等）。"""
+        return self._load_scheduler.stats()
+
+    def _arm_suspend_timer(self):
+        """按 next_deadline() 设置单次定时器（替换已有定时器）。"""
+        try:
+            if self._suspend_timer is not None:
+                self._suspend_timer.invalidate()
+        except Exception:
+            pass
+        self._suspend_timer = None
+        self._suspend_timer_due = None
+        try:
+            due = self.suspend_policy.next_deadline()
+            if due is None:
+                return
+            # 截止时间基于策略时钟；至少延后 0.5 秒，避免忙等
+            interval = max(0.5, float(due) - self.suspend_policy.now())
+            self._suspend_timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+                interval, self, 'tickSuspend:', None, False
+            )
+            self._suspend_timer_due = due
+        except Exception:
+            pass
+
     # MARK: - 休眠策略集成与窗口环切
 
     def set_suspend_policy(self, policy: SuspendPolicy):
@@ -808,53 +941,64 @@ class MultiWindowManager(NSObject):
             self.suspend_policy = policy
         except Exception:
             pass
+        self._arm_suspend_timer()
 
     def update_suspend_timeout(self, minutes: int):
         try:
             self.suspend_policy.set_timeout_minutes(minutes)
         except Exception:
             pass
+        self._arm_suspend_timer()
+
+    def update_deep_suspend_timeout(self, minutes: int):
+        """更新轻度休眠升级为深度休眠的等待时间（0 表示不进入深度休眠）。"""
+        try:
+            self.suspend_policy.set_deep_timeout_minutes(minutes)
+        except Exception:
+            pass
+        self._arm_suspend_timer()
+
+    def update_live_budget(self, max_live: int = 0, memory_mb: int = 0):
+        """更新活跃预算（0 表示不限制）并立即生效。"""
+        try:
+            self.suspend_policy.set_live_budget(max_live, memory_mb)
+        except Exception:
+            pass
+        self._enforce_live_budget()
 
     def _apply_suspension_if_needed(self):
-        """检查并对非活动窗口应用挂起（轻量级）。"""
+        """对已到期的非活动窗口应用挂起（只处理到期窗口，随后重新对准定时器）。"""
         try:
+            policy = self.suspend_policy
             active_id = self.window_manager.active_window_id
-            for wid, wv in list(self.webviews.items()):
-                if wid == active_id:
-                    # Ensure active is resumed
-                    try:
-                        aiw = self.window_manager.get_window(wid)
-                        if aiw is not None:
-                            resume_webview(wv, aiw)
-                    except Exception:
-                        pass
-                    continue
-                if self.suspend_policy.should_suspend(wid):
-                    try:
-                        aiw = self.window_manager.get_window(wid)
-                        if aiw is not None:
-                            suspend_webview(wv, aiw)
-                            self.suspend_policy.mark_suspended(wid)
-                    except Exception:
-                        pass
+            for wid in policy.pop_due():
+                # 活跃 -> 轻度休眠，轻度 -> 深度休眠；前台窗口视为仍在使用，重新计时
+                try:
+                    advance_tier(policy, wid, self._suspend_host, foreground=active_id)
+                except Exception:
+                    pass
+            # Ensure active is resumed
+            if active_id and policy.is_suspended(active_id):
+                wake_window(policy, active_id, self._suspend_host)
         except Exception:
             pass
+        self._arm_suspend_timer()
+
+    def cycle_active_window(self, forward: bool = True, skip_suspended: bool = False):
+        """在已打开窗口中环切并前置显示。
 
-    def cycle_active_window(self, forward: bool = True):
-        """在已打开窗口中环切并前置显示。"""
+        skip_suspended 为 True 时优先跳过已休眠的窗口（全部休眠时退回普通顺序）。
+        """
         if not self.ns_windows:
             return False
-        ids = list(self.ns_windows.keys())
         cur = self.window_manager.active_window_id
-        try:
-            idx = ids.index(cur) if cur in ids else -1
-        except Exception:
-            idx = -1
-        if forward:
-            next_idx = 0 if idx == -1 else (idx + 1) % len(ids)
-        else:
-            next_idx = (idx - 1) % len(ids) if idx != -1 else 0
-        target_id = ids[next_idx]
+        target_id = None
+        if skip_suspended:
+            target_id = self._window_ring.step(cur, forward, skip=self.suspend_policy.is_suspended)
+        if target_id is None:
+            target_id = self._window_ring.step(cur, forward)
+        if target_id is None:
+            return False
         ok = self.switch_to_window(target_id)
         # 切换后尝试应用挂起策略到其他窗口
         try:
@@ -862,3 +1006,10 @@ class MultiWindowManager(NSObject):
         except Exception:
             pass
         return ok
+
+    def jump_to_window(self, n: int) -> bool:
+        """切换到第 n 个窗口（按打开顺序，从 1 开始；负数从末尾计）。"""
+        target_id = self._window_ring.nth(n)
+        if target_id is None:
+            return False
+        return bool(self.switch_to_window(target_id))
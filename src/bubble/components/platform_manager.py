@@ -5,6 +5,7 @@ AI平台管理器
 负责管理用户的AI平台选择、配置存储以及平台状态的统一管理。
 """
 
+import copy
 import json
 import os
 from pathlib import Path
@@ -12,6 +13,8 @@ from typing import Dict, List, Optional, Callable
 from dataclasses import dataclass, field
 
 from ..models.platform_config import PlatformConfig, AIServiceConfig, PlatformType
+from ..utils.config_writer import shared_writer
+from ..utils.backup_ring import BackupRing
 
 
 @dataclass
@@ -43,6 +46,11 @@ class PlatformManager:
         self._platform_config = PlatformConfig()
         self._listeners: List[Callable[[str, Dict], None]] = []
         self._config_loaded = False
+        self._backup_ring = BackupRing(
+            str(Path(self.config.backup_config_path).expanduser().parent),
+            prefix="platforms",
+            max_entries=self.config.max_backup_files,
+        )
         
         # 确保配置目录存在
         self._ensure_config_directory()
@@ -117,7 +125,18 @@ class PlatformManager:
             return False
     
     def _load_backup_config(self) -> bool:
-        """加载备份配置"""
+        """加载备份配置（优先按索引选取最新且校验通过的备份）"""
+        try:
+            found = self._backup_ring.latest_valid()
+            if found is not None:
+                entry, data = found
+                self._platform_config = PlatformConfig.from_dict(data)
+                print(f"从备份配置加载成功: {entry.get('hash', '')[:12]}")
+                return True
+        except Exception as e:
+            print(f"加载备份配置失败: {e}")
+        
+        # 兼容旧版本的单文件备份
         try:
             backup_path = Path(self.config.backup_config_path).expanduser()
             if backup_path.exists():
@@ -142,13 +161,11 @@ class PlatformManager:
         try:
             config_path = Path(self.config.config_file_path).expanduser()
             
-            # 创建备份
-            if self.config.auto_backup and config_path.exists():
-                self._create_backup()
+            # 备份在后台写线程中、替换文件之前执行
+            pre_write = self._create_backup if self.config.auto_backup else None
             
-            # 保存配置
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(self._platform_config.to_dict(), f, indent=2, ensure_ascii=False)
+            # 保存配置（后台合并写入，临时文件 + fsync + 原子替换）
+            shared_writer().schedule(str(config_path), copy.deepcopy(self._platform_config.to_dict()), pre_write=pre_write)
             
             self._notify_listeners("config_saved", {"success": True})
             return True
@@ -159,43 +176,39 @@ class PlatformManager:
             return False
     
     def _create_backup(self):
-        """创建配置备份"""
+        """创建配置备份（内容寻址，内容未变化时不重复存储）"""
         try:
             config_path = Path(self.config.config_file_path).expanduser()
-            backup_path = Path(self.config.backup_config_path).expanduser()
-            
-            # 创建时间戳备份
-            import time
-            timestamp = int(time.time())
-            timestamped_backup = backup_path.parent / f"platforms_backup_{timestamp}.json"
-            
-            # 复制当前配置到备份
-            if config_path.exists():
-                import shutil
-                shutil.copy2(config_path, timestamped_backup)
-                shutil.copy2(config_path, backup_path)
-            
-            # 清理旧备份文件
-            self._cleanup_old_backups()
-            
+            self._backup_ring.store_file(str(config_path))
         except Exception as e:
             print(f"创建备份失败: {e}")
     
-    def _cleanup_old_backups(self):
-        """清理旧的备份文件"""
-        try:
-            backup_dir = Path(self.config.backup_config_path).expanduser().parent
-            backup_files = list(backup_dir.glob("platforms_backup_*.json"))
-            
-            # 按修改时间排序，保留最新的几个
-            backup_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+    def restore_backup(self, key) -> bool:
+        """
+        从备份恢复平台配置
+        
+        Args:
+            key: 备份的哈希（或唯一前缀）或时间戳（取该时刻及之前最新的备份）
             
-            # 删除超出数量限制的备份文件
-            for backup_file in backup_files[self.config.max_backup_files:]:
-                backup_file.unlink()
-                
+        Returns:
+            bool: 恢复是否成功
+        """
+        try:
+            payload = self._backup_ring.restore(key)
+            if payload is None:
+                return False
+            self._platform_config = PlatformConfig.from_dict(json.loads(payload))
+            self._notify_listeners("config_loaded", {"success": True, "restored": True})
+            if self.config.auto_save:
+                self.save_config()
+            return True
         except Exception as e:
-            print(f"清理备份文件失败: {e}")
+            print(f"恢复备份失败: {e}")
+            return False
+    
+    def list_backups(self) -> List[Dict]:
+        """获取备份索引（最新的在最后）"""
+        return self._backup_ring.entries()
     
     def add_platform(self, platform_config: AIServiceConfig) -> bool:
         """
@@ -64,6 +64,7 @@ except Exception:
 
 from ..i18n import t as _t, get_language as _get_lang
 from ..utils import login_items
+from ..utils.asset_cache import AssetCache
 from .config_manager import ConfigManager
 from ..listener import set_custom_launcher_trigger
 
@@ -2460,12 +2461,12 @@ class SettingsWindow(NSObject):
                 'logo/icon.iconset/icon_32x32.png',
                 'logo/icon.iconset/icon_64x64.png',
             ]
-            # Try package data first (inside app bundle)
+            # Shared asset cache: package data first (inside app bundle), then the source tree
             try:
-                import pkgutil
                 from Foundation import NSData
+                assets = AssetCache.shared()
                 for rel in color_candidates:
-                    data = pkgutil.get_data('bubble', rel)
+                    data = assets.get_bytes(rel)
                     if data:
                         nsdata = NSData.dataWithBytes_length_(data, len(data))
                         img = NSImage.alloc().initWithData_(nsdata)
@@ -2477,18 +2478,6 @@ class SettingsWindow(NSObject):
                             return img
             except Exception:
                 pass
-            # Fallback to filesystem path next to module
-            try:
-                import os
-                here = os.path.dirname(os.path.abspath(__file__))
-                for rel in color_candidates:
-                    p = os.path.join(here, '..', rel)
-                    p = os.path.normpath(p)
-                    img = NSImage.alloc().initWithContentsOfFile_(p)
-                    if img is not None:
-                        return img
-            except Exception:
-                pass
         except Exception:
             pass
         # Last resort: fall back to monochrome for current appearance
@@ -2505,9 +2494,8 @@ class SettingsWindow(NSObject):
             except Exception:
                 pass
             rel_path = 'logo/logo_white.png' if dark else 'logo/logo_black.png'
-            import pkgutil
             from Foundation import NSData
-            data = pkgutil.get_data('bubble', rel_path)
+            data = AssetCache.shared().get_bytes(rel_path)
             if data:
                 nsdata = NSData.dataWithBytes_length_(data, len(data))
                 img = NSImage.alloc().initWithData_(nsdata)
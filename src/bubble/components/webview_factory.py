@@ -0,0 +1,307 @@
+"""
+WebView 工厂
+
+统一创建 WKWebView：单窗口多页面（app.py）与多窗口（MultiWindowManager）共用同一套
+配置（用户代理、用户脚本、内容规则）与进程池策略：
+- shared：所有页面共用一个 WKProcessPool（内存最省）
+- platform：同一平台的页面共用，平台之间隔离
+- isolated：每个页面独立进程池（隔离最强，内存最多）
+
+策略可按平台覆盖，来自配置 webview.process_pool / webview.platform_process_pool。
+注：macOS 12 起系统会忽略 WKProcessPool 的区分，此时策略不影响实际进程数。
+
+用户脚本可限定平台：平台未知时（预建池中的实例）不注入，取用后再由 attach_platform_scripts 补装；
+主窗口 WebView 在主页与各平台间复用，每次加载前由 retarget_platform_scripts 换装。
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from WebKit import (
+        WKContentRuleListStore,
+        WKProcessPool,
+        WKUserScript,
+        WKUserScriptInjectionTimeAtDocumentEnd,
+        WKUserScriptInjectionTimeAtDocumentStart,
+        WKWebView,
+        WKWebViewConfiguration,
+    )
+    from AppKit import NSViewHeightSizable, NSViewWidthSizable
+except Exception:  # pragma: no cover - allow import on non-Darwin
+    WKContentRuleListStore = None  # type: ignore
+    WKProcessPool = None  # type: ignore
+    WKUserScript = None  # type: ignore
+    WKUserScriptInjectionTimeAtDocumentEnd = 1  # type: ignore
+    WKUserScriptInjectionTimeAtDocumentStart = 0  # type: ignore
+    WKWebView = None  # type: ignore
+    WKWebViewConfiguration = None  # type: ignore
+    NSViewHeightSizable = 16  # type: ignore
+    NSViewWidthSizable = 2  # type: ignore
+
+
+# 进程池策略
+PROCESS_POOL_SHARED = "shared"
+PROCESS_POOL_PER_PLATFORM = "platform"
+PROCESS_POOL_ISOLATED = "isolated"
+PROCESS_POOL_STRATEGIES = (PROCESS_POOL_SHARED, PROCESS_POOL_PER_PLATFORM, PROCESS_POOL_ISOLATED)
+
+SAFARI_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.0 Safari/605.1.15"
+)
+
+# 恢复被内联样式禁用的点击：加载完成时只扫描带内联 pointer-events 的节点，
+# 之后由 MutationObserver 处理新增节点与 style 变化（替代每次导航遍历整个 DOM）
+POINTER_EVENTS_FIX_JS = """
+(function () {
+  if (window.__bubblePointerFix) { return; }
+  window.__bubblePointerFix = true;
+  var SELECTOR = '[style*="pointer-events"]';
+  function fix(el) {
+    if (el.style && el.style.pointerEvents === 'none') { el.style.pointerEvents = 'auto'; }
+  }
+  function sweep(root) {
+    if (!root || root.nodeType !== 1) { return; }
+    fix(root);
+    var found = root.querySelectorAll(SELECTOR);
+    for (var i = 0; i < found.length; i++) { fix(found[i]); }
+  }
+  function start() {
+    if (document.body) { document.body.style.pointerEvents = 'auto'; }
+    sweep(document.documentElement);
+    new MutationObserver(function (mutations) {
+      for (var i = 0; i < mutations.length; i++) {
+        var m = mutations[i];
+        if (m.type === 'attributes') { fix(m.target); continue; }
+        for (var j = 0; j < m.addedNodes.length; j++) { sweep(m.addedNodes[j]); }
+      }
+    }).observe(document.documentElement, {
+      subtree: true, childList: true, attributes: true, attributeFilter: ['style']
+    });
+  }
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', start, { once: true });
+  } else {
+    start();
+  }
+})();
+"""
+
+
+def _new_process_pool():
+    return WKProcessPool.alloc().init()
+
+
+class WebViewFactory:
+    """WKWebView 工厂（进程池策略、用户代理、用户脚本与内容规则）"""
+
+    _shared: Optional["WebViewFactory"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, strategy: str = PROCESS_POOL_SHARED, user_agent: str = SAFARI_USER_AGENT,
+                 platform_strategies: Optional[Dict[str, str]] = None,
+                 new_process_pool: Callable[[], Any] = _new_process_pool):
+        self._strategy = PROCESS_POOL_SHARED
+        self._platform_strategies: Dict[str, str] = {}
+        self.user_agent = user_agent
+        self._new_process_pool = new_process_pool
+        # 池键 -> WKProcessPool（"*" 为全局共享，"platform:<id>"，"page:<id>"）
+        self._process_pools: Dict[str, Any] = {}
+        # (source, at_document_start, main_frame_only, platform_filter)
+        self._user_scripts: List[Tuple[str, bool, bool, Optional[Callable[[str], bool]]]] = []
+        # 标识 -> 已编译的 WKContentRuleList
+        self._content_rules: Dict[str, Any] = {}
+        self.set_strategy(strategy)
+        for pid, value in (platform_strategies or {}).items():
+            self.set_strategy(value, pid)
+
+    @classmethod
+    def shared(cls) -> "WebViewFactory":
+        """进程内共享的工厂（首次调用时按配置创建），保证全局共享进程池真正唯一"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls.from_config()
+            return cls._shared
+
+    @classmethod
+    def from_config(cls) -> "WebViewFactory":
+        from .config_manager import ConfigManager
+        try:
+            cfg = ConfigManager.get_process_pool_strategy()
+            factory = cls(cfg.get("default", PROCESS_POOL_SHARED), platform_strategies=cfg.get("platforms"))
+        except Exception as e:
+            print(f"WARNING[webview]: 读取进程池策略失败，使用共享进程池: {e}")
+            factory = cls()
+        # 点击修复脚本按平台启用（webview.pointer_fix / webview.platform_pointer_fix）；策略读取失败时同样安装
+        factory.add_user_script(POINTER_EVENTS_FIX_JS, platforms=ConfigManager.get_pointer_fix_enabled)
+        return factory
+
+    # MARK: - 进程池策略
+    def set_strategy(self, strategy: Optional[str], platform_id: Optional[str] = None) -> None:
+        """设置默认（或指定平台的）进程池策略；平台传入 None/未知策略表示取消覆盖"""
+        valid = strategy in PROCESS_POOL_STRATEGIES
+        if platform_id is None:
+            self._strategy = strategy if valid else PROCESS_POOL_SHARED
+        elif valid:
+            self._platform_strategies[platform_id] = strategy
+        else:
+            self._platform_strategies.pop(platform_id, None)
+
+    def strategy_for(self, platform_id: Optional[str] = None) -> str:
+        if platform_id is not None:
+            return self._platform_strategies.get(platform_id, self._strategy)
+        return self._strategy
+
+    def pool_key(self, platform_id: Optional[str] = None, page_id: Optional[str] = None) -> str:
+        """页面所属进程池的键；缺少平台/页面信息时退回全局共享"""
+        strategy = self.strategy_for(platform_id)
+        if strategy == PROCESS_POOL_ISOLATED and page_id:
+            return f"page:{page_id}"
+        if strategy in (PROCESS_POOL_PER_PLATFORM, PROCESS_POOL_ISOLATED) and platform_id:
+            return f"platform:{platform_id}"
+        return "*"
+
+    def process_pool(self, platform_id: Optional[str] = None, page_id: Optional[str] = None):
+        key = self.pool_key(platform_id, page_id)
+        pool = self._process_pools.get(key)
+        if pool is None:
+            pool = self._new_process_pool()
+            self._process_pools[key] = pool
+        return pool
+
+    def release(self, page_id: Optional[str]) -> None:
+        """页面关闭/深度休眠：释放其独立进程池（共享池保留）"""
+        if page_id:
+            self._process_pools.pop(f"page:{page_id}", None)
+
+    def process_pool_count(self) -> int:
+        return len(self._process_pools)
+
+    # MARK: - 用户脚本与内容规则
+    def add_user_script(self, source: str, at_document_start: bool = False, main_frame_only: bool = True,
+                        platforms: Optional[Callable[[str], bool]] = None) -> None:
+        """注册用户脚本，之后创建的 WebView 都会注入；platforms(platform_id) 为假的平台不注入"""
+        if any(s[0] == source for s in self._user_scripts):
+            return
+        self._user_scripts.append((source, bool(at_document_start), bool(main_frame_only), platforms))
+
+    def user_scripts(self, platform_id: Optional[str] = None, platform_only: bool = False) -> List[Tuple[str, bool, bool]]:
+        """平台适用的脚本 (source, at_document_start, main_frame_only)。
+
+        平台未知时只返回不限平台的脚本；platform_only 为 True 时只返回限定平台的脚本。
+        """
+        out = []
+        for source, at_start, main_only, platforms in self._user_scripts:
+            if platforms is None:
+                if platform_only:
+                    continue
+            elif platform_id is None:
+                continue
+            else:
+                try:
+                    if not platforms(platform_id):
+                        continue
+                except Exception:
+                    continue
+            out.append((source, at_start, main_only))
+        return out
+
+    def _add_scripts(self, controller, scripts) -> None:
+        for source, at_start, main_only in scripts:
+            try:
+                when = WKUserScriptInjectionTimeAtDocumentStart if at_start else WKUserScriptInjectionTimeAtDocumentEnd
+                script = WKUserScript.alloc().initWithSource_injectionTime_forMainFrameOnly_(source, when, main_only)
+                controller.addUserScript_(script)
+            except Exception:
+                pass
+
+    def attach_platform_scripts(self, webview, platform_id: Optional[str]) -> None:
+        """为平台未知时创建的 WebView（预建池）补装限定平台的脚本，需在首次加载前调用"""
+        if webview is None or platform_id is None:
+            return
+        try:
+            controller = webview.configuration().userContentController()
+        except Exception:
+            return
+        self._add_scripts(controller, self.user_scripts(platform_id, platform_only=True))
+
+    def retarget_platform_scripts(self, webview, platform_id: Optional[str]) -> None:
+        """为换平台复用的 WebView（主窗口 WebView）换装限定平台的脚本，需在加载前调用。
+
+        WKUserContentController 只能整体移除脚本：保留非本工厂限定平台的脚本（如宿主自己注入的），
+        再装上 platform_id 适用的限定平台脚本；platform_id 为 None（主页）时只移除。
+        """
+        if webview is None:
+            return
+        try:
+            controller = webview.configuration().userContentController()
+            gated = {source for source, _, _, platforms in self._user_scripts if platforms is not None}
+            keep = [s for s in list(controller.userScripts() or []) if s.source() not in gated]
+            controller.removeAllUserScripts()
+            for script in keep:
+                controller.addUserScript_(script)
+        except Exception as e:
+            print(f"WARNING[webview]: 换装平台脚本失败: {e}")
+            return
+        if platform_id is not None:
+            self._add_scripts(controller, self.user_scripts(platform_id, platform_only=True))
+
+    def add_content_rules(self, identifier: str, rules_json: str) -> None:
+        """编译内容拦截规则（异步），编译完成后新建的 WebView 生效"""
+        if WKContentRuleListStore is None:
+            return
+
+        def _done(rule_list, error):
+            if rule_list is not None:
+                self._content_rules[identifier] = rule_list
+            elif error is not None:
+                print(f"WARNING[webview]: 内容规则 {identifier} 编译失败: {error}")
+        try:
+            WKContentRuleListStore.defaultStore().compileContentRuleListForIdentifier_encodedContentRuleList_completionHandler_(
+                identifier, rules_json, _done
+            )
+        except Exception as e:
+            print(f"WARNING[webview]: 内容规则 {identifier} 编译失败: {e}")
+
+    def remove_content_rules(self, identifier: str) -> None:
+        self._content_rules.pop(identifier, None)
+
+    # MARK: - 创建
+    def configuration(self, platform_id: Optional[str] = None, page_id: Optional[str] = None):
+        """按策略创建 WKWebViewConfiguration（进程池、用户脚本、内容规则）"""
+        cfg = WKWebViewConfiguration.alloc().init()
+        try:
+            cfg.preferences().setJavaScriptCanOpenWindowsAutomatically_(True)
+        except Exception:
+            pass
+        try:
+            cfg.setProcessPool_(self.process_pool(platform_id, page_id))
+        except Exception as e:
+            print(f"WARNING[webview]: 设置进程池失败: {e}")
+        controller = cfg.userContentController()
+        self._add_scripts(controller, self.user_scripts(platform_id))
+        for rule_list in self._content_rules.values():
+            try:
+                controller.addContentRuleList_(rule_list)
+            except Exception:
+                pass
+        return cfg
+
+    def create(self, frame, platform_id: Optional[str] = None, page_id: Optional[str] = None,
+               ui_delegate=None, navigation_delegate=None):
+        """创建已配置的 WKWebView（用户代理、自动伸缩、代理）"""
+        webview = WKWebView.alloc().initWithFrame_configuration_(frame, self.configuration(platform_id, page_id))
+        try:
+            webview.setAutoresizingMask_(NSViewWidthSizable | NSViewHeightSizable)
+            if self.user_agent:
+                webview.setCustomUserAgent_(self.user_agent)
+            if ui_delegate is not None:
+                webview.setUIDelegate_(ui_delegate)
+            if navigation_delegate is not None:
+                webview.setNavigationDelegate_(navigation_delegate)
+        except Exception:
+            pass
+        return webview
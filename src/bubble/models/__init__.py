@@ -5,14 +5,20 @@
 - 平台配置模型
 - 窗口实例模型
 - 用户配置模型
+- 页面注册表
+- 主页视图模型
 """
 
 from .platform_config import PlatformConfig, AIServiceConfig
 from .ai_window import AIWindow, WindowState
+from .page_registry import PageRegistry
+from .homepage_view_model import HomepageViewModel
 
 __all__ = [
     'PlatformConfig',
     'AIServiceConfig', 
     'AIWindow',
-    'WindowState'
+    'WindowState',
+    'PageRegistry',
+    'HomepageViewModel'
 ]
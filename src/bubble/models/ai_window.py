@@ -5,9 +5,11 @@ AI窗口实例数据模型
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, Optional, List, Tuple
+from typing import Callable, Dict, Optional, List, Tuple
 from enum import Enum
 from datetime import datetime
+import itertools
+import time
 import uuid
 
 
@@ -28,13 +30,31 @@ class WindowType(Enum):
     POPUP = "popup"           # 弹出窗口
 
 
-@dataclass
 class WindowGeometry:
-    """窗口几何信息"""
-    x: int = 100
-    y: int = 100
-    width: int = 800
-    height: int = 600
+    """窗口几何信息（__slots__ 紧凑表示，变更时通知所属窗口）"""
+    __slots__ = ("x", "y", "width", "height", "_owner")
+    
+    def __init__(self, x: int = 100, y: int = 100, width: int = 800, height: int = 600):
+        object.__setattr__(self, "_owner", None)
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        # 直接修改几何字段（geometry.x = ...）也要让所属窗口的序列化片段失效
+        owner = self._owner
+        if owner is not None and name != "_owner":
+            owner._invalidate()
+    
+    def __eq__(self, other):
+        if not isinstance(other, WindowGeometry):
+            return NotImplemented
+        return (self.x, self.y, self.width, self.height) == (other.x, other.y, other.width, other.height)
+    
+    def __repr__(self) -> str:
+        return f"WindowGeometry(x={self.x!r}, y={self.y!r}, width={self.width!r}, height={self.height!r})"
     
     def to_dict(self) -> Dict:
         """转换为字典格式"""
@@ -56,35 +76,167 @@ class WindowGeometry:
         )
 
 
-@dataclass
+def _to_timestamp(value) -> Optional[float]:
+    """datetime / 时间戳 -> 浮点时间戳（None 保持 None）"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def _to_datetime(ts: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(ts) if ts is not None else None
+
+
+# 序列化片段的全局代号：同 ID 替换为新实例时也不会与旧代号重复
+_fragment_generations = itertools.count(1)
+
+# 写入这些槽位不视为数据变更
+_NON_DATA_SLOTS = frozenset(("_fragment", "_fragment_gen", "_state_observer", "_change_observer"))
+_UNSET = object()
+
+
 class AIWindow:
     """
     AI窗口实例类
     
     管理单个 AI 窗口的状态、配置和生命周期。
     支持多窗口同平台管理和窗口状态追踪。
-    """
-    window_id: str
-    platform_id: str
-    window_type: WindowType = WindowType.MAIN
-    state: WindowState = WindowState.INACTIVE
-    geometry: WindowGeometry = field(default_factory=WindowGeometry)
-    created_at: datetime = field(default_factory=datetime.now)
-    last_active_at: Optional[datetime] = None
-    url: Optional[str] = None
-    title: Optional[str] = None
-    user_agent: Optional[str] = None
-    session_data: Dict = field(default_factory=dict)
     
-    def __post_init__(self):
-        """初始化后处理"""
-        if not self.window_id:
-            self.window_id = str(uuid.uuid4())
+    使用 __slots__ 紧凑表示：时间以浮点时间戳保存，仅在读取 created_at /
+    last_active_at 或 to_dict 时转换为 datetime；session_data 首次写入时才创建。
+    构造参数与 to_dict/from_dict 格式保持不变。
+    
+    脏标记：任何数据字段写入（含几何信息）都会使缓存的序列化片段失效并通知
+    WindowManager；serialized() 仅在片段失效时重新编码，未变更的窗口直接复用上次结果。
+    """
+    __slots__ = (
+        "window_id", "platform_id", "window_type", "_state", "geometry",
+        "_created_ts", "_last_active_ts", "url", "title", "user_agent",
+        "_session_data", "_state_observer",
+        "_fragment", "_fragment_gen", "_change_observer",
+    )
+    
+    def __init__(self, window_id: str, platform_id: str,
+                 window_type: WindowType = WindowType.MAIN,
+                 state: WindowState = WindowState.INACTIVE,
+                 geometry: Optional[WindowGeometry] = None,
+                 created_at=None,
+                 last_active_at=None,
+                 url: Optional[str] = None,
+                 title: Optional[str] = None,
+                 user_agent: Optional[str] = None,
+                 session_data: Optional[Dict] = None):
+        self._fragment: Optional[Dict] = None
+        self._fragment_gen = 0
+        # 变更观察者（由 WindowManager 挂载，用于收集待持久化的窗口）
+        self._change_observer: Optional[Callable[['AIWindow'], None]] = None
+        # 状态变更观察者（由 WindowManager 挂载，用于维护状态索引）
+        self._state_observer: Optional[Callable[['AIWindow', Optional[WindowState], WindowState], None]] = None
+        self.window_id = window_id or str(uuid.uuid4())
+        self.platform_id = platform_id
+        self.window_type = window_type
+        self._state = state
+        self.geometry = geometry if geometry is not None else WindowGeometry()
+        self._created_ts: float = time.time() if created_at is None else _to_timestamp(created_at)
+        self._last_active_ts: Optional[float] = _to_timestamp(last_active_at)
+        self.url = url
+        self.title = title
+        self.user_agent = user_agent
+        self._session_data: Optional[Dict] = session_data or None
+    
+    def __setattr__(self, name, value):
+        if name in _NON_DATA_SLOTS:
+            object.__setattr__(self, name, value)
+            return
+        # 写入同一对象不算变更（例如重复 deactivate），避免无谓的重新编码
+        old = getattr(self, name, _UNSET)
+        object.__setattr__(self, name, value)
+        if old is value:
+            return
+        if name == "geometry":
+            if isinstance(old, WindowGeometry) and old._owner is self:
+                old._owner = None
+            if isinstance(value, WindowGeometry):
+                value._owner = self
+        self._invalidate()
+    
+    def _invalidate(self) -> None:
+        """使序列化片段失效；从干净变为脏时通知观察者"""
+        if self._fragment is None:
+            return
+        object.__setattr__(self, "_fragment", None)
+        if self._change_observer is not None:
+            self._change_observer(self)
+    
+    # MARK: - 属性
+    @property
+    def state(self) -> WindowState:
+        return self._state
+    
+    @state.setter
+    def state(self, value: WindowState) -> None:
+        # 所有状态变更（含直接赋值）都经过这里，保证索引与状态一致
+        old = self._state
+        self._state = value
+        if self._state_observer is not None and old is not value:
+            self._state_observer(self, old, value)
+    
+    @property
+    def created_at(self) -> datetime:
+        return _to_datetime(self._created_ts)
+    
+    @created_at.setter
+    def created_at(self, value) -> None:
+        self._created_ts = _to_timestamp(value) if value is not None else time.time()
+    
+    @property
+    def created_ts(self) -> float:
+        """创建时间（浮点时间戳）"""
+        return self._created_ts
+    
+    @property
+    def last_active_at(self) -> Optional[datetime]:
+        return _to_datetime(self._last_active_ts)
+    
+    @last_active_at.setter
+    def last_active_at(self, value) -> None:
+        self._last_active_ts = _to_timestamp(value)
+    
+    @property
+    def last_active_ts(self) -> Optional[float]:
+        """最近激活时间（浮点时间戳）"""
+        return self._last_active_ts
+    
+    @property
+    def session_data(self) -> Dict:
+        # 访问即视为可能写入：按需创建，并使序列化片段失效
+        if self._session_data is None:
+            self._session_data = {}
+        else:
+            self._invalidate()
+        return self._session_data
+    
+    @session_data.setter
+    def session_data(self, value: Optional[Dict]) -> None:
+        self._session_data = value or None
+    
+    def __eq__(self, other):
+        if not isinstance(other, AIWindow):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+    
+    __hash__ = None  # 与原 dataclass 一致：可变对象不可哈希
+    
+    def __repr__(self) -> str:
+        return (f"AIWindow(window_id={self.window_id!r}, platform_id={self.platform_id!r}, "
+                f"state={self._state!r}, url={self.url!r}, title={self.title!r})")
     
     def activate(self):
         """激活窗口"""
         self.state = WindowState.ACTIVE
-        self.last_active_at = datetime.now()
+        self._last_active_ts = time.time()
     
     def deactivate(self):
         """取消激活窗口"""
@@ -107,7 +259,10 @@ class AIWindow:
         self.state = WindowState.ERROR
     
     def update_geometry(self, x: int, y: int, width: int, height: int):
-        """更新窗口几何信息"""
+        """更新窗口几何信息（未变化时不写入，保持序列化片段有效）"""
+        g = self.geometry
+        if g.x == x and g.y == y and g.width == width and g.height == height:
+            return
         self.geometry.x = x
         self.geometry.y = y
         self.geometry.width = width
@@ -127,36 +282,72 @@ class AIWindow:
     
     def get_session_data(self, key: str, default=None):
         """获取会话数据"""
-        return self.session_data.get(key, default)
+        if self._session_data is None:
+            return default
+        return self._session_data.get(key, default)
     
     def is_active(self) -> bool:
         """检查窗口是否激活"""
-        return self.state == WindowState.ACTIVE
+        return self._state == WindowState.ACTIVE
     
     def is_visible(self) -> bool:
         """检查窗口是否可见"""
-        return self.state in [WindowState.ACTIVE, WindowState.INACTIVE, WindowState.LOADING]
+        return self._state in (WindowState.ACTIVE, WindowState.INACTIVE, WindowState.LOADING)
     
     def get_display_name(self) -> str:
         """获取窗口显示名称"""
         return self.title or f"{self.platform_id}-{self.window_id[:8]}"
     
-    def to_dict(self) -> Dict:
-        """转换为字典格式"""
+    # MARK: - 序列化
+    @property
+    def dirty(self) -> bool:
+        """自上次序列化以来是否有变更"""
+        return self._fragment is None
+    
+    @property
+    def fragment_generation(self) -> int:
+        """当前序列化片段的代号，每次重新编码都会变化"""
+        return self._fragment_gen
+    
+    def mark_dirty(self) -> None:
+        """手动标记变更（例如直接修改了 session_data 中的嵌套对象）"""
+        self._invalidate()
+    
+    def serialized(self) -> Dict:
+        """
+        获取缓存的序列化片段，仅在有变更时重新编码
+        
+        返回值为共享缓存，调用方不得修改；需要可修改的字典请使用 to_dict()。
+        """
+        fragment = self._fragment
+        if fragment is None:
+            fragment = self._encode()
+            self._fragment = fragment
+            self._fragment_gen = next(_fragment_generations)
+        return fragment
+    
+    def _encode(self) -> Dict:
         return {
             "window_id": self.window_id,
             "platform_id": self.platform_id,
             "window_type": self.window_type.value,
-            "state": self.state.value,
+            "state": self._state.value,
             "geometry": self.geometry.to_dict(),
             "created_at": self.created_at.isoformat(),
-            "last_active_at": self.last_active_at.isoformat() if self.last_active_at else None,
+            "last_active_at": self.last_active_at.isoformat() if self._last_active_ts is not None else None,
             "url": self.url,
             "title": self.title,
             "user_agent": self.user_agent,
-            "session_data": self.session_data
+            "session_data": dict(self._session_data) if self._session_data is not None else {}
         }
     
+    def to_dict(self) -> Dict:
+        """转换为字典格式（返回副本，可自由修改）"""
+        data = dict(self.serialized())
+        data["geometry"] = dict(data["geometry"])
+        data["session_data"] = dict(data["session_data"])
+        return data
+    
     @classmethod
     def from_dict(cls, data: Dict) -> 'AIWindow':
         """从字典创建实例"""
@@ -166,7 +357,7 @@ class AIWindow:
             window_type=WindowType(data.get("window_type", "main")),
             state=WindowState(data.get("state", "inactive")),
             geometry=WindowGeometry.from_dict(data.get("geometry", {})),
-            created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else datetime.now(),
+            created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None,
             last_active_at=datetime.fromisoformat(data["last_active_at"]) if data.get("last_active_at") else None,
             url=data.get("url"),
             title=data.get("title"),
@@ -182,12 +373,97 @@ class WindowManager:
     
     管理所有AI窗口实例，提供窗口的创建、删除、查找和状态管理功能。
     支持多窗口同平台管理；默认不限制窗口数量，若配置上限则按上限约束。
+    
+    维护二级索引：platform_id -> 有序窗口ID、state -> 窗口ID，
+    在创建/移除/状态变更时增量更新，平台查询与计数为 O(1)/O(k)。
+    请通过 create_window/add_window/remove_window 修改窗口集合，而不是直接改 windows。
     """
     windows: Dict[str, AIWindow] = field(default_factory=dict)
     active_window_id: Optional[str] = None
     # None 表示不限制数量；保持向后兼容，默认不限制
     max_windows_per_platform: Optional[int] = None
     max_total_windows: Optional[int] = None
+    # 二级索引（dict 作为有序集合，保持创建顺序）
+    _by_platform: Dict[str, Dict[str, None]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_state: Dict[WindowState, Dict[str, None]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # 增量快照：上次 snapshot_changes 时各窗口的片段代号，以及之后变更/移除的窗口
+    _snapshot_gens: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _changed_ids: Dict[str, None] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _removed_ids: Dict[str, None] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """为构造时传入的窗口建立索引"""
+        initial = list(self.windows.values())
+        self.windows = {}
+        for window in initial:
+            self.add_window(window)
+    
+    # MARK: - 索引维护
+    def _index_add(self, window: AIWindow) -> None:
+        self._by_platform.setdefault(window.platform_id, {})[window.window_id] = None
+        self._by_state.setdefault(window.state, {})[window.window_id] = None
+        window._state_observer = self._on_window_state_changed
+        window._change_observer = self._on_window_changed
+        self._changed_ids[window.window_id] = None
+    
+    def _index_remove(self, window: AIWindow) -> None:
+        bucket = self._by_platform.get(window.platform_id)
+        if bucket is not None:
+            bucket.pop(window.window_id, None)
+            if not bucket:
+                del self._by_platform[window.platform_id]
+        states = self._by_state.get(window.state)
+        if states is not None:
+            states.pop(window.window_id, None)
+            if not states:
+                del self._by_state[window.state]
+        window._state_observer = None
+        window._change_observer = None
+        self._removed_ids[window.window_id] = None
+    
+    def _on_window_state_changed(self, window: AIWindow, old: Optional[WindowState], new: WindowState) -> None:
+        if self.windows.get(window.window_id) is not window:
+            return
+        if old is not None:
+            states = self._by_state.get(old)
+            if states is not None:
+                states.pop(window.window_id, None)
+                if not states:
+                    del self._by_state[old]
+        self._by_state.setdefault(new, {})[window.window_id] = None
+    
+    def _on_window_changed(self, window: AIWindow) -> None:
+        if self.windows.get(window.window_id) is window:
+            self._changed_ids[window.window_id] = None
+    
+    def add_window(self, window: AIWindow) -> AIWindow:
+        """登记一个已有的窗口实例（同ID会替换旧实例）"""
+        previous = self.windows.get(window.window_id)
+        if previous is not None:
+            self._index_remove(previous)
+        self.windows[window.window_id] = window
+        self._index_add(window)
+        return window
+    
+    def check_consistency(self) -> List[str]:
+        """校验二级索引与 windows 是否一致，返回问题列表（空列表表示一致）。供测试使用。"""
+        problems: List[str] = []
+        expected_platform: Dict[str, List[str]] = {}
+        expected_state: Dict[WindowState, set] = {}
+        for wid, window in self.windows.items():
+            if window.window_id != wid:
+                problems.append(f"key {wid} holds window {window.window_id}")
+            expected_platform.setdefault(window.platform_id, []).append(wid)
+            expected_state.setdefault(window.state, set()).add(wid)
+            if window._state_observer is None:
+                problems.append(f"window {wid} is not observed")
+        actual_platform = {pid: list(ids) for pid, ids in self._by_platform.items()}
+        if actual_platform != expected_platform:
+            problems.append(f"platform index {actual_platform} != {expected_platform}")
+        actual_state = {st: set(ids) for st, ids in self._by_state.items()}
+        if actual_state != expected_state:
+            problems.append(f"state index {actual_state} != {expected_state}")
+        return problems
     
     def create_window(self, platform_id: str, window_type: WindowType = WindowType.MAIN, 
                      geometry: Optional[WindowGeometry] = None) -> Optional[AIWindow]:
@@ -205,8 +481,7 @@ class WindowManager:
         # 检查总窗口与平台窗口数量限制（None 表示不限制）
         if isinstance(self.max_total_windows, int) and len(self.windows) >= self.max_total_windows:
             return None
-        platform_windows = self.get_platform_windows(platform_id)
-        if isinstance(self.max_windows_per_platform, int) and len(platform_windows) >= self.max_windows_per_platform:
+        if isinstance(self.max_windows_per_platform, int) and self.get_platform_window_count(platform_id) >= self.max_windows_per_platform:
             return None
         
         # 创建新窗口
@@ -217,7 +492,7 @@ class WindowManager:
             geometry=geometry or WindowGeometry()
         )
         
-        self.windows[window.window_id] = window
+        self.add_window(window)
         return window
     
     def remove_window(self, window_id: str) -> bool:
@@ -231,7 +506,7 @@ class WindowManager:
             bool: 移除是否成功
         """
         if window_id in self.windows:
-            del self.windows[window_id]
+            self._index_remove(self.windows.pop(window_id))
             
             # 如果移除的是活动窗口，清除活动窗口设置
             if self.active_window_id == window_id:
@@ -245,8 +520,20 @@ class WindowManager:
         return self.windows.get(window_id)
     
     def get_platform_windows(self, platform_id: str) -> List[AIWindow]:
-        """获取指定平台的所有窗口"""
-        return [window for window in self.windows.values() if window.platform_id == platform_id]
+        """获取指定平台的所有窗口（按创建顺序，O(k)）"""
+        return [self.windows[wid] for wid in self._by_platform.get(platform_id, ())]
+    
+    def get_platform_window_ids(self, platform_id: str) -> List[str]:
+        """获取指定平台的窗口ID（按创建顺序）"""
+        return list(self._by_platform.get(platform_id, ()))
+    
+    def get_windows_in_state(self, *states: WindowState) -> List[AIWindow]:
+        """获取处于给定状态之一的窗口（O(k)）"""
+        return [self.windows[wid] for st in states for wid in self._by_state.get(st, ())]
+    
+    def count_in_state(self, state: WindowState) -> int:
+        """获取处于指定状态的窗口数量（O(1)）"""
+        return len(self._by_state.get(state, ()))
     
     def get_active_window(self) -> Optional[AIWindow]:
         """获取当前活动窗口"""
@@ -276,8 +563,8 @@ class WindowManager:
         return False
     
     def get_visible_windows(self) -> List[AIWindow]:
-        """获取所有可见窗口"""
-        return [window for window in self.windows.values() if window.is_visible()]
+        """获取所有可见窗口（按状态桶取出，不保证创建顺序）"""
+        return self.get_windows_in_state(WindowState.ACTIVE, WindowState.INACTIVE, WindowState.LOADING)
     
     def get_all_windows(self) -> List[AIWindow]:
         """获取所有窗口"""
@@ -293,18 +580,17 @@ class WindowManager:
         Returns:
             int: 关闭的窗口数量
         """
-        platform_windows = self.get_platform_windows(platform_id)
         count = 0
         
-        for window in platform_windows:
-            if self.remove_window(window.window_id):
+        for window_id in self.get_platform_window_ids(platform_id):
+            if self.remove_window(window_id):
                 count += 1
         
         return count
     
     def get_platform_window_count(self, platform_id: str) -> int:
-        """获取指定平台的窗口数量"""
-        return len(self.get_platform_windows(platform_id))
+        """获取指定平台的窗口数量（O(1)）"""
+        return len(self._by_platform.get(platform_id, ()))
     
     def can_create_window(self, platform_id: str) -> bool:
         """检查是否可以为指定平台创建新窗口（默认不限制）。"""
@@ -315,14 +601,49 @@ class WindowManager:
         return True
     
     def to_dict(self) -> Dict:
-        """转换为字典格式"""
+        """
+        转换为字典格式
+        
+        各窗口条目为 AIWindow.serialized() 的共享片段（只读），
+        仅重新编码有变更的窗口；持久化前如需修改请先深拷贝。
+        """
         return {
-            "windows": {wid: window.to_dict() for wid, window in self.windows.items()},
+            "windows": {wid: window.serialized() for wid, window in self.windows.items()},
             "active_window_id": self.active_window_id,
             "max_windows_per_platform": self.max_windows_per_platform,
             "max_total_windows": self.max_total_windows
         }
     
+    def snapshot_changes(self) -> Dict:
+        """
+        增量快照：返回自上次调用以来变更/新增的窗口片段与已移除的窗口ID
+        
+        Returns:
+            Dict: {"changed": {window_id: 片段}, "removed": [window_id], "active_window_id": ...}
+        """
+        changed: Dict[str, Dict] = {}
+        gens = self._snapshot_gens
+        # 只遍历自上次快照以来被标记的窗口，开销与变更数量成正比
+        for wid in self._changed_ids:
+            window = self.windows.get(wid)
+            if window is None:
+                continue
+            fragment = window.serialized()
+            if gens.get(wid) != window._fragment_gen:
+                gens[wid] = window._fragment_gen
+                changed[wid] = fragment
+        removed = []
+        for wid in self._removed_ids:
+            if wid not in self.windows and gens.pop(wid, None) is not None:
+                removed.append(wid)
+        self._changed_ids.clear()
+        self._removed_ids.clear()
+        return {
+            "changed": changed,
+            "removed": removed,
+            "active_window_id": self.active_window_id,
+        }
+    
     @classmethod
     def from_dict(cls, data: Dict) -> 'WindowManager':
         """从字典创建实例"""
@@ -337,6 +658,6 @@ class WindowManager:
         # 加载窗口数据
         windows_data = data.get("windows", {})
         for wid, window_data in windows_data.items():
-            instance.windows[wid] = AIWindow.from_dict(window_data)
+            instance.add_window(AIWindow.from_dict(window_data))
         
         return instance
@@ -0,0 +1,100 @@
+"""
+主页视图模型
+
+记录上次发送给主页文档的各平台行状态（启用、页面列表、数量、图标、默认平台），
+状态变化时计算最小补丁，由页面内的 applyPatch(json) 应用，避免整页重新生成与加载。
+
+补丁带版本号：文档渲染时写入基线版本，页面只接受基于当前版本的补丁；
+版本不符（文档已被替换/重载）或补丁超出大小上限时由调用方回退为整页加载。
+"""
+
+import json
+from typing import Any, Dict, Iterable, Optional
+
+
+# 单次补丁 JSON 的上限（字节）；超出时整页加载更划算
+MAX_PATCH_BYTES = 32 * 1024
+
+# 参与比较的行字段
+ROW_FIELDS = ("active", "windows", "count", "icon", "default")
+# 被点名（刚操作过）的行总是重发的字段：页面可能已做乐观更新，需以原生状态为准
+FORCED_FIELDS = ("active", "windows", "count")
+
+
+def count_label(count: int) -> str:
+    """气泡上的页面数量文本：超过 9 显示 9+（与页面内 applyPatch 及点击时的乐观更新一致）"""
+    return "9+" if count > 9 else str(count)
+
+
+def row_state(active: bool, windows: list, icon: str = "", default: bool = False) -> Dict[str, Any]:
+    """单行状态；windows 为 [{"id", "idx"}]，count 由其长度得出"""
+    return {
+        "active": bool(active),
+        "windows": list(windows),
+        "count": len(windows),
+        "icon": icon or "",
+        "default": bool(default),
+    }
+
+
+class HomepageViewModel:
+    """主页行状态基线与补丁计算"""
+
+    def __init__(self, max_patch_bytes: int = MAX_PATCH_BYTES):
+        self._max_patch_bytes = max_patch_bytes
+        self._rows: Optional[Dict[str, Dict[str, Any]]] = None
+        self._version = 0
+        self._stats = {"renders": 0, "patches": 0, "empty": 0, "fallbacks": 0, "patch_bytes": 0}
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def has_baseline(self) -> bool:
+        return self._rows is not None
+
+    def reset(self, rows: Dict[str, Dict[str, Any]]) -> int:
+        """整页渲染后以其状态为新基线，返回写入文档的版本号"""
+        self._rows = {pid: dict(state) for pid, state in rows.items()}
+        self._version += 1
+        self._stats["renders"] += 1
+        return self._version
+
+    def invalidate(self) -> None:
+        """丢弃基线（语言变化、页面拒绝补丁等）；下次同步将整页加载"""
+        self._rows = None
+
+    def diff(self, rows: Dict[str, Dict[str, Any]], force: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        """与基线比较得到补丁 {"base", "version", "rows": {pid: {字段: 新值}}}。
+
+        无变化时 rows 为空且版本不变；无基线、行集合变化或补丁过大时返回 None（需整页加载）。
+        返回补丁即视为已发送，基线前移到新状态。
+        """
+        if self._rows is None or set(rows) != set(self._rows):
+            self._stats["fallbacks"] += 1
+            return None
+        forced = set(force)
+        changes: Dict[str, Dict[str, Any]] = {}
+        for pid, state in rows.items():
+            old = self._rows[pid]
+            fields = {k: state[k] for k in ROW_FIELDS if state.get(k) != old.get(k)}
+            if pid in forced:
+                fields.update({k: state[k] for k in FORCED_FIELDS})
+            if fields:
+                changes[pid] = fields
+        if not changes:
+            self._stats["empty"] += 1
+            return {"base": self._version, "version": self._version, "rows": {}}
+        patch = {"base": self._version, "version": self._version + 1, "rows": changes}
+        size = len(json.dumps(patch, ensure_ascii=False).encode("utf-8"))
+        if size > self._max_patch_bytes:
+            self._stats["fallbacks"] += 1
+            return None
+        self._rows = {pid: dict(state) for pid, state in rows.items()}
+        self._version += 1
+        self._stats["patches"] += 1
+        self._stats["patch_bytes"] += size
+        return patch
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats)
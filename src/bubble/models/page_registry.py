@@ -0,0 +1,209 @@
+"""
+页面注册表数据模型
+
+单窗口多页面模式下页面状态的唯一来源：页面记录（平台、WebView、创建时间、标题）
+以及按平台分组、打开顺序环与最近使用顺序三类索引。每次变更只更新一次索引，
+并向订阅者（下拉选择器、主页气泡、持久化）广播变更事件。
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import time
+
+from ..utils.mru_index import MRUIndex
+from ..utils.window_ring import WindowRing
+
+
+# 变更事件类型
+PAGE_ADDED = "added"
+PAGE_REMOVED = "removed"
+PAGE_RENAMED = "renamed"
+PAGE_ACTIVATED = "activated"
+
+PageListener = Callable[[str, "PageRecord"], None]
+
+
+class PageRecord:
+    """单个页面的记录"""
+    __slots__ = ("page_id", "platform_id", "view", "created_ts", "title", "restored", "_session_data")
+
+    def __init__(self, page_id: str, platform_id: str, view: Any = None,
+                 created_ts: Optional[float] = None, title: Optional[str] = None,
+                 restored: bool = False):
+        self.page_id = page_id
+        self.platform_id = platform_id
+        self.view = view
+        self.created_ts = time.time() if created_ts is None else created_ts
+        self.title = title
+        # 是否从配置恢复（恢复的页面已在配置中，无需再次写回）
+        self.restored = restored
+        # 会话数据（如休眠前的 URL），首次写入时才创建
+        self._session_data: Optional[Dict[str, Any]] = None
+
+    def set_session_data(self, key: str, value: Any) -> None:
+        if self._session_data is None:
+            self._session_data = {}
+        self._session_data[key] = value
+
+    def get_session_data(self, key: str, default: Any = None) -> Any:
+        if self._session_data is None:
+            return default
+        return self._session_data.get(key, default)
+
+    def __repr__(self) -> str:
+        return f"PageRecord(page_id={self.page_id!r}, platform_id={self.platform_id!r}, title={self.title!r})"
+
+
+class PageRegistry:
+    """
+    页面注册表
+
+    维护索引：
+    - 平台 -> 页面ID（按创建顺序）
+    - 打开顺序环（WindowRing，O(1) 前后切换与第 N 个）
+    - 最近使用顺序（MRUIndex，O(1) 取平台最近页面）
+
+    订阅者签名为 listener(event, record)；单个订阅者异常不会影响其它订阅者与注册表状态。
+    """
+
+    def __init__(self):
+        self._records: Dict[str, PageRecord] = {}
+        self._by_platform: Dict[str, Dict[str, None]] = {}
+        self._ring = WindowRing()
+        self._mru = MRUIndex()
+        self._listeners: List[PageListener] = []
+
+    # MARK: - 订阅
+    def subscribe(self, listener: PageListener) -> Callable[[], None]:
+        """注册变更监听，返回取消订阅函数"""
+        self._listeners.append(listener)
+
+        def unsubscribe():
+            try:
+                self._listeners.remove(listener)
+            except ValueError:
+                pass
+        return unsubscribe
+
+    def _emit(self, event: str, record: PageRecord) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(event, record)
+            except Exception as e:
+                print(f"WARNING[pages]: 页面事件 {event} 处理失败: {e}")
+
+    # MARK: - 变更
+    def add(self, page_id: str, platform_id: str, view: Any = None, *,
+            restored: bool = False, title: Optional[str] = None) -> PageRecord:
+        """登记新页面（已存在则返回原记录）；新页面位于最近使用顺序的末端，切换到它时才变为最近"""
+        existing = self._records.get(page_id)
+        if existing is not None:
+            return existing
+        record = PageRecord(page_id, platform_id, view, title=title, restored=restored)
+        self._records[page_id] = record
+        self._by_platform.setdefault(platform_id, {})[page_id] = None
+        self._ring.add(page_id)
+        self._mru.add(page_id, platform_id)
+        self._emit(PAGE_ADDED, record)
+        return record
+
+    def remove(self, page_id: str) -> Optional[PageRecord]:
+        """移除页面并返回其记录；不存在时返回 None"""
+        record = self._records.pop(page_id, None)
+        if record is None:
+            return None
+        bucket = self._by_platform.get(record.platform_id)
+        if bucket is not None:
+            bucket.pop(page_id, None)
+            if not bucket:
+                del self._by_platform[record.platform_id]
+        self._ring.remove(page_id)
+        self._mru.remove(page_id)
+        self._emit(PAGE_REMOVED, record)
+        return record
+
+    def activate(self, page_id: str) -> bool:
+        """记录一次切换到该页面（更新最近使用顺序）"""
+        record = self._records.get(page_id)
+        if record is None:
+            return False
+        self._mru.touch(page_id)
+        self._emit(PAGE_ACTIVATED, record)
+        return True
+
+    def rename(self, page_id: str, title: Optional[str]) -> bool:
+        record = self._records.get(page_id)
+        if record is None:
+            return False
+        if record.title == title:
+            return True
+        record.title = title
+        self._emit(PAGE_RENAMED, record)
+        return True
+
+    # MARK: - 查询
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, page_id: object) -> bool:
+        return page_id in self._records
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def get(self, page_id: Optional[str]) -> Optional[PageRecord]:
+        return self._records.get(page_id) if page_id is not None else None
+
+    def view(self, page_id: Optional[str]) -> Any:
+        """页面对应的 WebView（不存在时为 None）"""
+        record = self.get(page_id)
+        return record.view if record is not None else None
+
+    def find_by_view(self, view: Any) -> Optional[PageRecord]:
+        """按 WebView 反查页面记录（导航回调中使用；页面数量很少，线性查找即可）"""
+        if view is None:
+            return None
+        for record in self._records.values():
+            if record.view is view:
+                return record
+        return None
+
+    def views(self) -> List[Any]:
+        return [r.view for r in self._records.values() if r.view is not None]
+
+    def platform_of(self, page_id: Optional[str]) -> Optional[str]:
+        record = self.get(page_id)
+        return record.platform_id if record is not None else None
+
+    def page_ids(self, platform_id: str) -> List[str]:
+        """指定平台的页面ID（按创建顺序）"""
+        return list(self._by_platform.get(platform_id, ()))
+
+    def count(self, platform_id: Optional[str] = None) -> int:
+        if platform_id is None:
+            return len(self._records)
+        return len(self._by_platform.get(platform_id, ()))
+
+    def grouped(self) -> Dict[str, List[str]]:
+        """平台 -> 页面ID（按创建顺序），平台按首个页面的创建顺序排列"""
+        return {pid: list(ids) for pid, ids in self._by_platform.items()}
+
+    # MARK: - 顺序与最近使用
+    def most_recent(self, platform_id: Optional[str] = None) -> Optional[str]:
+        """指定平台（或全局）最近使用的页面"""
+        return self._mru.most_recent(platform_id)
+
+    def least_recent(self, platform_id: Optional[str] = None) -> Optional[str]:
+        return self._mru.least_recent(platform_id)
+
+    def previous(self) -> Optional[str]:
+        """全局上一个使用的页面"""
+        return self._mru.previous()
+
+    def step(self, page_id: Optional[str], forward: bool = True,
+             skip: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """按打开顺序取下一个/上一个页面"""
+        return self._ring.step(page_id, forward, skip=skip)
+
+    def nth(self, n: int) -> Optional[str]:
+        """按打开顺序取第 n 个页面（从 1 开始，负数从末尾计）"""
+        return self._ring.nth(n)
@@ -0,0 +1,216 @@
+"""
+Process-wide cache for packaged assets (platform icons, logo, vendor CSS).
+
+Design goals:
+- Each asset is read once (pkgutil first, then the source tree) and its
+  derived forms (text, base64 data URL) are built once; the homepage, the
+  settings window and the AI selector share `AssetCache.shared()`
+- Content-addressed: a path maps to the SHA-256 digest of its bytes and the
+  encoded forms are stored per digest, so identical files share one encoding
+  and a changed file can never serve a stale data URL
+- Missing assets are cached too, so a warm cache performs no file I/O
+- Generated content (e.g. the homepage's compiled CSS/JS) can be added with
+  `put(rel, data)` and is then served like any packaged asset
+- Invalidation: `invalidate(rel)` drops one path; `refresh_changed()`
+  re-stats filesystem-backed entries and drops those whose mtime/size
+  changed (the owner runs it when icons may have changed, e.g. on app
+  activation)
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+_MIME_TYPES = {
+    ".png": "image/png",
+    ".ico": "image/x-icon",
+    ".svg": "image/svg+xml",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".css": "text/css",
+    ".js": "application/javascript",
+    ".json": "application/json",
+    ".html": "text/html",
+}
+
+_PACKAGE_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+def mime_type(rel: str) -> str:
+    return _MIME_TYPES.get(os.path.splitext(rel)[1].lower(), "application/octet-stream")
+
+
+def _file_signature(path: Optional[str]) -> Optional[Tuple[int, int]]:
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def load_package_asset(rel: str, package: str = "bubble",
+                       root: str = _PACKAGE_ROOT) -> Tuple[Optional[bytes], Optional[str]]:
+    """(bytes, filesystem path or None) for a package-relative asset; (None, None) when missing."""
+    path = os.path.join(root, rel)
+    if not os.path.exists(path):
+        path = None
+    data = None
+    try:
+        import pkgutil
+        data = pkgutil.get_data(package, rel)
+    except Exception:
+        data = None
+    if not data and path is not None:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            data = None
+    return (data or None), path
+
+
+class _Entry:
+    __slots__ = ("digest", "path", "signature")
+
+    def __init__(self, digest: Optional[str], path: Optional[str], signature: Optional[Tuple[int, int]]):
+        self.digest = digest
+        self.path = path
+        self.signature = signature
+
+
+class AssetCache:
+    """Asset bytes and encodings, keyed by content digest."""
+
+    _shared: Optional["AssetCache"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, loader: Callable[[str], Tuple[Optional[bytes], Optional[str]]] = load_package_asset,
+                 signature: Callable[[Optional[str]], Optional[Tuple[int, int]]] = _file_signature):
+        self._loader = loader
+        self._signature = signature
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}   # rel path -> entry (digest None: missing)
+        self._blobs: Dict[str, bytes] = {}      # digest -> bytes
+        self._encoded: Dict[Tuple[str, str], str] = {}  # (digest, form) -> text / data URL
+        self._generated: Set[str] = set()       # paths registered with put() (cannot be reloaded)
+        self._counts = {"hits": 0, "misses": 0, "reads": 0, "encodes": 0, "invalidations": 0}
+
+    @classmethod
+    def shared(cls) -> "AssetCache":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    # ---- lookups ----
+    def _entry(self, rel: str) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(rel)
+            if entry is not None:
+                self._counts["hits"] += 1
+                return entry
+            self._counts["misses"] += 1
+        data, path = self._loader(rel)
+        digest = hashlib.sha256(data).hexdigest() if data else None
+        entry = _Entry(digest, path, self._signature(path))
+        with self._lock:
+            self._counts["reads"] += 1
+            if digest is not None:
+                self._blobs.setdefault(digest, data)
+            self._entries[rel] = entry
+        return entry
+
+    def digest(self, rel: str) -> Optional[str]:
+        return self._entry(rel).digest
+
+    def get_bytes(self, rel: str) -> Optional[bytes]:
+        digest = self._entry(rel).digest
+        return self._blobs.get(digest) if digest is not None else None
+
+    def _encode(self, rel: str, form: str, encode: Callable[[bytes], str]) -> Optional[str]:
+        digest = self._entry(rel).digest
+        if digest is None:
+            return None
+        key = (digest, form)
+        value = self._encoded.get(key)
+        if value is None:
+            value = encode(self._blobs[digest])
+            with self._lock:
+                self._counts["encodes"] += 1
+                self._encoded[key] = value
+        return value
+
+    def get_text(self, rel: str) -> str:
+        """UTF-8 text of the asset ('' when missing)."""
+        return self._encode(rel, "text", lambda data: data.decode("utf-8", "ignore")) or ""
+
+    def data_url(self, rel: str) -> Optional[str]:
+        """`data:<mime>;base64,...` for the asset, or None when missing."""
+        mime = mime_type(rel)
+        return self._encode(rel, f"data:{mime}",
+                            lambda data: f"data:{mime};base64," + base64.b64encode(data).decode("ascii"))
+
+    def first_available(self, rels: Iterable[str]) -> Optional[str]:
+        """First path in `rels` that exists (e.g. preferred logo sizes)."""
+        for rel in rels:
+            if self.digest(rel) is not None:
+                return rel
+        return None
+
+    def put(self, rel: str, data: bytes) -> str:
+        """Register generated content under `rel` (replacing previous content); returns its digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._blobs.setdefault(digest, data)
+            self._entries[rel] = _Entry(digest, None, None)
+            self._generated.add(rel)
+            self._gc()
+        return digest
+
+    # ---- invalidation ----
+    def invalidate(self, rel: Optional[str] = None) -> None:
+        """Forget one path (or every packaged asset; generated content is kept); the next lookup reloads it."""
+        with self._lock:
+            if rel is None:
+                self._entries = {r: e for r, e in self._entries.items() if r in self._generated}
+            else:
+                self._entries.pop(rel, None)
+                self._generated.discard(rel)
+            self._counts["invalidations"] += 1
+            self._gc()
+
+    def refresh_changed(self) -> List[str]:
+        """Re-stat filesystem-backed entries; drop (and return) those whose file changed or vanished."""
+        with self._lock:
+            items = [(rel, e.path, e.signature) for rel, e in self._entries.items() if e.path]
+        changed = [rel for rel, path, sig in items if self._signature(path) != sig]
+        if changed:
+            with self._lock:
+                for rel in changed:
+                    self._entries.pop(rel, None)
+                self._counts["invalidations"] += len(changed)
+                self._gc()
+        return changed
+
+    def _gc(self) -> None:
+        # Drop blobs and encodings no path refers to any more (caller holds the lock)
+        live = {e.digest for e in self._entries.values() if e.digest is not None}
+        for digest in [d for d in self._blobs if d not in live]:
+            del self._blobs[digest]
+        for key in [k for k in self._encoded if k[0] not in live]:
+            del self._encoded[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._counts)
+            out["paths"] = len(self._entries)
+            out["blobs"] = len(self._blobs)
+            out["bytes"] = sum(len(b) for b in self._blobs.values())
+            return out
@@ -0,0 +1,159 @@
+"""
+Content-addressed, deduplicated backup ring.
+
+Design goals:
+- Store a backup only when the content actually changed (sha256 of the bytes).
+- Keep an index file (newest last) instead of globbing and stat-ing the directory.
+- Restore by hash (or unique hash prefix) or by timestamp; pick the newest
+  backup that still verifies without trying every file.
+
+Backups are written as `<prefix>_backup_<hash12>.json` next to the index
+`<prefix>_backups.index.json`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config_writer import atomic_write_json
+
+
+class BackupRing:
+    def __init__(self, directory: str, prefix: str = "platforms", max_entries: int = 5):
+        self.directory = directory
+        self.prefix = prefix
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: Optional[List[Dict[str, Any]]] = None
+
+    # ----- index -----
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, f"{self.prefix}_backups.index.json")
+
+    def _file_for(self, digest: str) -> str:
+        return os.path.join(self.directory, f"{self.prefix}_backup_{digest[:12]}.json")
+
+    def _load_index(self) -> List[Dict[str, Any]]:
+        if self._entries is None:
+            entries: List[Dict[str, Any]] = []
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                raw = data.get("entries", []) if isinstance(data, dict) else []
+                entries = [e for e in raw if isinstance(e, dict) and e.get("hash") and e.get("file")]
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"WARNING[backup]: unreadable index {self.index_path}: {e}")
+            self._entries = entries
+        return self._entries
+
+    def _save_index(self) -> None:
+        atomic_write_json(self.index_path, {"version": 1, "entries": self._entries or []})
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Index entries, newest last."""
+        with self._lock:
+            return [dict(e) for e in self._load_index()]
+
+    # ----- write -----
+    def store_bytes(self, payload: bytes, ts: Optional[float] = None) -> Tuple[str, bool]:
+        """Record `payload`; returns (sha256, stored) where stored=False means deduplicated."""
+        digest = hashlib.sha256(payload).hexdigest()
+        now = time.time() if ts is None else ts
+        with self._lock:
+            entries = self._load_index()
+            if entries and entries[-1]["hash"] == digest:
+                return digest, False
+            existing = next((e for e in entries if e["hash"] == digest), None)
+            if existing is not None and os.path.exists(os.path.join(self.directory, existing["file"])):
+                # Same content as an older backup: move it to the front, no new file
+                entries.remove(existing)
+                existing["ts"] = now
+                entries.append(existing)
+                self._save_index()
+                return digest, False
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._file_for(digest)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            if existing is not None:
+                entries.remove(existing)
+            entries.append({"hash": digest, "ts": now, "file": os.path.basename(path), "size": len(payload)})
+            self._prune_locked()
+            self._save_index()
+            return digest, True
+
+    def store_file(self, path: str) -> Optional[Tuple[str, bool]]:
+        """Back up the current content of `path` (no-op if it does not exist)."""
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+        except FileNotFoundError:
+            return None
+        return self.store_bytes(payload)
+
+    def _prune_locked(self) -> None:
+        entries = self._entries or []
+        while len(entries) > self.max_entries:
+            old = entries.pop(0)
+            if any(e["file"] == old["file"] for e in entries):
+                continue
+            try:
+                os.remove(os.path.join(self.directory, old["file"]))
+            except OSError:
+                pass
+
+    # ----- read -----
+    def _read_verified(self, entry: Dict[str, Any]) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.directory, entry["file"]), "rb") as f:
+                payload = f.read()
+        except OSError:
+            return None
+        if hashlib.sha256(payload).hexdigest() != entry["hash"]:
+            return None
+        return payload
+
+    def restore(self, key: Any) -> Optional[bytes]:
+        """Return backup bytes by hash / hash prefix (str) or by timestamp (number).
+
+        A timestamp selects the newest backup taken at or before it.
+        """
+        with self._lock:
+            entries = self._load_index()
+            if isinstance(key, (int, float)) and not isinstance(key, bool):
+                candidates = [e for e in entries if float(e.get("ts", 0)) <= float(key)]
+                entry = candidates[-1] if candidates else None
+            else:
+                exact = [e for e in entries if e["hash"] == key]
+                matches = exact or [e for e in entries if str(e["hash"]).startswith(str(key))]
+                # An ambiguous prefix restores nothing rather than a guess
+                entry = matches[-1] if len(matches) == 1 else None
+            if entry is None:
+                return None
+            return self._read_verified(entry)
+
+    def latest_valid(self, parse: Callable[[bytes], Any] = json.loads) -> Optional[Tuple[Dict[str, Any], Any]]:
+        """Newest backup whose hash verifies and which `parse` accepts: (entry, parsed)."""
+        with self._lock:
+            entries = list(self._load_index())
+        for entry in reversed(entries):
+            payload = self._read_verified(entry)
+            if payload is None:
+                continue
+            try:
+                return dict(entry), parse(payload)
+            except Exception:
+                continue
+        return None
@@ -0,0 +1,158 @@
+"""
+`bubble://` URL scheme: serves homepage assets from the shared AssetCache.
+
+Design goals:
+- URLs carry the content digest (`bubble://app/<digest>/<path>`), so a
+  response can be marked immutable and WebKit reuses the parsed resource
+  across homepage reloads; new content always gets a new URL
+- `resolve()` is pure Python (status, headers, body) for tests; the
+  WKURLSchemeHandler below only adapts it to WKURLSchemeTask
+- A request for an outdated digest still gets the current content, but
+  with `no-cache` so it is not pinned
+"""
+
+from __future__ import annotations
+
+from typing import Dict, NamedTuple, Optional, Union
+from urllib.parse import quote, unquote, urlsplit
+
+from .asset_cache import AssetCache, mime_type
+
+try:
+    import objc
+    from Foundation import NSObject, NSData, NSError, NSHTTPURLResponse
+except Exception:  # pragma: no cover - allow import on non-Darwin
+    objc = None  # type: ignore
+    NSObject = object  # type: ignore
+    NSData = None  # type: ignore
+    NSError = None  # type: ignore
+    NSHTTPURLResponse = None  # type: ignore
+
+
+SCHEME = "bubble"
+HOST = "app"
+BASE_URL = f"{SCHEME}://{HOST}/"
+DIGEST_CHARS = 16
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
+
+_TEXT_MIME_PREFIXES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+
+class SchemeResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+def asset_url(rel: str, cache: Optional[AssetCache] = None) -> Optional[str]:
+    """Digest-stamped URL for an asset (None when the asset is missing)."""
+    digest = (cache or AssetCache.shared()).digest(rel)
+    if digest is None:
+        return None
+    return f"{BASE_URL}{digest[:DIGEST_CHARS]}/{quote(rel)}"
+
+
+def publish(rel: str, content: Union[str, bytes], cache: Optional[AssetCache] = None) -> str:
+    """Store generated content (e.g. compiled homepage CSS/JS) and return its URL."""
+    cache = cache or AssetCache.shared()
+    data = content.encode("utf-8") if isinstance(content, str) else bytes(content)
+    digest = cache.put(rel, data)
+    return f"{BASE_URL}{digest[:DIGEST_CHARS]}/{quote(rel)}"
+
+
+def _not_found() -> SchemeResponse:
+    return SchemeResponse(404, {"Content-Type": "text/plain; charset=utf-8", "Content-Length": "9",
+                                "Cache-Control": CACHE_REVALIDATE}, b"not found")
+
+
+def resolve(url: str, cache: Optional[AssetCache] = None,
+            if_none_match: Optional[str] = None) -> SchemeResponse:
+    """Map a `bubble://app/<digest>/<path>` URL to a response."""
+    try:
+        parts = urlsplit(url)
+    except Exception:
+        return _not_found()
+    if parts.scheme != SCHEME or parts.netloc != HOST:
+        return _not_found()
+    requested, _, rel = parts.path.lstrip("/").partition("/")
+    rel = unquote(rel)
+    if not requested or not rel or any(seg in ("", ".", "..") for seg in rel.split("/")):
+        return _not_found()
+    cache = cache or AssetCache.shared()
+    digest = cache.digest(rel)
+    body = cache.get_bytes(rel) if digest is not None else None
+    if body is None:
+        return _not_found()
+    etag = f'"{digest[:DIGEST_CHARS]}"'
+    current = requested == digest[:DIGEST_CHARS]
+    mime = mime_type(rel)
+    headers = {
+        "Content-Type": f"{mime}; charset=utf-8" if mime.startswith(_TEXT_MIME_PREFIXES) else mime,
+        "Cache-Control": CACHE_IMMUTABLE if current else CACHE_REVALIDATE,
+        "ETag": etag,
+    }
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return SchemeResponse(304, headers, b"")
+    headers["Content-Length"] = str(len(body))
+    return SchemeResponse(200, headers, body)
+
+
+class BubbleSchemeHandler(NSObject):
+    """WKURLSchemeHandler for `bubble://` (register on the configuration before creating the webview)."""
+
+    def init(self):  # noqa: D401
+        self = objc.super(BubbleSchemeHandler, self).init()
+        if self is None:
+            return None
+        self._cache = AssetCache.shared()
+        self._served = 0
+        self._not_found = 0
+        return self
+
+    # def webView:startURLSchemeTask:
+    def webView_startURLSchemeTask_(self, webView, task):  # noqa: N802
+        try:
+            request = task.request()
+            url = request.URL()
+            response = resolve(str(url.absoluteString()), self._cache,
+                               request.valueForHTTPHeaderField_("If-None-Match"))
+            if response.status == 404:
+                self._not_found += 1
+            else:
+                self._served += 1
+            http = NSHTTPURLResponse.alloc().initWithURL_statusCode_HTTPVersion_headerFields_(
+                url, response.status, "HTTP/1.1", response.headers
+            )
+            task.didReceiveResponse_(http)
+            if response.body:
+                task.didReceiveData_(NSData.dataWithBytes_length_(response.body, len(response.body)))
+            task.didFinish()
+        except Exception as e:
+            print(f"WARNING[scheme]: failed to serve bubble:// request: {e}")
+            try:
+                task.didFailWithError_(NSError.errorWithDomain_code_userInfo_("BubbleScheme", -1, None))
+            except Exception:
+                pass
+
+    # def webView:stopURLSchemeTask:
+    def webView_stopURLSchemeTask_(self, webView, task):  # noqa: N802
+        # Responses are delivered synchronously in start; nothing to cancel
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {"served": self._served, "not_found": self._not_found}
+
+
+def install_scheme_handler(configuration) -> Optional[BubbleSchemeHandler]:
+    """Register the `bubble://` handler on a WKWebViewConfiguration; None when unsupported."""
+    if objc is None or configuration is None:
+        return None
+    try:
+        handler = BubbleSchemeHandler.alloc().init()
+        configuration.setURLSchemeHandler_forURLScheme_(handler, SCHEME)
+        return handler
+    except Exception as e:
+        print(f"WARNING[scheme]: bubble:// handler unavailable, homepage assets stay inline: {e}")
+        return None
@@ -0,0 +1,228 @@
+"""
+Write-behind persistence for JSON config files.
+
+Design goals:
+- Keep file I/O off the Cocoa main thread: callers hand over a snapshot and return.
+- Coalesce bursts: repeated writes to the same path within `delay` seconds
+  collapse into one write of the latest snapshot (e.g. closing 30 pages = 1 write).
+- Crash-safe: temp file in the same directory + fsync + atomic os.replace.
+- Observable: write counts, coalesced counts and latency via `stats()`.
+
+Callers must pass data they will not mutate afterwards (typically a deep copy).
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """Serialize `data` to `path` atomically (temp file + fsync + rename)."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    # Persist the rename itself; best-effort (not all filesystems allow dir fds)
+    try:
+        dfd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dfd)
+        finally:
+            os.close(dfd)
+    except OSError:
+        pass
+
+
+@dataclass
+class _Pending:
+    data: Any
+    first_at: float
+    due_at: float
+    pre_write: List[Callable[[], None]] = field(default_factory=list)
+    on_done: List[Callable[[bool], None]] = field(default_factory=list)
+
+
+class ConfigWriter:
+    """Debounced, atomic, background JSON writer keyed by file path."""
+
+    def __init__(self, delay: float = 0.5):
+        self._delay = max(0.0, float(delay))
+        self._cond = threading.Condition()
+        self._pending: Dict[str, _Pending] = {}
+        self._in_flight = 0
+        self._thread: Optional[threading.Thread] = None
+        self._writes = 0
+        self._failures = 0
+        self._scheduled = 0
+        self._coalesced = 0
+        self._total_write_ms = 0.0
+        self._max_write_ms = 0.0
+        self._max_queue_ms = 0.0
+
+    # ----- configuration -----
+    @property
+    def delay(self) -> float:
+        return self._delay
+
+    def set_delay(self, seconds: float) -> None:
+        with self._cond:
+            self._delay = max(0.0, float(seconds))
+            self._cond.notify_all()
+
+    # ----- API -----
+    def schedule(
+        self,
+        path: str,
+        data: Any,
+        *,
+        pre_write: Optional[Callable[[], None]] = None,
+        on_done: Optional[Callable[[bool], None]] = None,
+    ) -> None:
+        """Queue `data` to be written to `path`; replaces any not-yet-written snapshot.
+
+        `pre_write` runs on the writer thread right before the file is replaced
+        (e.g. to take a backup of the previous content). `on_done(ok)` runs on
+        the writer thread after the write attempt.
+        """
+        now = time.monotonic()
+        with self._cond:
+            self._scheduled += 1
+            entry = self._pending.get(path)
+            if entry is None:
+                # The window is anchored at the first change so a steady stream cannot starve the write
+                entry = _Pending(data=data, first_at=now, due_at=now + self._delay)
+                self._pending[path] = entry
+            else:
+                entry.data = data
+                self._coalesced += 1
+            if pre_write is not None and pre_write not in entry.pre_write:
+                entry.pre_write.append(pre_write)
+            if on_done is not None:
+                entry.on_done.append(on_done)
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def has_pending(self, path: Optional[str] = None) -> bool:
+        with self._cond:
+            if path is None:
+                return bool(self._pending) or self._in_flight > 0
+            return path in self._pending
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Write everything queued now and wait for it; returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            for entry in self._pending.values():
+                entry.due_at = 0.0
+            if self._pending:
+                self._ensure_thread()
+            self._cond.notify_all()
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            writes = self._writes
+            return {
+                "scheduled": self._scheduled,
+                "writes": writes,
+                "coalesced": self._coalesced,
+                "failures": self._failures,
+                "pending": len(self._pending),
+                "avg_write_ms": (self._total_write_ms / writes) if writes else 0.0,
+                "max_write_ms": self._max_write_ms,
+                "max_queue_ms": self._max_queue_ms,
+            }
+
+    # ----- worker -----
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="bubble-config-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if not self._pending:
+                        self._cond.wait()
+                        continue
+                    now = time.monotonic()
+                    path, entry = min(self._pending.items(), key=lambda kv: kv[1].due_at)
+                    if entry.due_at <= now:
+                        del self._pending[path]
+                        self._in_flight += 1
+                        break
+                    self._cond.wait(entry.due_at - now)
+            ok = self._write(path, entry)
+            # Callbacks run before the write counts as finished so flush() also waits for them
+            for cb in entry.on_done:
+                try:
+                    cb(ok)
+                except Exception as e:
+                    print(f"WARNING[config-writer]: on_done callback failed: {e}")
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def _write(self, path: str, entry: _Pending) -> bool:
+        for hook in entry.pre_write:
+            try:
+                hook()
+            except Exception as e:
+                print(f"WARNING[config-writer]: pre-write hook failed for {path}: {e}")
+        started = time.monotonic()
+        try:
+            atomic_write_json(path, entry.data)
+            ok = True
+        except Exception as e:
+            ok = False
+            print(f"WARNING[config-writer]: failed to write {path}: {e}")
+        finished = time.monotonic()
+        with self._cond:
+            if ok:
+                self._writes += 1
+                write_ms = (finished - started) * 1000.0
+                self._total_write_ms += write_ms
+                self._max_write_ms = max(self._max_write_ms, write_ms)
+                self._max_queue_ms = max(self._max_queue_ms, (started - entry.first_at) * 1000.0)
+            else:
+                self._failures += 1
+        return ok
+
+
+_shared: Optional[ConfigWriter] = None
+_shared_lock = threading.Lock()
+
+
+def shared_writer() -> ConfigWriter:
+    """Process-wide writer used by ConfigManager, HomepageManager and PlatformManager."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ConfigWriter()
+            # Last line of defence for interpreter exit; app termination flushes explicitly
+            atexit.register(_shared.flush)
+        return _shared
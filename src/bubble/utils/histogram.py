@@ -0,0 +1,64 @@
+"""
+Fixed-bucket latency histogram shared by the timing metrics.
+
+Design goals:
+- Bucket upper bounds (ms) are passed in; the last bucket is open
+- O(buckets) per sample, no stored samples; count / total / max are kept
+  alongside so averages and the open bucket's percentile stay exact
+- Labels are `<=Nms` per bound plus `>Nms` for the open bucket
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+class LatencyHistogram:
+    __slots__ = ("bounds", "counts", "count", "total_ms", "max_ms")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds: Tuple[float, ...] = tuple(bounds)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        for i, bound in enumerate(self.bounds):
+            if ms <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def average(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bound of the bucket holding the p-th percentile (max_ms for the open bucket)."""
+        if not self.count:
+            return None
+        rank = max(1, int(round(p / 100.0 * self.count)))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def buckets(self) -> Dict[str, int]:
+        """{"<=Nms": n, ..., ">Nms": n} in bucket order."""
+        labels = [f"<={b:g}ms" for b in self.bounds] + [f">{self.bounds[-1]:g}ms"]
+        return dict(zip(labels, self.counts))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.average(), 1),
+            "max_ms": round(self.max_ms, 1),
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "buckets": self.buckets(),
+        }
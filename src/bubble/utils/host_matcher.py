@@ -0,0 +1,148 @@
+"""
+Compiled host allow-list matcher for navigation policies.
+
+Rule syntax (case-insensitive, a trailing dot is ignored):
+- "example.com"      exact host only
+- "*.example.com"    any subdomain of example.com, not example.com itself
+- ".example.com"     example.com and all of its subdomains (registrable domain)
+
+Design goals:
+- Rules compile into a trie over reversed host labels, so one decision walks
+  at most the host's label count regardless of the number of rules
+- Decisions are cached per host in a bounded LRU (navigations repeat the
+  same few hosts)
+- Allow/deny counters, plus the most frequently denied hosts, for tuning
+  the rules
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Common multi-label public suffixes; enough to find the registrable domain
+# of the hosts Bubble deals with without shipping the full public suffix list
+_MULTI_LABEL_SUFFIXES = frozenset({
+    "co.uk", "org.uk", "ac.uk", "gov.uk",
+    "com.cn", "net.cn", "org.cn", "gov.cn",
+    "com.hk", "com.tw", "com.sg", "com.au", "net.au", "org.au",
+    "co.jp", "ne.jp", "or.jp", "co.kr", "co.in", "co.nz", "com.br", "com.mx",
+})
+
+DEFAULT_CACHE_SIZE = 256
+MAX_TRACKED_DENIED_HOSTS = 256
+
+
+def normalize_host(host: Optional[str]) -> str:
+    return (host or "").strip().lower().rstrip(".")
+
+
+def registrable_domain(host: Optional[str]) -> str:
+    """`chat.openai.com` -> `openai.com`, `a.b.co.uk` -> `b.co.uk`; IPs and single labels are returned as is."""
+    host = normalize_host(host)
+    labels = host.split(".")
+    if len(labels) <= 2 or all(part.isdigit() for part in labels):
+        return host
+    if ".".join(labels[-2:]) in _MULTI_LABEL_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def domain_rule(host: Optional[str]) -> str:
+    """Rule allowing `host`'s registrable domain and all its subdomains."""
+    domain = registrable_domain(host)
+    return f".{domain}" if domain else ""
+
+
+class _Node:
+    __slots__ = ("children", "exact", "subdomains")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        self.exact = False
+        self.subdomains = False
+
+
+class HostMatcher:
+    """Allow-list compiled from rules; an empty rule set allows everything."""
+
+    def __init__(self, rules: Iterable[str] = (), cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self._root = _Node()
+        self._rules: List[str] = []
+        self._cache: "OrderedDict[str, bool]" = OrderedDict()
+        self._cache_size = max(1, int(cache_size))
+        self._counts = {"allowed": 0, "denied": 0, "cache_hits": 0, "cache_misses": 0}
+        self._denied_hosts: Dict[str, int] = {}
+        for rule in rules:
+            self.add_rule(rule)
+
+    def add_rule(self, rule: str) -> None:
+        rule = normalize_host(rule)
+        if not rule or rule in self._rules:
+            return
+        if rule.startswith("*."):
+            labels, exact, subdomains = rule[2:], False, True
+        elif rule.startswith("."):
+            labels, exact, subdomains = rule[1:], True, True
+        else:
+            labels, exact, subdomains = rule, True, False
+        if not labels:
+            return
+        node = self._root
+        for label in reversed(labels.split(".")):
+            node = node.children.setdefault(label, _Node())
+        node.exact = node.exact or exact
+        node.subdomains = node.subdomains or subdomains
+        self._rules.append(rule)
+        self._cache.clear()
+
+    @property
+    def rules(self) -> Tuple[str, ...]:
+        return tuple(self._rules)
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def _match(self, host: str) -> bool:
+        labels = host.split(".")
+        node = self._root
+        for i in range(len(labels) - 1, -1, -1):
+            node = node.children.get(labels[i])
+            if node is None:
+                return False
+            # Matched a suffix and labels remain: the host is a subdomain of this rule
+            if node.subdomains and i > 0:
+                return True
+        return node.exact
+
+    def allows(self, host: Optional[str]) -> bool:
+        """Decide (and count) a navigation to `host`; hosts without a name are allowed."""
+        host = normalize_host(host)
+        if not host or not self._rules:
+            return True
+        cached = self._cache.get(host)
+        if cached is None:
+            self._counts["cache_misses"] += 1
+            cached = self._match(host)
+            self._cache[host] = cached
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._counts["cache_hits"] += 1
+            self._cache.move_to_end(host)
+        if cached:
+            self._counts["allowed"] += 1
+        else:
+            self._counts["denied"] += 1
+            if host in self._denied_hosts or len(self._denied_hosts) < MAX_TRACKED_DENIED_HOSTS:
+                self._denied_hosts[host] = self._denied_hosts.get(host, 0) + 1
+        return cached
+
+    def stats(self, top: int = 10) -> Dict[str, object]:
+        """Counters plus the most frequently denied hosts (candidates for new rules)."""
+        out: Dict[str, object] = dict(self._counts)
+        out["rules"] = len(self._rules)
+        out["cached_hosts"] = len(self._cache)
+        out["top_denied"] = sorted(self._denied_hosts.items(), key=lambda kv: (-kv[1], kv[0]))[:top]
+        return out
@@ -0,0 +1,224 @@
+"""
+Concurrency-limited, prioritized page load queue.
+
+Design goals:
+- Pure Python core: the actual navigation is started through an injected
+  `start(webview, url)` driver, so tests can use fake webviews
+- At most `max_concurrent` navigations in flight; a slot is released by the
+  navigation delegate (`finished` / `failed`) or after `timeout` seconds
+- Priority order: foreground page, then recently used pages, then background
+  warm-ups; FIFO within a priority. A queued request can be promoted (the
+  user switched to it) without re-queuing
+- A heap of (priority, seq, key) with lazy invalidation, like SuspendPolicy
+- Metrics: queue depth, in-flight count and wait time (queued -> started)
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import time
+
+
+PRIORITY_FOREGROUND = 0
+PRIORITY_RECENT = 1
+PRIORITY_BACKGROUND = 2
+
+DEFAULT_MAX_CONCURRENT = 3
+DEFAULT_TIMEOUT_SEC = 30.0
+
+
+def load_request(webview, url: str) -> None:
+    """Default driver: issue an NSURLRequest on a WKWebView."""
+    from Foundation import NSURL, NSURLRequest
+
+    webview.loadRequest_(NSURLRequest.requestWithURL_(NSURL.URLWithString_(url)))
+
+
+class _Request:
+    __slots__ = ("key", "webview", "url", "priority", "seq", "queued_ts", "started_ts")
+
+    def __init__(self, key: str, webview: Any, url: str, priority: int, seq: int, queued_ts: float):
+        self.key = key
+        self.webview = webview
+        self.url = url
+        self.priority = priority
+        self.seq = seq
+        self.queued_ts = queued_ts
+        self.started_ts: Optional[float] = None
+
+
+class LoadScheduler:
+    """Queue page loads and start them under a concurrency cap.
+
+    Keys identify pages (page/window ids); a page has at most one pending or
+    in-flight request, and a new request for the same key replaces the old one.
+    """
+
+    def __init__(self, start: Callable[[Any, str], None] = load_request,
+                 max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT_SEC,
+                 clock: Callable[[], float] = time.time) -> None:
+        self._start = start
+        self._max = max(1, int(max_concurrent or 1))
+        self._timeout = timeout if timeout and timeout > 0 else None
+        self._clock = clock
+        self._seq = itertools.count()
+        self._queued: Dict[str, _Request] = {}
+        self._heap: List[Tuple[int, int, str]] = []
+        self._in_flight: Dict[str, _Request] = {}
+        self._by_webview: Dict[Any, str] = {}
+        self._stats = {"started": 0, "completed": 0, "failed": 0, "timed_out": 0, "cancelled": 0}
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    # ---- configuration ----
+    def set_max_concurrent(self, value: int) -> None:
+        try:
+            self._max = max(1, int(value))
+        except Exception:
+            return
+        self.pump()
+
+    def get_max_concurrent(self) -> int:
+        return self._max
+
+    # ---- requests ----
+    def request(self, key: str, webview: Any, url: Optional[str], priority: int = PRIORITY_RECENT) -> None:
+        """Queue a load of `url` into `webview`; it starts now if a slot is free."""
+        if not key or webview is None or not url:
+            return
+        self._drop(key)
+        req = _Request(key, webview, url, priority, next(self._seq), self._clock())
+        self._queued[key] = req
+        heapq.heappush(self._heap, (priority, req.seq, key))
+        self.pump()
+
+    def promote(self, key: Optional[str], priority: int = PRIORITY_FOREGROUND) -> bool:
+        """Raise a queued request's priority (never lowers it); True if it is queued."""
+        req = self._queued.get(key) if key else None
+        if req is None:
+            return False
+        if priority < req.priority:
+            req.priority = priority
+            heapq.heappush(self._heap, (priority, req.seq, key))
+            self.pump()
+        return True
+
+    def cancel(self, key: Optional[str]) -> bool:
+        """Forget a page's queued or in-flight request (e.g. the page was closed)."""
+        if not key or not self._drop(key):
+            return False
+        self._stats["cancelled"] += 1
+        self.pump()
+        return True
+
+    def _drop(self, key: str) -> bool:
+        if self._queued.pop(key, None) is not None:
+            return True
+        req = self._in_flight.pop(key, None)
+        if req is None:
+            return False
+        if self._by_webview.get(req.webview) == key:
+            del self._by_webview[req.webview]
+        return True
+
+    # ---- navigation callbacks ----
+    def finished(self, webview: Any) -> bool:
+        """didFinishNavigation: release the slot held by `webview` (no-op for untracked loads)."""
+        return self._release(webview, "completed")
+
+    def failed(self, webview: Any) -> bool:
+        """didFail(Provisional)Navigation: release the slot held by `webview`."""
+        return self._release(webview, "failed")
+
+    def _release(self, webview: Any, outcome: str) -> bool:
+        key = self._by_webview.pop(webview, None) if webview is not None else None
+        if key is None:
+            return False
+        self._in_flight.pop(key, None)
+        self._stats[outcome] += 1
+        self.pump()
+        return True
+
+    # ---- scheduling ----
+    def expire(self, now: Optional[float] = None) -> List[str]:
+        """Release in-flight loads older than the timeout; returns their keys."""
+        if self._timeout is None:
+            return []
+        now = self._clock() if now is None else now
+        expired = [k for k, r in self._in_flight.items() if now - r.started_ts >= self._timeout]
+        for key in expired:
+            req = self._in_flight.pop(key)
+            self._by_webview.pop(req.webview, None)
+            self._stats["timed_out"] += 1
+        if expired:
+            self.pump()
+        return expired
+
+    def next_timeout(self) -> Optional[float]:
+        """Clock time at which the oldest in-flight load times out (None if nothing is in flight)."""
+        if self._timeout is None or not self._in_flight:
+            return None
+        return min(r.started_ts for r in self._in_flight.values()) + self._timeout
+
+    def now(self) -> float:
+        return self._clock()
+
+    def pump(self) -> List[str]:
+        """Start queued loads while slots are free, highest priority first; returns started keys."""
+        started: List[str] = []
+        heap = self._heap
+        while heap and len(self._in_flight) < self._max:
+            priority, seq, key = heapq.heappop(heap)
+            req = self._queued.get(key)
+            # Stale entry: cancelled, replaced or promoted since it was pushed
+            if req is None or req.seq != seq or req.priority != priority:
+                continue
+            del self._queued[key]
+            self._begin(req)
+            started.append(key)
+        return started
+
+    def _begin(self, req: _Request) -> None:
+        now = self._clock()
+        req.started_ts = now
+        wait = max(0.0, now - req.queued_ts)
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+        self._stats["started"] += 1
+        # The same webview can only run one navigation: a new load supersedes the old one
+        prev = self._by_webview.get(req.webview)
+        if prev is not None:
+            self._in_flight.pop(prev, None)
+        self._in_flight[req.key] = req
+        self._by_webview[req.webview] = req.key
+        try:
+            self._start(req.webview, req.url)
+        except Exception as e:
+            print(f"WARNING[load]: failed to start load for {req.key}: {e}")
+            self._release(req.webview, "failed")
+
+    # ---- introspection ----
+    def is_queued(self, key: Optional[str]) -> bool:
+        return key in self._queued
+
+    def is_loading(self, key: Optional[str]) -> bool:
+        return key in self._in_flight
+
+    def queue_depth(self) -> int:
+        return len(self._queued)
+
+    def in_flight_count(self) -> int:
+        return len(self._in_flight)
+
+    def stats(self) -> Dict[str, float]:
+        """Counters plus queue depth, in-flight count and wait times (ms)."""
+        out: Dict[str, float] = dict(self._stats)
+        out["queued"] = len(self._queued)
+        out["in_flight"] = len(self._in_flight)
+        started = self._stats["started"]
+        out["avg_wait_ms"] = (self._wait_total / started * 1000.0) if started else 0.0
+        out["max_wait_ms"] = self._wait_max * 1000.0
+        return out
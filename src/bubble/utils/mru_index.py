@@ -0,0 +1,91 @@
+"""
+Most-recently-used index of pages, globally and per platform.
+
+Design goals:
+- Record real activation order (switches), not creation order.
+- O(1) answers for "most recent page of platform X", "previous page" and
+  "least recently used page overall" (OrderedDict ends, no sorting).
+- Pages created in the background (e.g. restored at startup) enter at the
+  least-recent end until the user actually opens them.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterator, Optional
+
+
+class MRUIndex:
+    __slots__ = ("_global", "_groups", "_group_of")
+
+    def __init__(self) -> None:
+        # Most recent at the end of each OrderedDict
+        self._global: "OrderedDict[str, None]" = OrderedDict()
+        self._groups: Dict[Hashable, "OrderedDict[str, None]"] = {}
+        self._group_of: Dict[str, Hashable] = {}
+
+    def __len__(self) -> int:
+        return len(self._global)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._global
+
+    # ----- mutation -----
+    def add(self, item_id: str, group: Hashable, *, used: bool = False) -> None:
+        """Register a page; `used=True` makes it the most recent, otherwise it is the least recent."""
+        if item_id in self._global:
+            if used:
+                self.touch(item_id)
+            return
+        bucket = self._groups.setdefault(group, OrderedDict())
+        self._global[item_id] = None
+        bucket[item_id] = None
+        self._group_of[item_id] = group
+        if not used:
+            self._global.move_to_end(item_id, last=False)
+            bucket.move_to_end(item_id, last=False)
+
+    def touch(self, item_id: str) -> bool:
+        """Mark a page as just used; returns False for unknown ids."""
+        if item_id not in self._global:
+            return False
+        self._global.move_to_end(item_id)
+        self._groups[self._group_of[item_id]].move_to_end(item_id)
+        return True
+
+    def remove(self, item_id: str) -> bool:
+        if item_id not in self._global:
+            return False
+        del self._global[item_id]
+        group = self._group_of.pop(item_id)
+        bucket = self._groups.get(group)
+        if bucket is not None:
+            bucket.pop(item_id, None)
+            if not bucket:
+                del self._groups[group]
+        return True
+
+    # ----- queries -----
+    def _order(self, group: Optional[Hashable]) -> "OrderedDict[str, None]":
+        if group is None:
+            return self._global
+        return self._groups.get(group) or OrderedDict()
+
+    def most_recent(self, group: Optional[Hashable] = None) -> Optional[str]:
+        return next(reversed(self._order(group)), None)
+
+    def least_recent(self, group: Optional[Hashable] = None) -> Optional[str]:
+        return next(iter(self._order(group)), None)
+
+    def previous(self, group: Optional[Hashable] = None) -> Optional[str]:
+        """The page used just before the most recent one (for "switch back")."""
+        it = reversed(self._order(group))
+        next(it, None)
+        return next(it, None)
+
+    def group_of(self, item_id: str) -> Optional[Hashable]:
+        return self._group_of.get(item_id)
+
+    def iter_recent(self, group: Optional[Hashable] = None) -> Iterator[str]:
+        """Most recent first."""
+        return reversed(self._order(group))
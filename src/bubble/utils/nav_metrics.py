@@ -0,0 +1,164 @@
+"""
+Per-page navigation timing.
+
+Design goals:
+- Record start / commit / finish / fail timestamps per navigation, keyed by
+  page (window) id and platform id, from the WKNavigationDelegate callbacks
+- Aggregate time-to-commit and time-to-finish into fixed-bucket histograms
+  per (platform, kind); kind tells a fresh load from a suspend resume or a
+  deep-suspend recreation (the owner announces it with `expect`)
+- Navigations the owner makes for itself (the blank page of a suspend) are
+  skipped with `ignore`, so they neither count as loads nor as failures
+- Pure Python with an injectable clock; `to_json()` / `dump()` for debugging
+"""
+
+from __future__ import annotations
+
+from collections import deque
+import json
+import os
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+import time
+
+from .histogram import LatencyHistogram
+
+
+KIND_LOAD = "load"
+KIND_RESUME = "resume"
+KIND_RECREATE = "recreate"
+# Marker for a navigation that is not recorded (see NavMetrics.ignore)
+_IGNORED = "ignored"
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open
+BUCKETS_MS: Tuple[float, ...] = (100.0, 250.0, 500.0, 1000.0, 2000.0, 5000.0, 10000.0)
+
+
+class _Stats:
+    __slots__ = ("commit", "finish", "failures")
+
+    def __init__(self) -> None:
+        self.commit = LatencyHistogram(BUCKETS_MS)
+        self.finish = LatencyHistogram(BUCKETS_MS)
+        self.failures = 0
+
+
+class NavMetrics:
+    """Navigation timing store (one in-flight navigation per page)."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, max_recent: int = 200) -> None:
+        self._clock = clock
+        self._expected: Dict[str, str] = {}
+        self._active: Dict[str, Dict[str, Any]] = {}
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._stats: Dict[Tuple[str, str], _Stats] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=max(1, max_recent))
+
+    # ---- recording ----
+    def expect(self, key: Optional[str], kind: str) -> None:
+        """Tag the next navigation of `key` (e.g. KIND_RESUME before reloading a suspended page)."""
+        if key:
+            self._expected[key] = kind
+
+    def ignore(self, key: Optional[str]) -> None:
+        """Drop the in-flight navigation of `key` uncounted and skip its next one (unless `expect` re-tags it)."""
+        if key:
+            self._active.pop(key, None)
+            self._expected[key] = _IGNORED
+
+    def start(self, key: Optional[str], platform_id: Optional[str]) -> None:
+        if not key:
+            return
+        kind = self._expected.pop(key, KIND_LOAD)
+        if kind == _IGNORED:
+            self._active.pop(key, None)
+            return
+        self._active[key] = {
+            "page_id": key,
+            "platform_id": platform_id or "unknown",
+            "kind": kind,
+            "start": self._clock(),
+            "commit": None,
+            "finish": None,
+            "failed": False,
+        }
+
+    def commit(self, key: Optional[str]) -> None:
+        rec = self._active.get(key) if key else None
+        if rec is not None and rec["commit"] is None:
+            rec["commit"] = self._clock()
+
+    def finish(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        return self._end(key, failed=False)
+
+    def fail(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        return self._end(key, failed=True)
+
+    def forget(self, key: Optional[str]) -> None:
+        """Drop per-page state for a closed page (aggregates are kept)."""
+        if key:
+            self._expected.pop(key, None)
+            self._active.pop(key, None)
+            self._last.pop(key, None)
+
+    def _end(self, key: Optional[str], failed: bool) -> Optional[Dict[str, Any]]:
+        rec = self._active.pop(key, None) if key else None
+        if rec is None:
+            return None
+        now = self._clock()
+        rec["failed"] = failed
+        rec["finish"] = now
+        stats = self._stats.get((rec["platform_id"], rec["kind"]))
+        if stats is None:
+            stats = self._stats[(rec["platform_id"], rec["kind"])] = _Stats()
+        if failed:
+            stats.failures += 1
+        else:
+            if rec["commit"] is not None:
+                stats.commit.add((rec["commit"] - rec["start"]) * 1000.0)
+            stats.finish.add((now - rec["start"]) * 1000.0)
+        self._last[key] = rec
+        self._recent.append(rec)
+        return rec
+
+    # ---- queries ----
+    def last(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Timestamps of the page's most recent completed navigation."""
+        rec = self._last.get(key) if key else None
+        return dict(rec) if rec is not None else None
+
+    def histogram(self, platform_id: str, kind: str = KIND_LOAD, phase: str = "finish") -> Optional[LatencyHistogram]:
+        stats = self._stats.get((platform_id, kind))
+        return getattr(stats, phase) if stats is not None else None
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """{platform: {kind: {"failures", "time_to_commit", "time_to_finish"}}}"""
+        out: Dict[str, Dict[str, Any]] = {}
+        for (platform_id, kind), stats in sorted(self._stats.items()):
+            out.setdefault(platform_id, {})[kind] = {
+                "failures": stats.failures,
+                "time_to_commit": stats.commit.to_dict(),
+                "time_to_finish": stats.finish.to_dict(),
+            }
+        return out
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        recent = []
+        for rec in self._recent:
+            start = rec["start"]
+            recent.append({
+                "page_id": rec["page_id"],
+                "platform_id": rec["platform_id"],
+                "kind": rec["kind"],
+                "failed": rec["failed"],
+                "commit_ms": None if rec["commit"] is None else round((rec["commit"] - start) * 1000.0, 1),
+                "finish_ms": round((rec["finish"] - start) * 1000.0, 1),
+            })
+        return json.dumps({"platforms": self.summary(), "recent": recent,
+                           "in_flight": len(self._active)}, indent=indent, ensure_ascii=False)
+
+    def dump(self, path: str) -> str:
+        """Write to_json() to `path` (parent directories are created); returns the path."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+        return path
@@ -6,22 +6,54 @@ window/webview should be suspended due to inactivity, and helpers to suspend
 and resume a WKWebView while preserving minimal session data.
 
 Design goals:
-- Pure Python timing/state for easy unit testing
+- Pure Python timing/state for easy unit testing (injectable clock)
+- Deadline driven: a min-heap of (deadline, window_id) answers "what is due
+  next" in O(1) and "what is due now" in O(k log n); activity pushes a new
+  entry and stale ones are dropped lazily when they reach the top
+- Live budget: a cap on concurrently live (not suspended) windows and/or an
+  estimated memory budget; live windows are kept in LRU order so the least
+  recently active non-foreground window is picked first when over budget
+- Two tiers: light (blank page in the same WKWebView) escalates to deep
+  (WKWebView torn down, owner keeps a placeholder and recreates it on demand)
+  after a second timeout; transitions go through a `SuspendHost` adapter so
+  they can be exercised with fake webviews
 - Defensive integration with PyObjC (all Cocoa calls wrapped in try/except)
 - Idempotent helpers: calling suspend/resume multiple times is safe
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
 import time
 
 
+# Rough per-page footprint of a live WebContent process, used for the memory budget
+DEFAULT_WINDOW_COST_MB = 150.0
+
+# Suspend tiers
+TIER_LIVE = 0
+TIER_LIGHT = 1
+TIER_DEEP = 2
+
+# Session data keys written by the helpers below
+LAST_URL_KEY = "_suspend_last_url"
+SCROLL_KEY = "_suspend_scroll"
+
+
 @dataclass
 class _WindowState:
-    last_activity_ts: float = field(default_factory=lambda: time.time())
-    suspended: bool = False
+    last_activity_ts: float
+    tier: int = TIER_LIVE
+    suspended_ts: Optional[float] = None
+    # Deadline of the live heap entry for this window (None: not scheduled)
+    deadline: Optional[float] = None
+
+    @property
+    def suspended(self) -> bool:
+        return self.tier != TIER_LIVE
 
 
 class SuspendPolicy:
@@ -30,58 +62,224 @@ class SuspendPolicy:
     Minutes can be set to 0 or None to disable suspension.
     """
 
-    def __init__(self, minutes: Optional[int] = 30) -> None:
+    def __init__(self, minutes: Optional[int] = 30, clock: Callable[[], float] = time.time,
+                 deep_minutes: Optional[int] = None) -> None:
         self._minutes: Optional[int] = None
+        self._deep_minutes: Optional[int] = None
         self._states: Dict[str, _WindowState] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._clock = clock
+        # Live (not suspended) windows, least recently active first
+        self._live: "OrderedDict[str, None]" = OrderedDict()
+        self._costs: Dict[str, float] = {}
+        self._live_mb = 0.0
+        self._max_live: Optional[int] = None
+        self._memory_budget_mb: Optional[float] = None
+        self._deep_minutes = _positive_minutes(deep_minutes)
         self.set_timeout_minutes(minutes)
 
     # ---- configuration ----
     def set_timeout_minutes(self, minutes: Optional[int]) -> None:
-        if minutes is None:
-            self._minutes = None
-            return
-        try:
-            m = int(minutes)
-            if m <= 0:
-                # 0 or negative disables suspension
-                self._minutes = None
-            else:
-                self._minutes = m
-        except Exception:
-            # Invalid input disables suspension rather than crashing
-            self._minutes = None
+        # 0, negative or invalid input disables suspension rather than crashing
+        self._minutes = _positive_minutes(minutes)
+        self._rebuild_heap()
 
     def get_timeout_minutes(self) -> Optional[int]:
         return self._minutes
 
-    # ---- activity tracking ----
-    def note_window_activity(self, window_id: Optional[str]) -> None:
+    def set_deep_timeout_minutes(self, minutes: Optional[int]) -> None:
+        """Minutes a window stays lightly suspended before escalating to deep; 0/None disables."""
+        self._deep_minutes = _positive_minutes(minutes)
+        self._rebuild_heap()
+
+    def get_deep_timeout_minutes(self) -> Optional[int]:
+        return self._deep_minutes
+
+    def set_live_budget(self, max_live: Optional[int] = None, memory_mb: Optional[float] = None) -> None:
+        """Cap live windows by count and/or estimated MB; 0, None or invalid means unlimited."""
+        def _positive(value, cast):
+            try:
+                v = cast(value)
+                return v if v > 0 else None
+            except Exception:
+                return None
+        self._max_live = _positive(max_live, int)
+        self._memory_budget_mb = _positive(memory_mb, float)
+
+    def get_live_budget(self) -> Tuple[Optional[int], Optional[float]]:
+        return self._max_live, self._memory_budget_mb
+
+    def set_window_cost(self, window_id: Optional[str], mb: float) -> None:
+        """Override the estimated footprint of one window (default DEFAULT_WINDOW_COST_MB)."""
         if not window_id:
             return
+        old = self._cost(window_id)
+        self._costs[window_id] = max(0.0, float(mb))
+        if window_id in self._live:
+            self._live_mb += self._costs[window_id] - old
+
+    def now(self) -> float:
+        """Current time on the policy clock (deadlines use the same clock)."""
+        return self._clock()
+
+    # ---- deadline heap ----
+    def _deadline_for(self, st: _WindowState) -> Optional[float]:
+        if st.tier == TIER_LIVE:
+            return None if self._minutes is None else st.last_activity_ts + self._minutes * 60.0
+        if st.tier == TIER_LIGHT and self._deep_minutes is not None:
+            base = st.suspended_ts if st.suspended_ts is not None else st.last_activity_ts
+            return base + self._deep_minutes * 60.0
+        return None
+
+    def _state(self, window_id: str) -> _WindowState:
         st = self._states.get(window_id)
         if st is None:
-            st = _WindowState()
+            st = _WindowState(last_activity_ts=self._clock())
             self._states[window_id] = st
-        st.last_activity_ts = time.time()
+        return st
+
+    def _schedule(self, window_id: str, st: _WindowState) -> None:
+        st.deadline = self._deadline_for(st)
+        if st.deadline is None:
+            return
+        heapq.heappush(self._heap, (st.deadline, window_id))
+        # Frequent activity leaves stale entries behind; rebuild before they dominate
+        if len(self._heap) > 2 * len(self._states) + 32:
+            self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        self._heap = []
+        for wid, st in self._states.items():
+            st.deadline = self._deadline_for(st)
+            if st.deadline is not None:
+                self._heap.append((st.deadline, wid))
+        heapq.heapify(self._heap)
+
+    def _is_live(self, entry: Tuple[float, str]) -> bool:
+        st = self._states.get(entry[1])
+        return st is not None and st.deadline == entry[0]
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest pending tier deadline (clock time), or None if nothing is scheduled."""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """Remove and return windows whose deadline has passed, earliest first.
 
-    def mark_suspended(self, window_id: Optional[str]) -> None:
+        A due window is ready for its next tier: `tier(wid)` is TIER_LIVE for a
+        light suspend and TIER_LIGHT for escalation to deep (see `advance_tier`).
+        Popped windows are unscheduled until their next transition or activity.
+        """
+        now = self._clock() if now is None else now
+        due: List[str] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if self._is_live(entry):
+                self._states[entry[1]].deadline = None
+                due.append(entry[1])
+        return due
+
+    # ---- live set (LRU) ----
+    def _cost(self, window_id: str) -> float:
+        return self._costs.get(window_id, DEFAULT_WINDOW_COST_MB)
+
+    def _touch_live(self, window_id: str) -> None:
+        if window_id in self._live:
+            self._live.move_to_end(window_id)
+        else:
+            self._live[window_id] = None
+            self._live_mb += self._cost(window_id)
+
+    def _drop_live(self, window_id: str) -> None:
+        if window_id in self._live:
+            del self._live[window_id]
+            self._live_mb -= self._cost(window_id)
+
+    def live_window_ids(self) -> List[str]:
+        """Live windows, least recently active first."""
+        return list(self._live)
+
+    def estimated_live_mb(self) -> float:
+        return max(0.0, self._live_mb)
+
+    def has_live_capacity(self, window_id: Optional[str] = None) -> bool:
+        """True if one more window (`window_id`'s cost, or the default) can go live within budget."""
+        if window_id is not None and window_id in self._live:
+            return True
+        if self._max_live is not None and len(self._live) >= self._max_live:
+            return False
+        if self._memory_budget_mb is not None:
+            cost = self._cost(window_id) if window_id else DEFAULT_WINDOW_COST_MB
+            return self._live_mb + cost <= self._memory_budget_mb
+        return True
+
+    def pick_evictions(self, foreground: Optional[str] = None) -> List[str]:
+        """Live windows to suspend now to get back under budget, LRU first.
+
+        The foreground window is never picked. Nothing is mutated: callers
+        suspend each window and then call `mark_suspended`.
+        """
+        excess = len(self._live) - self._max_live if self._max_live is not None else 0
+        budget = self._memory_budget_mb
+        live_mb = self._live_mb
+        victims: List[str] = []
+        for wid in self._live:
+            if excess <= 0 and (budget is None or live_mb <= budget):
+                break
+            if wid == foreground:
+                continue
+            victims.append(wid)
+            excess -= 1
+            live_mb -= self._cost(wid)
+        return victims
+
+    # ---- activity tracking ----
+    def note_window_activity(self, window_id: Optional[str]) -> None:
         if not window_id:
             return
-        st = self._states.get(window_id)
-        if st is None:
-            st = _WindowState()
-            self._states[window_id] = st
-        st.suspended = True
+        st = self._state(window_id)
+        st.last_activity_ts = self._clock()
+        if not st.suspended:
+            self._touch_live(window_id)
+            self._schedule(window_id, st)
+
+    def mark_suspended(self, window_id: Optional[str], deep: bool = False) -> None:
+        if not window_id:
+            return
+        st = self._state(window_id)
+        st.tier = TIER_DEEP if deep else TIER_LIGHT
+        st.suspended_ts = self._clock()
+        self._drop_live(window_id)
+        self._schedule(window_id, st)
 
     def mark_resumed(self, window_id: Optional[str]) -> None:
         if not window_id:
             return
-        st = self._states.get(window_id)
-        if st is None:
-            st = _WindowState()
-            self._states[window_id] = st
-        st.suspended = False
-        st.last_activity_ts = time.time()
+        st = self._state(window_id)
+        st.tier = TIER_LIVE
+        st.suspended_ts = None
+        st.last_activity_ts = self._clock()
+        self._touch_live(window_id)
+        self._schedule(window_id, st)
+
+    def forget(self, window_id: Optional[str]) -> None:
+        """Drop all state for a closed window (its heap entries expire lazily)."""
+        if window_id:
+            self._drop_live(window_id)
+            self._states.pop(window_id, None)
+            self._costs.pop(window_id, None)
+
+    def is_suspended(self, window_id: Optional[str]) -> bool:
+        st = self._states.get(window_id) if window_id else None
+        return bool(st is not None and st.suspended)
+
+    def tier(self, window_id: Optional[str]) -> int:
+        st = self._states.get(window_id) if window_id else None
+        return st.tier if st is not None else TIER_LIVE
 
     # ---- decision ----
     def should_suspend(self, window_id: Optional[str]) -> bool:
@@ -101,12 +299,22 @@ class SuspendPolicy:
         if st.suspended:
             return False
         try:
-            idle_sec = time.time() - float(st.last_activity_ts)
+            idle_sec = self._clock() - float(st.last_activity_ts)
         except Exception:
             return False
         return idle_sec >= (self._minutes * 60)
 
 
+def _positive_minutes(minutes) -> Optional[int]:
+    if minutes is None:
+        return None
+    try:
+        m = int(minutes)
+    except Exception:
+        return None
+    return m if m > 0 else None
+
+
 # ---- WKWebView suspend/resume helpers ----
 
 def _get_current_url(webview) -> Optional[str]:
@@ -126,10 +334,44 @@ def _get_current_url(webview) -> Optional[str]:
         return None
 
 
+def _is_blank(url: Optional[str]) -> bool:
+    return not url or url == "about:blank"
+
+
+def capture_scroll(webview, holder) -> None:
+    """Asynchronously record the page scroll offset into holder session data."""
+    if webview is None or holder is None or not hasattr(webview, "evaluateJavaScript_completionHandler_"):
+        return
+
+    def _done(result, error):
+        try:
+            if error is None and result is not None and len(result) >= 2:
+                holder.set_session_data(SCROLL_KEY, [float(result[0]), float(result[1])])
+        except Exception:
+            pass
+    try:
+        webview.evaluateJavaScript_completionHandler_("[window.scrollX, window.scrollY]", _done)
+    except Exception:
+        pass
+
+
+def scroll_restore_script(holder) -> Optional[str]:
+    """One-shot JS restoring the scroll offset captured before suspension (None if nothing to restore)."""
+    try:
+        pos = holder.get_session_data(SCROLL_KEY, None) if holder is not None else None
+        if not pos:
+            return None
+        holder.set_session_data(SCROLL_KEY, None)
+        return f"window.scrollTo({float(pos[0])}, {float(pos[1])});"
+    except Exception:
+        return None
+
+
 def suspend_webview(webview, ai_window) -> None:
-    """Lightweight suspend: capture URL and show a lightweight blank page.
+    """Lightweight suspend: capture URL/scroll and show a lightweight blank page.
 
     - Store the last URL into ai_window.session_data["_suspend_last_url"].
+    - Record the scroll offset (async) so a later resume can restore it.
     - Attempt to stop ongoing loads and replace content with a minimal blank.
     - Idempotent and defensive against missing APIs.
     """
@@ -137,14 +379,16 @@ def suspend_webview(webview, ai_window) -> None:
         return
     try:
         last_url = _get_current_url(webview)
-        if ai_window is not None:
+        # Already blank (suspended twice): keep the URL captured the first time
+        if ai_window is not None and not _is_blank(last_url):
+            capture_scroll(webview, ai_window)
             try:
-                ai_window.set_session_data("_suspend_last_url", last_url)
+                ai_window.set_session_data(LAST_URL_KEY, last_url)
             except Exception:
                 # Fallback if helper not available
                 try:
                     if getattr(ai_window, "session_data", None) is not None:
-                        ai_window.session_data["_suspend_last_url"] = last_url
+                        ai_window.session_data[LAST_URL_KEY] = last_url
                 except Exception:
                     pass
     except Exception:
@@ -164,17 +408,20 @@ def suspend_webview(webview, ai_window) -> None:
         pass
 
 
-def resume_webview(webview, ai_window) -> None:
-    """Resume a previously suspended webview by reloading last URL if needed."""
+def resume_webview(webview, ai_window, load: Optional[Callable[[str], None]] = None) -> None:
+    """Resume a previously suspended webview by reloading last URL if needed.
+
+    `load(url)` lets the owner route the reload through its load scheduler.
+    """
     if webview is None:
         return
     last_url = None
     try:
         if ai_window is not None:
-            last_url = ai_window.get_session_data("_suspend_last_url", None)
+            last_url = ai_window.get_session_data(LAST_URL_KEY, None)
             if last_url is None:
                 # Fallback direct access
-                last_url = getattr(getattr(ai_window, "session_data", {}), "get", lambda *_: None)("_suspend_last_url")
+                last_url = getattr(getattr(ai_window, "session_data", {}), "get", lambda *_: None)(LAST_URL_KEY)
     except Exception:
         last_url = None
 
@@ -189,6 +436,12 @@ def resume_webview(webview, ai_window) -> None:
         return
 
     # Reload last URL
+    if load is not None:
+        try:
+            load(last_url)
+            return
+        except Exception:
+            pass
     try:
         from Foundation import NSURL, NSURLRequest
         if hasattr(webview, "loadRequest_"):
@@ -205,3 +458,103 @@ def resume_webview(webview, ai_window) -> None:
     except Exception:
         pass
 
+
+def deep_suspend_webview(webview, holder, detach: Callable[[], None]) -> None:
+    """Deep suspend: keep URL/scroll in holder session data, then let the owner tear the view down.
+
+    `detach()` must remove the WKWebView from the view hierarchy and from the
+    owner's maps, leaving a placeholder so it can be recreated on demand.
+    """
+    if webview is not None:
+        try:
+            url = _get_current_url(webview)
+            if not _is_blank(url) and holder is not None:
+                # Suspended straight to deep (no light phase): capture now
+                capture_scroll(webview, holder)
+                holder.set_session_data(LAST_URL_KEY, url)
+        except Exception:
+            pass
+        try:
+            if hasattr(webview, "stopLoading"):
+                webview.stopLoading()
+        except Exception:
+            pass
+    detach()
+
+
+class SuspendHost:
+    """Adapter between the policy and a concrete page owner.
+
+    - get_webview(wid): live WKWebView or None (deep-suspended / unknown)
+    - get_holder(wid): object with set_session_data/get_session_data, or None if the window is gone
+    - detach_webview(wid): drop the WKWebView, keep a placeholder
+    - recreate_webview(wid, url): build a fresh WKWebView, load `url` (or the default), return it
+    - load_url(wid, webview, url): optional, reload a lightly suspended view (default: loadRequest_)
+    - before_suspend(wid): optional, called right before the view is stopped and blanked or torn
+      down (e.g. so navigation metrics skip the blank load)
+    """
+
+    def __init__(self, get_webview, get_holder, detach_webview, recreate_webview, load_url=None,
+                 before_suspend=None):
+        self.get_webview = get_webview
+        self.get_holder = get_holder
+        self.detach_webview = detach_webview
+        self.recreate_webview = recreate_webview
+        self.load_url = load_url
+        self.before_suspend = before_suspend
+
+    def notify_suspend(self, window_id: str) -> None:
+        if self.before_suspend is not None:
+            try:
+                self.before_suspend(window_id)
+            except Exception as e:
+                print(f"WARNING[suspend]: before_suspend hook failed: {e}")
+
+
+def advance_tier(policy: SuspendPolicy, window_id: str, host: SuspendHost,
+                 foreground: Optional[str] = None, deep: bool = False) -> int:
+    """Move a due/evicted window to its next tier and return the new tier.
+
+    live -> light (or straight to deep when `deep` is set), light -> deep.
+    The foreground window is never suspended; it is treated as active instead.
+    """
+    holder = host.get_holder(window_id)
+    if holder is None:
+        policy.forget(window_id)
+        return TIER_LIVE
+    if window_id == foreground:
+        policy.note_window_activity(window_id)
+        return policy.tier(window_id)
+    current = policy.tier(window_id)
+    webview = host.get_webview(window_id)
+    if current == TIER_LIVE and not deep:
+        host.notify_suspend(window_id)
+        suspend_webview(webview, holder)
+        policy.mark_suspended(window_id)
+        return TIER_LIGHT
+    if current in (TIER_LIVE, TIER_LIGHT):
+        host.notify_suspend(window_id)
+        deep_suspend_webview(webview, holder, lambda: host.detach_webview(window_id))
+        policy.mark_suspended(window_id, deep=True)
+        return TIER_DEEP
+    return current
+
+
+def wake_window(policy: SuspendPolicy, window_id: str, host: SuspendHost):
+    """Bring a window back to live before showing it; returns its (possibly new) webview."""
+    holder = host.get_holder(window_id)
+    webview = host.get_webview(window_id)
+    tier = policy.tier(window_id)
+    if webview is None:
+        # Deep-suspended (or never materialized): recreate at the last known URL
+        last_url = holder.get_session_data(LAST_URL_KEY, None) if holder is not None else None
+        webview = host.recreate_webview(window_id, last_url)
+    elif tier == TIER_LIGHT:
+        load = None
+        if host.load_url is not None:
+            load = lambda url: host.load_url(window_id, webview, url)  # noqa: E731
+        resume_webview(webview, holder, load=load)
+    if webview is not None:
+        policy.mark_resumed(window_id)
+    return webview
+
@@ -2,15 +2,21 @@
 Navigation guard and error overlay utilities for WKWebView.
 
 Features:
-- Allowed host (domain) whitelist check for navigation
+- Allowed host (domain) whitelist check for navigation, per webview: each
+  webview gets a compiled HostMatcher (exact / *.suffix / .domain rules);
+  identical rule sets share one matcher, webviews without their own policy
+  use the default set via setAllowedHosts_
 - Error overlay with a single "Retry" action (as per spec)
+- Optional load listener (e.g. LoadScheduler) notified on finish/fail
 """
 
 from __future__ import annotations
 
-from typing import Callable, Optional, Set
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Set
 import objc
 
+from .host_matcher import HostMatcher
+
 try:
     from Foundation import NSObject
     from AppKit import NSView, NSButton, NSTextField, NSMakeRect, NSColor, NSFont, NSAnimationContext
@@ -50,32 +56,86 @@ class NavigationGuard(NSObject):
         self = objc.super(NavigationGuard, self).init()
         if self is None:
             return None
-        self._allowed_hosts: Set[str] = set()
+        self._default_policy = HostMatcher()
+        self._policies = {}  # webview -> HostMatcher
+        self._compiled: Dict[FrozenSet[str], HostMatcher] = {}  # rule set -> shared matcher
         self._overlays = {}  # webview -> overlay view
         self._retry_handler = {}  # webview -> callable
+        self._load_listener = None  # object with finished(webview)/failed(webview)
         return self
 
     # ---- public API ----
     def setAllowedHosts_(self, hosts):  # ObjC-friendly: - (void)setAllowedHosts:(id)hosts
-        try:
-            self._allowed_hosts = {str(h).lower() for h in (hosts or [])}
-        except Exception:
-            self._allowed_hosts = set()
+        """Default policy for webviews attached without their own allowed hosts."""
+        self._default_policy = self._compile(hosts)
 
     def py_setAllowedHosts(self, hosts: Set[str]):  # Pythonic (avoid ObjC selector)
         self.setAllowedHosts_(hosts)
 
-    def attach_to(self, webview, on_retry: Optional[Callable] = None):
+    def _compile(self, hosts: Optional[Iterable[str]]) -> HostMatcher:
+        try:
+            key = frozenset(str(h).strip().lower() for h in (hosts or []) if h)
+        except Exception:
+            key = frozenset()
+        matcher = self._compiled.get(key)
+        if matcher is None:
+            matcher = self._compiled[key] = HostMatcher(sorted(key))
+        return matcher
+
+    def set_policy(self, webview, hosts: Optional[Iterable[str]]) -> None:
+        """Allowed hosts for one webview (None: fall back to the default policy)."""
+        if hosts is None:
+            self._policies.pop(webview, None)
+        else:
+            self._policies[webview] = self._compile(hosts)
+
+    def policy_for(self, webview) -> HostMatcher:
+        return self._policies.get(webview, self._default_policy)
+
+    def policy_stats(self) -> Dict[str, dict]:
+        """Allow/deny counters per compiled rule set, keyed by the comma-joined rules."""
+        return {",".join(m.rules) or "*": m.stats() for m in self._compiled.values()}
+
+    def set_load_listener(self, listener) -> None:
+        self._load_listener = listener
+
+    def _notify_load(self, webview, ok: bool) -> None:
+        listener = self._load_listener
+        if listener is None:
+            return
+        try:
+            if ok:
+                listener.finished(webview)
+            else:
+                listener.failed(webview)
+        except Exception:
+            pass
+
+    def attach_to(self, webview, on_retry: Optional[Callable] = None,
+                  allowed_hosts: Optional[Iterable[str]] = None):
         try:
             # Keep a retry handler for fail events
             if on_retry is not None:
                 self._retry_handler[webview] = on_retry
+            if allowed_hosts is not None:
+                self.set_policy(webview, allowed_hosts)
             # Attach as navigation delegate
             if hasattr(webview, "setNavigationDelegate_"):
                 webview.setNavigationDelegate_(self)
         except Exception:
             pass
 
+    def detach(self, webview) -> None:
+        """Forget per-webview state (policy, retry handler, overlay) for a released webview."""
+        self._policies.pop(webview, None)
+        self._retry_handler.pop(webview, None)
+        overlay = self._overlays.pop(webview, None)
+        if overlay is not None:
+            try:
+                overlay.removeFromSuperview()
+            except Exception:
+                pass
+
     # ---- error overlay ----
     def show_error_overlay(self, webview, message: str = "Load failed", on_retry: Optional[Callable] = None):
         try:
@@ -186,7 +246,7 @@ class NavigationGuard(NSObject):
             req = navigationAction.request() if hasattr(navigationAction, "request") else None
             url = req.URL() if (req is not None and hasattr(req, "URL")) else None
             host = _extract_host(url)
-            if host and self._allowed_hosts and host.lower() not in self._allowed_hosts:
+            if not self.policy_for(webView).allows(host):
                 # Block navigation to external host
                 decisionHandler(WKNavigationActionPolicyCancel)
                 # Optionally, a toast or small tip can be triggered by upper layer
@@ -199,8 +259,13 @@ class NavigationGuard(NSObject):
             except Exception:
                 pass
 
+    # def webView:didFinishNavigation:
+    def webView_didFinishNavigation_(self, webView, navigation):  # noqa: N802
+        self._notify_load(webView, True)
+
     # def webView:didFailProvisionalNavigation:withError:
     def webView_didFailProvisionalNavigation_withError_(self, webView, navigation, error):  # noqa: N802
+        self._notify_load(webView, False)
         try:
             self.show_error_overlay(webView, message="Load failed", on_retry=None)
         except Exception:
@@ -208,6 +273,7 @@ class NavigationGuard(NSObject):
 
     # def webView:didFailNavigation:withError:
     def webView_didFailNavigation_withError_(self, webView, navigation, error):  # noqa: N802
+        self._notify_load(webView, False)
         try:
             self.show_error_overlay(webView, message="Load failed", on_retry=None)
         except Exception:
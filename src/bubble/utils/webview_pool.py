@@ -0,0 +1,119 @@
+"""
+Pool of pre-built, hidden WebViews for instant page creation.
+
+Design goals:
+- Building and configuring a WKWebView happens off the click path: the owner
+  calls `replenish()` during idle time and `acquire()` hands out a ready view
+- Pure Python: views are produced by an injected `create()` and released by
+  an optional `discard(view)`, so tests run with plain objects
+- The owner decides the effective size (e.g. shrink to what the live-webview
+  budget still allows) and passes it to `replenish` / `trim`
+- Metrics: hits, misses and a creation-latency histogram
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+import time
+
+from .histogram import LatencyHistogram
+
+
+# Upper bounds (ms) of the creation-latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0)
+
+
+class WebViewPool:
+    def __init__(self, create: Callable[[], Any], discard: Optional[Callable[[Any], None]] = None,
+                 size: int = 1, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._create = create
+        self._discard = discard
+        self._clock = clock
+        self._size = 0
+        self._ready: Deque[Any] = deque()
+        self._hits = 0
+        self._misses = 0
+        self._latency = LatencyHistogram(LATENCY_BUCKETS_MS)
+        self.set_size(size)
+
+    # ---- configuration ----
+    def set_size(self, size: Optional[int]) -> None:
+        """Target number of ready views; 0 or invalid disables the pool (ready views are trimmed)."""
+        try:
+            self._size = max(0, int(size or 0))
+        except Exception:
+            self._size = 0
+        self.trim(self._size)
+
+    def get_size(self) -> int:
+        return self._size
+
+    # ---- use ----
+    def create(self) -> Any:
+        """Build a view now, recording its creation latency."""
+        start = self._clock()
+        view = self._create()
+        self._latency.add((self._clock() - start) * 1000.0)
+        return view
+
+    def acquire(self) -> Any:
+        """A ready view (hit) or a freshly built one (miss)."""
+        if self._ready:
+            self._hits += 1
+            return self._ready.popleft()
+        self._misses += 1
+        return self.create()
+
+    def replenish(self, limit: Optional[int] = None, max_new: int = 1) -> int:
+        """Build up to `max_new` views towards min(size, limit); returns how many were built."""
+        target = self._size if limit is None else min(self._size, max(0, int(limit)))
+        self.trim(target)
+        built = 0
+        while len(self._ready) < target and built < max_new:
+            try:
+                view = self.create()
+            except Exception as e:
+                print(f"WARNING[pool]: failed to pre-build webview: {e}")
+                break
+            if view is None:
+                break
+            self._ready.append(view)
+            built += 1
+        return built
+
+    def needs_replenish(self, limit: Optional[int] = None) -> bool:
+        target = self._size if limit is None else min(self._size, max(0, int(limit)))
+        return len(self._ready) < target
+
+    def trim(self, target: int = 0) -> int:
+        """Release ready views beyond `target` (newest first); returns how many were released."""
+        released = 0
+        while len(self._ready) > max(0, target):
+            view = self._ready.pop()
+            released += 1
+            if self._discard is not None:
+                try:
+                    self._discard(view)
+                except Exception:
+                    pass
+        return released
+
+    def __len__(self) -> int:
+        return len(self._ready)
+
+    def __contains__(self, view: object) -> bool:
+        return any(v is view for v in self._ready)
+
+    # ---- metrics ----
+    def stats(self) -> Dict[str, Any]:
+        """Hits/misses, ready count and the creation-latency histogram ({"<=5ms": n, ..., ">500ms": n})."""
+        return {
+            "size": self._size,
+            "ready": len(self._ready),
+            "hits": self._hits,
+            "misses": self._misses,
+            "created": self._latency.count,
+            "avg_create_ms": self._latency.average(),
+            "create_latency_ms": self._latency.buckets(),
+        }
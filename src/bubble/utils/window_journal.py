@@ -0,0 +1,186 @@
+"""
+Append-only JSON-lines journal for page/window lifecycle records.
+
+Design goals:
+- O(1) per event: creating, closing or renaming a page appends one small line
+  instead of rewriting the whole config.json.
+- Snapshot + journal: the config snapshot records the last sequence number it
+  contains (`platform_windows_seq`); startup replays only newer records.
+- Bounded: once the journal exceeds a record or byte threshold the owner writes
+  a fresh snapshot and calls `compact_through(seq)` to drop folded records.
+- Tolerant: a torn trailing line (crash mid-append) is cut off when the
+  journal is opened, so the next append starts on a fresh line.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List
+
+
+OP_CREATE = "create"
+OP_CLOSE = "close"
+OP_RENAME = "rename"
+
+
+def apply_record(platform_windows: Dict[str, Dict[str, Any]], record: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Apply one journal record to a mutable {platform_id: {window_id: info}} map."""
+    op = record.get("op")
+    pid = record.get("pid")
+    wid = record.get("wid")
+    if not pid or not wid:
+        return platform_windows
+    if op == OP_CREATE:
+        platform_windows.setdefault(pid, {})[wid] = dict(record.get("info") or {})
+    elif op == OP_CLOSE:
+        windows = platform_windows.get(pid)
+        if windows is not None:
+            windows.pop(wid, None)
+            if not windows:
+                del platform_windows[pid]
+    elif op == OP_RENAME:
+        info = platform_windows.get(pid, {}).get(wid)
+        if info is not None:
+            info["title"] = record.get("title")
+    return platform_windows
+
+
+class WindowJournal:
+    def __init__(self, path: str, max_records: int = 200, max_bytes: int = 64 * 1024):
+        self.path = path
+        self.max_records = max(1, int(max_records))
+        self.max_bytes = max(1, int(max_bytes))
+        self._lock = threading.Lock()
+        self._last_seq = 0
+        self._records = 0
+        self._bytes = 0
+        self._appends = 0
+        self._compactions = 0
+        self._scan()
+
+    # ----- state -----
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def ensure_seq_at_least(self, seq: int) -> None:
+        """Never reuse sequence numbers already folded into a snapshot."""
+        with self._lock:
+            self._last_seq = max(self._last_seq, int(seq or 0))
+
+    def needs_compaction(self) -> bool:
+        return self._records >= self.max_records or self._bytes >= self.max_bytes
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "records": self._records,
+            "bytes": self._bytes,
+            "last_seq": self._last_seq,
+            "appends": self._appends,
+            "compactions": self._compactions,
+        }
+
+    # ----- reading -----
+    def _read_lines(self) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # torn write; everything after it is suspect but harmless to skip
+                    if isinstance(rec, dict) and isinstance(rec.get("seq"), int):
+                        out.append(rec)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"WARNING[journal]: failed to read {self.path}: {e}")
+        return out
+
+    def _truncate_torn_tail(self) -> None:
+        # Drop bytes after the last newline; otherwise the next append would
+        # continue the torn line and the new record would be unreadable
+        try:
+            with open(self.path, "rb+") as f:
+                data = f.read()
+                end = data.rfind(b"\n") + 1
+                if end < len(data):
+                    f.truncate(end)
+                    print(f"WARNING[journal]: dropped torn trailing record ({len(data) - end} bytes)")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"WARNING[journal]: failed to repair {self.path}: {e}")
+
+    def _scan(self) -> None:
+        self._truncate_torn_tail()
+        recs = self._read_lines()
+        self._records = len(recs)
+        self._last_seq = max((r["seq"] for r in recs), default=0)
+        try:
+            self._bytes = os.path.getsize(self.path)
+        except OSError:
+            self._bytes = 0
+
+    def records(self, after_seq: int = 0) -> Iterator[Dict[str, Any]]:
+        """Records with seq > after_seq, in append order."""
+        for rec in self._read_lines():
+            if rec["seq"] > after_seq:
+                yield rec
+
+    def replay(self, platform_windows: Dict[str, Dict[str, Any]], after_seq: int = 0) -> int:
+        """Fold newer records into `platform_windows` in place; returns the last applied seq."""
+        last = after_seq
+        for rec in self.records(after_seq):
+            apply_record(platform_windows, rec)
+            last = rec["seq"]
+        return last
+
+    # ----- writing -----
+    def append(self, op: str, platform_id: str, window_id: str, **fields: Any) -> int:
+        """Append one record and return its sequence number."""
+        with self._lock:
+            seq = self._last_seq + 1
+            rec = {"seq": seq, "op": op, "pid": platform_id, "wid": window_id}
+            rec.update(fields)
+            line = json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n"
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self._last_seq = seq
+            self._records += 1
+            self._bytes += len(line.encode("utf-8"))
+            self._appends += 1
+            return seq
+
+    def compact_through(self, seq: int) -> None:
+        """Drop records with seq <= `seq` (they are now part of a durable snapshot)."""
+        with self._lock:
+            keep = [r for r in self._read_lines() if r["seq"] > seq]
+            tmp = self.path + ".tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    for rec in keep:
+                        f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except Exception as e:
+                print(f"WARNING[journal]: compaction failed: {e}")
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                return
+            self._records = len(keep)
+            try:
+                self._bytes = os.path.getsize(self.path)
+            except OSError:
+                self._bytes = 0
+            self._compactions += 1
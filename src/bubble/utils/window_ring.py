@@ -0,0 +1,116 @@
+"""
+Cyclic ring of window/page ids for O(1) next/previous switching.
+
+Design goals:
+- No list materialization on the hot path (the switcher hotkey runs from the
+  CGEvent tap callback): each id maps to its [prev, next] neighbours.
+- Kept in sync incrementally on create/close; insertion order is preserved.
+- Traversal modes: next/prev, jump to the Nth entry, and skipping entries a
+  predicate rejects (e.g. suspended pages).
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterator, List, Optional
+
+SkipFn = Optional[Callable[[str], bool]]
+
+
+class WindowRing:
+    __slots__ = ("_links", "_head")
+
+    def __init__(self) -> None:
+        # id -> [prev_id, next_id]
+        self._links: Dict[str, List[str]] = {}
+        self._head: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._links)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._links
+
+    def __iter__(self) -> Iterator[str]:
+        node = self._head
+        for _ in range(len(self._links)):
+            yield node  # type: ignore[misc]
+            node = self._links[node][1]  # type: ignore[index]
+
+    @property
+    def head(self) -> Optional[str]:
+        return self._head
+
+    # ----- mutation -----
+    def add(self, item_id: str, after: Optional[str] = None) -> None:
+        """Insert `item_id` after `after` (default: at the end, i.e. before the head)."""
+        if item_id in self._links:
+            return
+        if self._head is None:
+            self._links[item_id] = [item_id, item_id]
+            self._head = item_id
+            return
+        prev_id = after if after in self._links else self._links[self._head][0]
+        next_id = self._links[prev_id][1]  # type: ignore[index]
+        self._links[item_id] = [prev_id, next_id]  # type: ignore[list-item]
+        self._links[prev_id][1] = item_id  # type: ignore[index]
+        self._links[next_id][0] = item_id
+
+    def remove(self, item_id: str) -> bool:
+        link = self._links.pop(item_id, None)
+        if link is None:
+            return False
+        prev_id, next_id = link
+        if not self._links:
+            self._head = None
+            return True
+        self._links[prev_id][1] = next_id
+        self._links[next_id][0] = prev_id
+        if self._head == item_id:
+            self._head = next_id
+        return True
+
+    def clear(self) -> None:
+        self._links.clear()
+        self._head = None
+
+    # ----- traversal -----
+    def _walk(self, start: str, direction: int, skip: SkipFn) -> Optional[str]:
+        node = self._links[start][direction]
+        for _ in range(len(self._links)):
+            if skip is None or not skip(node):
+                return node
+            node = self._links[node][direction]
+        return None
+
+    def next(self, item_id: Optional[str], skip: SkipFn = None) -> Optional[str]:
+        """Entry after `item_id`; unknown/None starts from the head. None if all are skipped."""
+        if self._head is None:
+            return None
+        if item_id not in self._links:
+            return self._head if skip is None or not skip(self._head) else self._walk(self._head, 1, skip)
+        return self._walk(item_id, 1, skip)  # type: ignore[arg-type]
+
+    def prev(self, item_id: Optional[str], skip: SkipFn = None) -> Optional[str]:
+        """Entry before `item_id`; unknown/None starts from the head. None if all are skipped."""
+        if self._head is None:
+            return None
+        if item_id not in self._links:
+            return self._head if skip is None or not skip(self._head) else self._walk(self._head, 1, skip)
+        return self._walk(item_id, 0, skip)  # type: ignore[arg-type]
+
+    def step(self, item_id: Optional[str], forward: bool = True, skip: SkipFn = None) -> Optional[str]:
+        return self.next(item_id, skip) if forward else self.prev(item_id, skip)
+
+    def nth(self, n: int) -> Optional[str]:
+        """1-based position in insertion order (negative counts from the end)."""
+        size = len(self._links)
+        if not size or n == 0 or abs(n) > size:
+            return None
+        node = self._head
+        if n > 0:
+            for _ in range(n - 1):
+                node = self._links[node][1]  # type: ignore[index]
+        else:
+            for _ in range(-n):
+                node = self._links[node][0]  # type: ignore[index]
+        return node
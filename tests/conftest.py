@@ -0,0 +1,17 @@
+import pytest
+
+
+class FakeClock:
+    """Injectable monotonic clock: call it for the time, bump `now` to advance."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_clock():
+    """Factory for fake clocks starting at `now` (tests may need more than one)."""
+    return FakeClock
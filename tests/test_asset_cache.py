@@ -0,0 +1,68 @@
+import base64
+
+from bubble.utils.asset_cache import AssetCache, mime_type
+
+
+class FakeFiles:
+    def __init__(self, files):
+        self.files = dict(files)  # rel -> bytes
+        self.versions = {rel: 1 for rel in files}
+        self.reads = []
+
+    def load(self, rel):
+        self.reads.append(rel)
+        data = self.files.get(rel)
+        return data, (f"/fs/{rel}" if data is not None else None)
+
+    def signature(self, path):
+        if path is None:
+            return None
+        rel = path[len("/fs/"):]
+        return (self.versions[rel], len(self.files[rel])) if rel in self.files else None
+
+
+def test_assets_are_read_and_encoded_once():
+    fs = FakeFiles({"assets/icons/a.png": b"PNG-A", "assets/icons/b.png": b"PNG-A", "x.css": "é{}".encode()})
+    cache = AssetCache(loader=fs.load, signature=fs.signature)
+    url = cache.data_url("assets/icons/a.png")
+    assert url == "data:image/png;base64," + base64.b64encode(b"PNG-A").decode()
+    for _ in range(3):
+        assert cache.data_url("assets/icons/a.png") is url
+    # Identical content shares one blob and one encoding
+    assert cache.data_url("assets/icons/b.png") is url
+    assert cache.digest("assets/icons/a.png") == cache.digest("assets/icons/b.png")
+    assert cache.get_text("x.css") == "é{}"
+    # Missing assets are cached as missing
+    assert cache.data_url("assets/icons/none.png") is None
+    assert cache.get_text("none.css") == ""
+    cache.data_url("assets/icons/none.png")
+    assert cache.first_available(["assets/icons/none.png", "assets/icons/b.png"]) == "assets/icons/b.png"
+    assert sorted(fs.reads) == sorted(["assets/icons/a.png", "assets/icons/b.png", "x.css",
+                                       "assets/icons/none.png", "none.css"])
+    stats = cache.stats()
+    assert (stats["reads"], stats["encodes"], stats["blobs"]) == (5, 2, 2)
+
+
+def test_changed_files_are_invalidated():
+    fs = FakeFiles({"assets/icons/a.png": b"old", "assets/icons/b.png": b"keep"})
+    cache = AssetCache(loader=fs.load, signature=fs.signature)
+    old = cache.data_url("assets/icons/a.png")
+    cache.data_url("assets/icons/b.png")
+    assert cache.refresh_changed() == []
+
+    fs.files["assets/icons/a.png"] = b"new!"
+    fs.versions["assets/icons/a.png"] += 1
+    assert cache.refresh_changed() == ["assets/icons/a.png"]
+    new = cache.data_url("assets/icons/a.png")
+    assert new != old and base64.b64decode(new.split(",", 1)[1]) == b"new!"
+    assert cache.stats()["blobs"] == 2  # the old blob was dropped
+
+    cache.invalidate("assets/icons/b.png")
+    cache.get_bytes("assets/icons/b.png")
+    assert fs.reads.count("assets/icons/b.png") == 2
+
+
+def test_mime_types():
+    assert mime_type("a/b.PNG") == "image/png"
+    assert mime_type("driver.min.js") == "application/javascript"
+    assert mime_type("blob.bin") == "application/octet-stream"
@@ -0,0 +1,39 @@
+import json
+
+from bubble.utils.backup_ring import BackupRing
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    ring = BackupRing(str(tmp_path), max_entries=3)
+    digest, stored = ring.store_bytes(b'{"a": 1}', ts=1)
+    assert stored
+    for ts in range(2, 10):
+        assert ring.store_bytes(b'{"a": 1}', ts=ts) == (digest, False)
+    assert len(ring.entries()) == 1
+    assert len(list(tmp_path.glob("platforms_backup_*.json"))) == 1
+
+
+def test_ring_prunes_and_restores_by_hash_or_time(tmp_path):
+    ring = BackupRing(str(tmp_path), max_entries=2)
+    h1, _ = ring.store_bytes(b'{"v": 1}', ts=100)
+    h2, _ = ring.store_bytes(b'{"v": 2}', ts=200)
+    h3, _ = ring.store_bytes(b'{"v": 3}', ts=300)
+
+    assert [e["hash"] for e in ring.entries()] == [h2, h3]
+    assert ring.restore(h1) is None
+    assert ring.restore(h2[:8]) == b'{"v": 2}'
+    assert ring.restore(250) == b'{"v": 2}'
+    # The index survives a restart
+    assert BackupRing(str(tmp_path)).restore(h3) == b'{"v": 3}'
+
+
+def test_latest_valid_skips_corrupted_backups(tmp_path):
+    ring = BackupRing(str(tmp_path))
+    ring.store_bytes(json.dumps({"v": 1}).encode(), ts=1)
+    ring.store_bytes(json.dumps({"v": 2}).encode(), ts=2)
+    newest = ring.entries()[-1]
+    (tmp_path / newest["file"]).write_text('{"v": 2, "truncat')
+
+    entry, data = ring.latest_valid()
+    assert data == {"v": 1}
+    assert entry["ts"] == 1
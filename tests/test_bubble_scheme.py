@@ -0,0 +1,42 @@
+from bubble.utils.asset_cache import AssetCache
+from bubble.utils.bubble_scheme import CACHE_IMMUTABLE, CACHE_REVALIDATE, asset_url, publish, resolve
+
+
+def make_cache(files):
+    return AssetCache(loader=lambda rel: (files.get(rel), None), signature=lambda path: None)
+
+
+def test_asset_urls_resolve_with_immutable_headers():
+    cache = make_cache({"assets/icons/openai.png": b"\x89PNG..."})
+    url = asset_url("assets/icons/openai.png", cache)
+    assert url.startswith("bubble://app/") and url.endswith("/assets/icons/openai.png")
+    r = resolve(url, cache)
+    assert r.status == 200 and r.body == b"\x89PNG..."
+    assert r.headers["Content-Type"] == "image/png"
+    assert r.headers["Cache-Control"] == CACHE_IMMUTABLE
+    assert r.headers["Content-Length"] == str(len(r.body))
+    # Revalidation with the current ETag
+    assert resolve(url, cache, if_none_match=r.headers["ETag"]).status == 304
+    assert asset_url("assets/icons/missing.png", cache) is None
+
+
+def test_published_content_gets_a_new_url_when_it_changes():
+    cache = make_cache({})
+    old = publish("homepage/home.css", "body{}", cache)
+    assert resolve(old, cache).headers["Content-Type"] == "text/css; charset=utf-8"
+    new = publish("homepage/home.css", "body{color:red}", cache)
+    assert new != old
+    assert resolve(new, cache).body == b"body{color:red}"
+    # An outdated digest still gets the current content, but is not pinned
+    stale = resolve(old, cache)
+    assert stale.body == b"body{color:red}" and stale.headers["Cache-Control"] == CACHE_REVALIDATE
+    # Generated content survives a packaged-asset invalidation
+    cache.invalidate()
+    assert resolve(new, cache).status == 200
+
+
+def test_bad_urls_are_not_found():
+    cache = make_cache({"a.css": b"x"})
+    for url in ("https://app/0/a.css", "bubble://other/0/a.css", "bubble://app/a.css",
+                "bubble://app/0/../a.css", "bubble://app/0/nope.css"):
+        assert resolve(url, cache).status == 404
@@ -0,0 +1,57 @@
+import json
+import os
+import time
+
+from bubble.utils.config_writer import ConfigWriter, atomic_write_json
+
+
+def test_burst_of_writes_is_coalesced_into_one(tmp_path):
+    writer = ConfigWriter(delay=0.2)
+    path = str(tmp_path / "config.json")
+    done = []
+
+    for i in range(30):
+        writer.schedule(path, {"closed": i}, on_done=done.append)
+    assert writer.flush(timeout=5)
+
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"closed": 29}
+    stats = writer.stats()
+    assert stats["writes"] == 1
+    assert stats["coalesced"] == 29
+    assert stats["pending"] == 0
+    # Every caller hears about the write that carried its snapshot
+    assert done == [True] * 30
+
+
+def test_flush_waits_for_on_done_callbacks(tmp_path):
+    writer = ConfigWriter(delay=0)
+    done = []
+
+    def slow_callback(ok):
+        time.sleep(0.2)
+        done.append(ok)
+
+    writer.schedule(str(tmp_path / "config.json"), {"v": 1}, on_done=slow_callback)
+    assert writer.flush(timeout=5)
+    assert done == [True]
+
+
+def test_pre_write_hook_sees_previous_content(tmp_path):
+    writer = ConfigWriter(delay=0)
+    path = tmp_path / "platforms.json"
+    atomic_write_json(str(path), {"v": 1})
+    seen = []
+
+    writer.schedule(str(path), {"v": 2}, pre_write=lambda: seen.append(json.loads(path.read_text())))
+    assert writer.flush(timeout=5)
+
+    assert seen == [{"v": 1}]
+    assert json.loads(path.read_text()) == {"v": 2}
+
+
+def test_atomic_write_leaves_no_temp_files(tmp_path):
+    path = tmp_path / "nested" / "config.json"
+    atomic_write_json(str(path), {"language": "zh"})
+    assert json.loads(path.read_text(encoding="utf-8")) == {"language": "zh"}
+    assert os.listdir(path.parent) == ["config.json"]
@@ -0,0 +1,12 @@
+from bubble.utils.histogram import LatencyHistogram
+
+
+def test_buckets_labels_and_percentiles_follow_the_given_bounds():
+    hist = LatencyHistogram((10.0, 100.0))
+    assert hist.percentile(50) is None and hist.average() == 0.0
+    for ms in (3.0, 10.0, 40.0, 250.0):
+        hist.add(ms)
+    assert hist.buckets() == {"<=10ms": 2, "<=100ms": 1, ">100ms": 1}
+    assert hist.percentile(50) == 10.0
+    assert hist.percentile(90) == 250.0  # open bucket reports the exact max
+    assert hist.to_dict()["avg_ms"] == 75.8 and hist.to_dict()["count"] == 4
@@ -0,0 +1,33 @@
+import pytest
+
+from bubble.components.homepage_template import CompiledTemplate, TemplateCache, slot
+
+
+def test_compiled_template_fills_slots_in_order():
+    tpl = CompiledTemplate(f"<div>{slot('rows')}</div><script>var A = {slot('flag')}; var B = {slot('flag')};</script>")
+    assert tpl.slots == ("rows", "flag", "flag")
+    assert tpl.render(rows="<p>x</p>", flag="true") == "<div><p>x</p></div><script>var A = true; var B = true;</script>"
+    with pytest.raises(KeyError):
+        tpl.render(rows="")
+    assert CompiledTemplate("static").render() == "static"
+
+
+def test_template_cache_compiles_once_per_language_and_appearance():
+    builds = []
+
+    def build(language, appearance):
+        builds.append((language, appearance))
+        return f"<html lang='{language}' data-theme='{appearance}'>{slot('rows')}</html>"
+
+    cache = TemplateCache(build)
+    for _ in range(3):
+        assert cache.get("en", "light").render(rows="r") == "<html lang='en' data-theme='light'>r</html>"
+    cache.get("en", "dark")
+    cache.get("zh", "light")
+    assert builds == [("en", "light"), ("en", "dark"), ("zh", "light")]
+    assert cache.stats() == {"compiled": 3, "hits": 2, "misses": 3}
+
+    assert cache.invalidate("en") == 2 and len(cache) == 1
+    assert cache.invalidate() == 1
+    cache.get("zh", "light")
+    assert builds[-1] == ("zh", "light") and len(builds) == 4
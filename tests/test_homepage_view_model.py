@@ -0,0 +1,59 @@
+from bubble.models.homepage_view_model import HomepageViewModel, count_label, row_state
+
+
+def _rows(**overrides):
+    rows = {
+        "openai": row_state(True, [{"id": "a", "idx": 1}], "icon-openai", default=True),
+        "claude": row_state(False, [], "icon-claude"),
+    }
+    rows.update(overrides)
+    return rows
+
+
+def test_diff_without_baseline_requires_full_render():
+    vm = HomepageViewModel()
+    assert vm.diff(_rows()) is None
+    version = vm.reset(_rows())
+    assert vm.has_baseline() and version == vm.version == 1
+    vm.invalidate()
+    assert vm.diff(_rows()) is None
+
+
+def test_diff_sends_only_changed_fields_and_advances_version():
+    vm = HomepageViewModel()
+    vm.reset(_rows())
+    assert vm.diff(_rows()) == {"base": 1, "version": 1, "rows": {}}
+
+    windows = [{"id": "a", "idx": 1}, {"id": "b", "idx": 2}]
+    patch = vm.diff(_rows(openai=row_state(True, windows, "icon-openai", default=True)))
+    assert patch == {"base": 1, "version": 2, "rows": {"openai": {"windows": windows, "count": 2}}}
+
+    # 基线已前移：同样的状态不再产生补丁
+    assert vm.diff(_rows(openai=row_state(True, windows, "icon-openai", default=True)))["rows"] == {}
+    patch = vm.diff(_rows(claude=row_state(True, [], "icon-claude", default=True),
+                          openai=row_state(True, windows, "icon-openai")))
+    assert patch["base"] == 2 and patch["version"] == 3
+    assert patch["rows"] == {"claude": {"active": True, "default": True}, "openai": {"default": False}}
+
+
+def test_forced_rows_resend_optimistic_fields():
+    vm = HomepageViewModel()
+    vm.reset(_rows())
+    patch = vm.diff(_rows(), force=["claude"])
+    assert patch["rows"] == {"claude": {"active": False, "windows": [], "count": 0}}
+    assert patch["version"] == 2
+
+
+def test_row_set_change_or_oversized_patch_falls_back():
+    vm = HomepageViewModel(max_patch_bytes=200)
+    vm.reset(_rows())
+    assert vm.diff({"openai": _rows()["openai"]}) is None
+    assert vm.diff(_rows(claude=row_state(False, [], "x" * 500))) is None
+    # 回退时基线不变，之后的小补丁仍基于原版本
+    patch = vm.diff(_rows(claude=row_state(True, [], "icon-claude")))
+    assert patch == {"base": 1, "version": 2, "rows": {"claude": {"active": True}}}
+    assert vm.stats()["fallbacks"] == 2 and vm.stats()["patches"] == 1
+
+
+def test_count_label_caps_at_nine():
+    assert [count_label(n) for n in (0, 1, 9, 10, 12)] == ["0", "1", "9", "9+", "9+"]
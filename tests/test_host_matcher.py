@@ -0,0 +1,37 @@
+from bubble.utils.host_matcher import HostMatcher, domain_rule, registrable_domain
+
+
+def test_rules_match_exact_wildcard_and_domain():
+    m = HostMatcher(["chat.example.com", "*.cdn.net", ".openai.com", "Kimi.Moonshot.CN."])
+    assert m.allows("chat.example.com") and not m.allows("example.com")
+    assert not m.allows("x.chat.example.com")
+    assert m.allows("img.cdn.net") and m.allows("a.b.cdn.net") and not m.allows("cdn.net")
+    assert m.allows("openai.com") and m.allows("files.openai.com")
+    assert not m.allows("notopenai.com") and not m.allows("openai.com.evil.io")
+    assert m.allows("KIMI.moonshot.cn")
+    # Requests without a host (about:blank, data:) are not blocked
+    assert m.allows(None) and m.allows("")
+    assert HostMatcher().allows("anything.example")
+
+
+def test_registrable_domain_and_domain_rule():
+    assert registrable_domain("chat.openai.com") == "openai.com"
+    assert registrable_domain("a.b.example.co.uk") == "example.co.uk"
+    assert registrable_domain("localhost") == "localhost"
+    assert registrable_domain("10.0.0.1") == "10.0.0.1"
+    assert domain_rule("chat.deepseek.com") == ".deepseek.com"
+    assert HostMatcher([domain_rule("chat.deepseek.com")]).allows("cdn.deepseek.com")
+
+
+def test_decisions_are_cached_and_counted():
+    m = HostMatcher([".example.com"], cache_size=2)
+    for host in ("a.example.com", "a.example.com", "evil.io", "evil.io", "b.example.com", "tracker.io"):
+        m.allows(host)
+    stats = m.stats()
+    assert (stats["allowed"], stats["denied"]) == (3, 3)
+    assert (stats["cache_hits"], stats["cache_misses"]) == (2, 4)
+    assert stats["cached_hosts"] == 2
+    assert stats["top_denied"] == [("evil.io", 2), ("tracker.io", 1)]
+    # Adding a rule invalidates cached decisions
+    m.add_rule("evil.io")
+    assert m.allows("evil.io") and m.rules == (".example.com", "evil.io")
@@ -0,0 +1,68 @@
+from bubble.utils.load_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_FOREGROUND,
+    PRIORITY_RECENT,
+    LoadScheduler,
+)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.started = []
+
+    def __call__(self, webview, url):
+        self.started.append((webview, url))
+
+
+def test_caps_concurrency_and_orders_by_priority(fake_clock):
+    clock, driver = fake_clock(100.0), FakeDriver()
+    sched = LoadScheduler(start=driver, max_concurrent=2, clock=clock)
+    views = {k: object() for k in "abcde"}
+    sched.request("a", views["a"], "https://a", PRIORITY_BACKGROUND)
+    sched.request("b", views["b"], "https://b", PRIORITY_BACKGROUND)
+    sched.request("c", views["c"], "https://c", PRIORITY_BACKGROUND)
+    sched.request("d", views["d"], "https://d", PRIORITY_RECENT)
+    sched.request("e", views["e"], "https://e", PRIORITY_BACKGROUND)
+    assert [u for _, u in driver.started] == ["https://a", "https://b"]
+    assert sched.queue_depth() == 3 and sched.in_flight_count() == 2
+
+    # The user switches to "e": it jumps ahead of the recent page
+    clock.now += 2
+    assert sched.promote("e", PRIORITY_FOREGROUND)
+    assert not sched.promote("a")
+    assert sched.finished(views["a"])
+    assert not sched.finished(views["a"])
+    assert driver.started[-1][1] == "https://e"
+    assert sched.failed(views["b"])
+    assert driver.started[-1][1] == "https://d"
+
+    clock.now += 1
+    sched.cancel("c")
+    sched.finished(views["e"])
+    sched.finished(views["d"])
+    stats = sched.stats()
+    assert stats["queued"] == 0 and stats["in_flight"] == 0
+    assert (stats["started"], stats["completed"], stats["failed"], stats["cancelled"]) == (4, 3, 1, 1)
+    assert stats["max_wait_ms"] == 2000.0
+    assert stats["avg_wait_ms"] == 1000.0
+
+
+def test_timeouts_release_slots_and_reloads_replace_requests(fake_clock):
+    clock, driver = fake_clock(100.0), FakeDriver()
+    sched = LoadScheduler(start=driver, max_concurrent=1, timeout=10, clock=clock)
+    wv1, wv2 = object(), object()
+    sched.request("p1", wv1, "https://one")
+    sched.request("p2", wv2, "https://two")
+    assert sched.next_timeout() == 110.0
+    assert sched.expire(109.0) == []
+    clock.now = 110.0
+    assert sched.expire() == ["p1"]
+    assert sched.is_loading("p2") and sched.stats()["timed_out"] == 1
+    # A late didFinish for the expired load is ignored
+    assert not sched.finished(wv1)
+
+    # A new request for a loading page supersedes it in the same slot
+    sched.request("p2", wv2, "https://two/again")
+    assert driver.started[-1] == (wv2, "https://two/again")
+    assert sched.in_flight_count() == 1
+    assert sched.finished(wv2) and sched.in_flight_count() == 0
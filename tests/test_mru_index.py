@@ -0,0 +1,40 @@
+from bubble.utils.mru_index import MRUIndex
+
+
+def test_most_recent_follows_activation_not_creation():
+    mru = MRUIndex()
+    mru.add("a1", "openai")
+    mru.add("a2", "openai")
+    mru.add("c1", "claude")
+    mru.touch("a1")
+    mru.touch("c1")
+    assert mru.most_recent("openai") == "a1"
+    assert mru.most_recent() == "c1"
+    assert mru.previous() == "a1"
+    assert mru.least_recent() == "a2"
+    assert list(mru.iter_recent()) == ["c1", "a1", "a2"]
+
+
+def test_background_pages_enter_at_least_recent_end():
+    mru = MRUIndex()
+    mru.add("a1", "openai", used=True)
+    mru.add("a2", "openai")
+    assert mru.most_recent("openai") == "a1"
+    assert mru.least_recent("openai") == "a2"
+    mru.add("a2", "openai", used=True)
+    assert mru.most_recent("openai") == "a2"
+
+
+def test_remove_falls_back_to_previous_page_of_platform():
+    mru = MRUIndex()
+    for wid in ("a1", "a2", "a3"):
+        mru.add(wid, "openai", used=True)
+    assert mru.remove("a3")
+    assert mru.most_recent("openai") == "a2"
+    assert not mru.remove("a3")
+    assert not mru.touch("a3")
+    mru.remove("a1")
+    mru.remove("a2")
+    assert len(mru) == 0
+    assert mru.most_recent("openai") is None and mru.previous() is None
+    assert mru.group_of("a1") is None
@@ -0,0 +1,69 @@
+import json
+
+from bubble.utils.nav_metrics import KIND_LOAD, KIND_RESUME, NavMetrics
+
+
+def test_records_commit_and_finish_per_platform_and_kind(tmp_path, fake_clock):
+    clock = fake_clock()
+    metrics = NavMetrics(clock=clock)
+
+    metrics.start("p1", "openai")
+    clock.now += 0.2
+    metrics.commit("p1")
+    clock.now += 0.2
+    metrics.commit("p1")  # only the first commit counts
+    clock.now += 1.1
+    rec = metrics.finish("p1")
+    assert rec["kind"] == KIND_LOAD and not rec["failed"]
+
+    metrics.expect("p1", KIND_RESUME)
+    metrics.start("p1", "openai")
+    clock.now += 3.0
+    metrics.fail("p1")
+    metrics.start("p2", "kimi")
+    metrics.commit("p2")
+    clock.now += 0.05
+    metrics.finish("p2")
+    assert metrics.finish("p2") is None  # no navigation in flight
+    metrics.finish("home")
+
+    summary = metrics.summary()
+    load = summary["openai"][KIND_LOAD]
+    assert load["time_to_commit"]["count"] == 1 and load["time_to_commit"]["p50_ms"] == 250.0
+    assert load["time_to_finish"]["max_ms"] == 1500.0
+    assert load["time_to_finish"]["buckets"]["<=2000ms"] == 1
+    assert summary["openai"][KIND_RESUME] == {
+        "failures": 1,
+        "time_to_commit": metrics.histogram("openai", KIND_RESUME, "commit").to_dict(),
+        "time_to_finish": metrics.histogram("openai", KIND_RESUME).to_dict(),
+    }
+    assert summary["kimi"][KIND_LOAD]["time_to_finish"]["buckets"]["<=100ms"] == 1
+    assert metrics.last("p1")["failed"] is True
+
+    dumped = json.loads(open(metrics.dump(str(tmp_path / "out" / "nav.json")), encoding="utf-8").read())
+    assert [r["page_id"] for r in dumped["recent"]] == ["p1", "p1", "p2"]
+    assert dumped["recent"][0]["commit_ms"] == 200.0 and dumped["recent"][0]["finish_ms"] == 1500.0
+    metrics.forget("p1")
+    assert metrics.last("p1") is None and "openai" in metrics.summary()
+
+
+def test_ignored_navigations_are_not_recorded(fake_clock):
+    clock = fake_clock()
+    metrics = NavMetrics(clock=clock)
+
+    # A suspend stops the in-flight load and shows a blank page: neither counts
+    metrics.start("p1", "openai")
+    metrics.ignore("p1")
+    assert metrics.fail("p1") is None
+    metrics.start("p1", "openai")
+    clock.now += 0.01
+    assert metrics.finish("p1") is None
+    assert metrics.summary() == {}
+
+    # The resume after it is recorded again
+    metrics.ignore("p1")
+    metrics.expect("p1", KIND_RESUME)
+    metrics.start("p1", "openai")
+    clock.now += 0.3
+    assert metrics.finish("p1")["kind"] == KIND_RESUME
+    assert metrics.histogram("openai", KIND_RESUME).count == 1
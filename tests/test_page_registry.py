@@ -0,0 +1,65 @@
+from bubble.models.page_registry import PageRegistry, PAGE_ADDED, PAGE_REMOVED, PAGE_RENAMED, PAGE_ACTIVATED
+
+
+def test_registry_indexes_follow_mutations():
+    pages = PageRegistry()
+    pages.add("a1", "openai", view="wv-a1")
+    pages.add("k1", "kimi")
+    pages.add("a2", "openai")
+    assert pages.grouped() == {"openai": ["a1", "a2"], "kimi": ["k1"]}
+    assert pages.count("openai") == 2 and len(pages) == 3
+    assert pages.view("a1") == "wv-a1" and pages.view("missing") is None
+    assert pages.platform_of("k1") == "kimi"
+
+    # Order ring follows creation; MRU follows activation
+    assert pages.step("a1") == "k1" and pages.nth(-1) == "a2"
+    pages.activate("a2")
+    pages.activate("a1")
+    assert pages.most_recent("openai") == "a1"
+    assert pages.previous() == "a2"
+
+    pages.remove("a1")
+    assert pages.most_recent("openai") == "a2"
+    assert pages.step("a2") == "k1"
+    pages.remove("k1")
+    assert pages.grouped() == {"openai": ["a2"]}
+    assert pages.remove("k1") is None
+
+
+def test_registry_emits_one_event_per_mutation():
+    pages = PageRegistry()
+    seen = []
+    unsubscribe = pages.subscribe(lambda event, rec: seen.append((event, rec.page_id, rec.restored)))
+
+    def broken(event, rec):
+        raise RuntimeError("listener failure must not break the registry")
+    pages.subscribe(broken)
+
+    pages.add("a1", "openai")
+    pages.add("a1", "openai")  # duplicate: no event
+    pages.add("r1", "openai", restored=True)
+    pages.activate("a1")
+    pages.rename("a1", "Draft")
+    pages.rename("a1", "Draft")  # unchanged: no event
+    pages.remove("a1")
+    assert seen == [
+        (PAGE_ADDED, "a1", False),
+        (PAGE_ADDED, "r1", True),
+        (PAGE_ACTIVATED, "a1", False),
+        (PAGE_RENAMED, "a1", False),
+        (PAGE_REMOVED, "a1", False),
+    ]
+    unsubscribe()
+    pages.remove("r1")
+    assert len(seen) == 5
+
+
+def test_registry_finds_page_by_view():
+    reg = PageRegistry()
+    view = object()
+    reg.add("p1", "openai", view)
+    reg.add("p2", "kimi")  # dormant: no view yet
+    assert reg.find_by_view(view).page_id == "p1"
+    assert reg.find_by_view(None) is None and reg.find_by_view(object()) is None
+    reg.get("p1").view = None
+    assert reg.find_by_view(view) is None
@@ -70,3 +70,90 @@ def test_format_launcher_hotkey_default(monkeypatch):
     LAUNCHER_TRIGGER["key"] = 5
     hotkey = delegate._format_launcher_hotkey()
     assert hotkey.lower() in ("⌘+g", "⌘+5", "⌘+g")
+
+
+def test_config_reads_are_cached_until_file_changes(tmp_path, monkeypatch):
+    from bubble.components.config_manager import ConfigManager
+
+    monkeypatch.setattr(ConfigManager, "_new_app_support_dir", classmethod(lambda cls: str(tmp_path / "new")))
+    monkeypatch.setattr(ConfigManager, "_old_app_support_dir", classmethod(lambda cls: str(tmp_path / "old")))
+    ConfigManager.invalidate_cache()
+
+    ConfigManager.set_allowed_hosts(["example.com"])
+    before = ConfigManager.cache_stats()
+    for _ in range(50):
+        assert ConfigManager.get_allowed_hosts() == ["example.com"]
+    after = ConfigManager.cache_stats()
+    # Our own save primes the cache, so repeated reads never re-parse
+    assert after["misses"] == before["misses"]
+    assert after["hits"] - before["hits"] == 50
+
+    # Views are read-only; load() hands out private mutable copies
+    with pytest.raises(TypeError):
+        ConfigManager.view()["language"] = "fr"
+    cfg = ConfigManager.load()
+    cfg["navigation"]["allow_hosts"].append("evil.com")
+    assert ConfigManager.get_allowed_hosts() == ["example.com"]
+
+    # An external write changes the stat signature and is picked up
+    assert ConfigManager.flush()
+    with open(ConfigManager.config_path(), "w", encoding="utf-8") as f:
+        f.write('{"language": "ko", "navigation": {"allow_hosts": ["a.com", "b.com"]}}')
+    assert ConfigManager.get_allowed_hosts() == ["a.com", "b.com"]
+    assert ConfigManager.get_language() == "ko"
+    assert ConfigManager.cache_stats()["misses"] == after["misses"] + 1
+
+
+def test_live_budget_round_trips_next_to_suspend_minutes(tmp_path, monkeypatch):
+    from bubble.components.config_manager import ConfigManager
+
+    monkeypatch.setattr(ConfigManager, "_new_app_support_dir", classmethod(lambda cls: str(tmp_path / "new")))
+    monkeypatch.setattr(ConfigManager, "_old_app_support_dir", classmethod(lambda cls: str(tmp_path / "old")))
+    ConfigManager.invalidate_cache()
+
+    assert ConfigManager.get_live_budget() == {"max_live": 0, "memory_mb": 0}
+    ConfigManager.set_suspend_minutes(20)
+    ConfigManager.set_live_budget(max_live=8, memory_mb=-5)
+    assert ConfigManager.get_live_budget() == {"max_live": 8, "memory_mb": 0}
+    assert ConfigManager.get_suspend_minutes() == 20
+    assert ConfigManager.get_live_budget() == {"max_live": 8, "memory_mb": 0}
+    ConfigManager.flush()
+
+
+def test_deep_suspend_minutes_default_and_round_trip(tmp_path, monkeypatch):
+    from bubble.components.config_manager import ConfigManager
+
+    monkeypatch.setattr(ConfigManager, "_new_app_support_dir", classmethod(lambda cls: str(tmp_path / "new")))
+    monkeypatch.setattr(ConfigManager, "_old_app_support_dir", classmethod(lambda cls: str(tmp_path / "old")))
+    ConfigManager.invalidate_cache()
+
+    assert ConfigManager.get_deep_suspend_minutes() == 60
+    ConfigManager.set_deep_suspend_minutes(0)
+    assert ConfigManager.get_deep_suspend_minutes() == 0
+    ConfigManager.flush()
+
+
+def test_warmup_restored_defaults_off_and_round_trips(tmp_path, monkeypatch):
+    from bubble.components.config_manager import ConfigManager
+
+    monkeypatch.setattr(ConfigManager, "_new_app_support_dir", classmethod(lambda cls: str(tmp_path / "new")))
+    monkeypatch.setattr(ConfigManager, "_old_app_support_dir", classmethod(lambda cls: str(tmp_path / "old")))
+    ConfigManager.invalidate_cache()
+
+    assert ConfigManager.get_warmup_restored() is False
+    ConfigManager.set_warmup_restored(True)
+    assert ConfigManager.get_warmup_restored() is True
+    ConfigManager.flush()
+
+
+def test_webview_pool_size_defaults_to_one_and_round_trips(tmp_path, monkeypatch):
+    from bubble.components.config_manager import ConfigManager
+
+    monkeypatch.setattr(ConfigManager, "_new_app_support_dir", classmethod(lambda cls: str(tmp_path / "new")))
+    monkeypatch.setattr(ConfigManager, "_old_app_support_dir", classmethod(lambda cls: str(tmp_path / "old")))
+    ConfigManager.invalidate_cache()
+
+    assert ConfigManager.get_webview_pool_size() == 1
+    ConfigManager.set_webview_pool_size(3)
+    assert ConfigManager.get_webview_pool_size() == 3
+    ConfigManager.flush()
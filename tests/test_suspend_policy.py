@@ -0,0 +1,189 @@
+from bubble.utils.suspend_policy import SuspendPolicy
+
+
+def test_deadlines_follow_activity_and_pop_on_time(fake_clock):
+    clock = fake_clock(1000.0)
+    policy = SuspendPolicy(1, clock=clock)
+    assert policy.next_deadline() is None
+    policy.note_window_activity("a")
+    clock.now += 10
+    policy.note_window_activity("b")
+    assert policy.next_deadline() == 1060.0
+
+    # Activity on "a" invalidates its old entry lazily
+    clock.now += 20
+    policy.note_window_activity("a")
+    assert policy.next_deadline() == 1070.0
+    assert policy.pop_due(1069.9) == []
+    assert policy.pop_due(1070.0) == ["b"]
+    policy.mark_suspended("b")
+    assert policy.is_suspended("b")
+    assert policy.next_deadline() == 1090.0
+
+    # Popped-but-kept windows stay unscheduled until their next activity
+    assert policy.pop_due(2000.0) == ["a"]
+    assert policy.next_deadline() is None
+    policy.mark_resumed("b")
+    assert policy.next_deadline() == clock.now + 60
+
+
+def test_timeout_changes_and_forget_reschedule_the_heap(fake_clock):
+    clock = fake_clock(1000.0)
+    policy = SuspendPolicy(10, clock=clock)
+    policy.note_window_activity("a")
+    policy.note_window_activity("b")
+    policy.set_timeout_minutes(1)
+    assert policy.next_deadline() == 1060.0
+    policy.forget("a")
+    assert policy.pop_due(5000.0) == ["b"]
+    policy.set_timeout_minutes(0)
+    policy.note_window_activity("c")
+    assert policy.next_deadline() is None and not policy.should_suspend("c")
+
+
+def test_heap_stays_bounded_under_frequent_activity(fake_clock):
+    clock = fake_clock(1000.0)
+    policy = SuspendPolicy(1, clock=clock)
+    for _ in range(1000):
+        clock.now += 0.01
+        policy.note_window_activity("busy")
+    assert len(policy._heap) <= 2 * 1 + 32
+    assert policy.pop_due(clock.now + 59) == []
+    assert policy.pop_due(clock.now + 60) == ["busy"]
+
+
+def test_live_budget_evicts_least_recent_background_window(fake_clock):
+    clock = fake_clock(1000.0)
+    policy = SuspendPolicy(None, clock=clock)
+    policy.set_live_budget(max_live=2)
+    for wid in ("a", "b", "c"):
+        clock.now += 1
+        policy.note_window_activity(wid)
+    # "a" is least recent but in the foreground, so "b" goes instead
+    assert policy.pick_evictions(foreground="a") == ["b"]
+    assert policy.pick_evictions() == ["a"]
+    policy.mark_suspended("b")
+    assert policy.live_window_ids() == ["a", "c"]
+    assert policy.pick_evictions() == []
+
+    # Resuming brings it back as most recent and pushes the budget over again
+    policy.mark_resumed("b")
+    assert policy.pick_evictions(foreground="b") == ["a"]
+
+
+def test_memory_budget_uses_per_window_costs(fake_clock):
+    policy = SuspendPolicy(None, clock=fake_clock(1000.0))
+    policy.set_live_budget(memory_mb=500)
+    for wid in ("a", "b", "c"):
+        policy.note_window_activity(wid)
+    assert policy.estimated_live_mb() == 450
+    assert policy.pick_evictions() == []
+    policy.set_window_cost("c", 300)
+    assert policy.pick_evictions(foreground="c") == ["a"]
+    policy.forget("c")
+    assert policy.estimated_live_mb() == 300
+    policy.set_live_budget(0, None)
+    assert policy.get_live_budget() == (None, None)
+
+
+class FakeWebView:
+    def __init__(self, url):
+        self.url_str = url
+        self.loaded = []
+
+    def URL(self):
+        return self.url_str
+
+    def stopLoading(self):
+        pass
+
+    def loadHTMLString_baseURL_(self, html, base):
+        self.url_str = "about:blank"
+
+    def evaluateJavaScript_completionHandler_(self, script, handler):
+        if handler is not None:
+            handler([0, 420], None)
+
+
+class FakeHolder:
+    def __init__(self):
+        self.data = {}
+
+    def set_session_data(self, key, value):
+        self.data[key] = value
+
+    def get_session_data(self, key, default=None):
+        return self.data.get(key, default)
+
+
+def test_light_suspend_escalates_to_deep_and_wakes_with_a_new_view(fake_clock):
+    from bubble.utils.suspend_policy import (
+        LAST_URL_KEY, TIER_DEEP, TIER_LIGHT, TIER_LIVE, SuspendHost,
+        advance_tier, scroll_restore_script, wake_window,
+    )
+
+    clock = fake_clock(1000.0)
+    policy = SuspendPolicy(1, clock=clock, deep_minutes=5)
+    views = {"a": FakeWebView("https://chat.example/c/1"), "b": FakeWebView("https://chat.example/c/2")}
+    holders = {"a": FakeHolder(), "b": FakeHolder()}
+    recreated = []
+
+    def recreate(wid, url):
+        recreated.append((wid, url))
+        views[wid] = FakeWebView(url)
+        return views[wid]
+
+    suspended = []
+    host = SuspendHost(views.get, holders.get, lambda wid: views.pop(wid, None), recreate,
+                       before_suspend=suspended.append)
+    policy.note_window_activity("a")
+    policy.note_window_activity("b")
+
+    clock.now += 60
+    for wid in policy.pop_due():
+        advance_tier(policy, wid, host, foreground="b")
+    assert policy.tier("a") == TIER_LIGHT and policy.tier("b") == TIER_LIVE
+    assert holders["a"].data[LAST_URL_KEY] == "https://chat.example/c/1"
+    assert views["a"].URL() == "about:blank"
+    assert suspended == ["a"]
+
+    # Light suspension escalates after the deep timeout; the view is released
+    clock.now += 300
+    assert policy.pop_due() == ["b", "a"]
+    assert advance_tier(policy, "b", host, foreground="b") == TIER_LIVE
+    assert advance_tier(policy, "a", host, foreground="b") == TIER_DEEP
+    assert "a" not in views and policy.live_window_ids() == ["b"]
+    assert suspended == ["a", "a"]
+
+    wv = wake_window(policy, "a", host)
+    assert recreated == [("a", "https://chat.example/c/1")] and wv is views["a"]
+    assert policy.tier("a") == TIER_LIVE
+    assert scroll_restore_script(holders["a"]) == "window.scrollTo(0.0, 420.0);"
+    assert scroll_restore_script(holders["a"]) is None
+
+    # Budget evictions can go straight to deep; a vanished window is forgotten
+    assert advance_tier(policy, "b", host, deep=True) == TIER_DEEP
+    assert holders["b"].data[LAST_URL_KEY] == "https://chat.example/c/2"
+    del holders["a"]
+    assert advance_tier(policy, "a", host) == TIER_LIVE
+    assert "a" not in policy.live_window_ids()
+
+
+def test_live_capacity_gates_background_warmup(fake_clock):
+    from bubble.utils.suspend_policy import TIER_DEEP
+
+    policy = SuspendPolicy(None, clock=fake_clock(1000.0))
+    policy.set_live_budget(max_live=2)
+    # Dormant restored pages are registered deep-suspended and do not count
+    for wid in ("r1", "r2", "r3"):
+        policy.mark_suspended(wid, deep=True)
+    assert policy.tier("r3") == TIER_DEEP and policy.live_window_ids() == []
+    assert policy.has_live_capacity("r1")
+    policy.mark_resumed("r1")
+    policy.mark_resumed("r2")
+    assert not policy.has_live_capacity("r3")
+    assert policy.has_live_capacity("r2")
+
+    policy.set_live_budget(memory_mb=400)
+    policy.set_window_cost("r3", 50)
+    assert policy.has_live_capacity("r3") and not policy.has_live_capacity()
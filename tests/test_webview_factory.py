@@ -0,0 +1,165 @@
+def test_process_pool_strategy_per_platform():
+    from bubble.components.webview_factory import (
+        PROCESS_POOL_ISOLATED, PROCESS_POOL_PER_PLATFORM, WebViewFactory,
+    )
+
+    made = []
+    factory = WebViewFactory(platform_strategies={"kimi": PROCESS_POOL_PER_PLATFORM, "bad": "nope"},
+                             new_process_pool=lambda: made.append(object()) or made[-1])
+    assert factory.strategy_for("bad") == "shared"
+    shared = factory.process_pool("openai", "p1")
+    assert factory.process_pool("qwen", "p2") is shared
+    kimi = factory.process_pool("kimi", "p3")
+    assert kimi is not shared and factory.process_pool("kimi", "p4") is kimi
+
+    factory.set_strategy(PROCESS_POOL_ISOLATED, "openai")
+    a, b = factory.process_pool("openai", "p5"), factory.process_pool("openai", "p6")
+    assert a is not b and factory.process_pool("openai", "p5") is a
+    # Pre-built pool views carry no page yet and fall back to the shared pool
+    assert factory.pool_key() == "*" and factory.pool_key("openai") == "platform:openai"
+    assert factory.process_pool_count() == 4
+    factory.release("p5")
+    assert factory.process_pool_count() == 3 and factory.process_pool("openai", "p5") is not a
+
+    factory.set_strategy(None, "openai")
+    assert factory.process_pool("openai", "p7") is shared
+
+
+def test_process_pool_strategy_round_trips_through_config(tmp_path, monkeypatch):
+    from bubble.components.config_manager import ConfigManager
+    from bubble.components.webview_factory import WebViewFactory
+
+    monkeypatch.setattr(ConfigManager, "_new_app_support_dir", classmethod(lambda cls: str(tmp_path / "new")))
+    monkeypatch.setattr(ConfigManager, "_old_app_support_dir", classmethod(lambda cls: str(tmp_path / "old")))
+    ConfigManager.invalidate_cache()
+
+    assert ConfigManager.get_process_pool_strategy() == {"default": "shared", "platforms": {}}
+    ConfigManager.set_process_pool_strategy("platform")
+    ConfigManager.set_process_pool_strategy("isolated", "openai")
+    ConfigManager.set_process_pool_strategy("isolated", "kimi")
+    ConfigManager.set_process_pool_strategy(None, "kimi")
+    assert ConfigManager.get_process_pool_strategy() == {"default": "platform", "platforms": {"openai": "isolated"}}
+
+    factory = WebViewFactory.from_config()
+    assert factory.strategy_for("openai") == "isolated" and factory.strategy_for("qwen") == "platform"
+    ConfigManager.flush()
+
+
+def test_platform_scripts_skip_pooled_views_and_disabled_platforms(tmp_path, monkeypatch):
+    from bubble.components.config_manager import ConfigManager
+    from bubble.components.webview_factory import POINTER_EVENTS_FIX_JS, WebViewFactory
+
+    monkeypatch.setattr(ConfigManager, "_new_app_support_dir", classmethod(lambda cls: str(tmp_path / "new")))
+    monkeypatch.setattr(ConfigManager, "_old_app_support_dir", classmethod(lambda cls: str(tmp_path / "old")))
+    ConfigManager.invalidate_cache()
+    ConfigManager.set_pointer_fix_enabled(False, "kimi")
+    assert ConfigManager.get_pointer_fix_enabled("openai") and not ConfigManager.get_pointer_fix_enabled("kimi")
+
+    factory = WebViewFactory.from_config()
+    factory.add_user_script("console.log('all')")
+    sources = lambda scripts: [s[0] for s in scripts]  # noqa: E731
+    # A pre-built view has no platform yet: only unrestricted scripts
+    assert sources(factory.user_scripts()) == ["console.log('all')"]
+    assert sources(factory.user_scripts("openai")) == [POINTER_EVENTS_FIX_JS, "console.log('all')"]
+    assert sources(factory.user_scripts("openai", platform_only=True)) == [POINTER_EVENTS_FIX_JS]
+    assert sources(factory.user_scripts("kimi")) == ["console.log('all')"]
+
+    ConfigManager.set_pointer_fix_enabled(None, "kimi")
+    ConfigManager.set_pointer_fix_enabled(False)
+    assert not ConfigManager.get_pointer_fix_enabled("openai")
+    assert factory.user_scripts("kimi", platform_only=True) == []
+    ConfigManager.flush()
+
+
+def test_pointer_fix_survives_unreadable_pool_strategy(tmp_path, monkeypatch):
+    from bubble.components.config_manager import ConfigManager
+    from bubble.components.webview_factory import POINTER_EVENTS_FIX_JS, WebViewFactory
+
+    monkeypatch.setattr(ConfigManager, "_new_app_support_dir", classmethod(lambda cls: str(tmp_path / "new")))
+    monkeypatch.setattr(ConfigManager, "_old_app_support_dir", classmethod(lambda cls: str(tmp_path / "old")))
+    ConfigManager.invalidate_cache()
+
+    def broken():
+        raise ValueError("bad config")
+
+    monkeypatch.setattr(ConfigManager, "get_process_pool_strategy", staticmethod(broken))
+    factory = WebViewFactory.from_config()
+    assert factory.strategy_for("openai") == "shared"
+    assert [s[0] for s in factory.user_scripts("openai", platform_only=True)] == [POINTER_EVENTS_FIX_JS]
+
+
+class _FakeScript:
+    def __init__(self, source):
+        self._source = source
+
+    def source(self):
+        return self._source
+
+
+class _FakeController:
+    def __init__(self):
+        self.scripts = []
+
+    def userScripts(self):
+        return list(self.scripts)
+
+    def removeAllUserScripts(self):
+        self.scripts = []
+
+    def addUserScript_(self, script):
+        self.scripts.append(script)
+
+    def addContentRuleList_(self, rule_list):
+        pass
+
+
+class _FakeConfiguration:
+    def __init__(self):
+        self.controller = _FakeController()
+
+    def preferences(self):
+        return self
+
+    def setJavaScriptCanOpenWindowsAutomatically_(self, flag):
+        pass
+
+    def setProcessPool_(self, pool):
+        pass
+
+    def userContentController(self):
+        return self.controller
+
+
+def test_main_webview_config_swaps_platform_scripts_per_load(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+    from bubble.components import webview_factory
+    from bubble.components.config_manager import ConfigManager
+    from bubble.components.webview_factory import POINTER_EVENTS_FIX_JS, WebViewFactory
+
+    monkeypatch.setattr(ConfigManager, "_new_app_support_dir", classmethod(lambda cls: str(tmp_path / "new")))
+    monkeypatch.setattr(ConfigManager, "_old_app_support_dir", classmethod(lambda cls: str(tmp_path / "old")))
+    ConfigManager.invalidate_cache()
+    ConfigManager.set_pointer_fix_enabled(False, "kimi")
+    monkeypatch.setattr(webview_factory, "WKWebViewConfiguration", SimpleNamespace(alloc=lambda: SimpleNamespace(init=_FakeConfiguration)))
+    monkeypatch.setattr(webview_factory, "WKUserScript", SimpleNamespace(
+        alloc=lambda: SimpleNamespace(initWithSource_injectionTime_forMainFrameOnly_=lambda src, when, main: _FakeScript(src))))
+
+    factory = WebViewFactory.from_config()
+    factory.add_user_script("console.log('all')")
+    # The main window's webview is built from the factory config before any platform is known
+    config = factory.configuration()
+    config.controller.addUserScript_(_FakeScript("host script"))
+    webview = SimpleNamespace(configuration=lambda: config)
+    sources = lambda: [s.source() for s in config.controller.scripts]  # noqa: E731
+    assert sources() == ["console.log('all')", "host script"]
+
+    factory.retarget_platform_scripts(webview, "openai")
+    assert sources() == ["console.log('all')", "host script", POINTER_EVENTS_FIX_JS]
+    factory.retarget_platform_scripts(webview, "openai")
+    assert sources().count(POINTER_EVENTS_FIX_JS) == 1
+    factory.retarget_platform_scripts(webview, "kimi")
+    assert POINTER_EVENTS_FIX_JS not in sources()
+    factory.retarget_platform_scripts(webview, "qwen")
+    factory.retarget_platform_scripts(webview, None)  # homepage
+    assert sources() == ["console.log('all')", "host script"]
+    ConfigManager.flush()
@@ -0,0 +1,52 @@
+from bubble.utils.webview_pool import WebViewPool
+
+
+class StepClock:
+    """Each creation takes `step` seconds on this clock."""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls % 2 == 0:
+            self.now += self.step
+        return self.now
+
+
+def test_pool_hits_after_replenish_and_misses_when_empty():
+    made, discarded = [], []
+
+    def create():
+        made.append(object())
+        return made[-1]
+
+    pool = WebViewPool(create, discarded.append, size=2, clock=StepClock(0.02))
+    assert len(pool) == 0
+    assert pool.replenish() == 1 and pool.replenish(max_new=5) == 1
+    assert not pool.needs_replenish()
+    first = pool.acquire()
+    assert first is made[0] and first not in pool
+    pool.acquire()
+    third = pool.acquire()
+    assert third is made[2]
+
+    stats = pool.stats()
+    assert (stats["hits"], stats["misses"], stats["created"]) == (2, 1, 3)
+    assert stats["create_latency_ms"]["<=25ms"] == 3
+    assert abs(stats["avg_create_ms"] - 20.0) < 1e-6
+
+
+def test_pool_shrinks_to_the_live_budget_limit():
+    discarded = []
+    pool = WebViewPool(object, discarded.append, size=3)
+    pool.replenish(max_new=3)
+    assert len(pool) == 3
+    # Only one more live webview fits: the pool gives back the rest
+    assert pool.replenish(limit=1) == 0 and len(pool) == 1 and len(discarded) == 2
+    assert not pool.needs_replenish(limit=1)
+    pool.set_size(0)
+    assert len(pool) == 0 and len(discarded) == 3
+    assert pool.acquire() is not None and pool.stats()["misses"] == 1
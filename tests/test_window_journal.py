@@ -0,0 +1,46 @@
+from bubble.utils.window_journal import OP_CLOSE, OP_CREATE, OP_RENAME, WindowJournal
+
+
+def test_replay_folds_records_after_snapshot_seq(tmp_path):
+    journal = WindowJournal(str(tmp_path / "config.windows.jsonl"))
+    journal.append(OP_CREATE, "openai", "w1", info={"createdAt": "1"})
+    journal.append(OP_CREATE, "openai", "w2", info={"createdAt": "2"})
+    snapshot_seq = journal.last_seq
+    journal.append(OP_RENAME, "openai", "w2", title="Drafts")
+    journal.append(OP_CLOSE, "openai", "w1")
+
+    # Snapshot already contains the first two creates
+    windows = {"openai": {"w1": {"createdAt": "1"}, "w2": {"createdAt": "2"}}}
+    last = WindowJournal(journal.path).replay(windows, after_seq=snapshot_seq)
+
+    assert last == 4
+    assert windows == {"openai": {"w2": {"createdAt": "2", "title": "Drafts"}}}
+
+
+def test_torn_trailing_line_is_ignored(tmp_path):
+    path = tmp_path / "config.windows.jsonl"
+    journal = WindowJournal(str(path))
+    journal.append(OP_CREATE, "kimi", "w1", info={})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 2, "op": "cre')
+
+    reopened = WindowJournal(str(path))
+    assert reopened.last_seq == 1
+    assert reopened.replay({}) == 1
+    # Sequence numbers continue after the last good record, on a fresh line
+    assert reopened.append(OP_CREATE, "kimi", "w2", info={}) == 2
+    windows = {}
+    assert WindowJournal(str(path)).replay(windows) == 2
+    assert windows == {"kimi": {"w1": {}, "w2": {}}}
+
+
+def test_compaction_keeps_only_unfolded_records(tmp_path):
+    journal = WindowJournal(str(tmp_path / "config.windows.jsonl"), max_records=3)
+    for i in range(3):
+        journal.append(OP_CREATE, "openai", f"w{i}", info={})
+    assert journal.needs_compaction()
+
+    journal.compact_through(2)
+    assert not journal.needs_compaction()
+    assert [r["wid"] for r in journal.records()] == ["w2"]
+    assert journal.append(OP_CLOSE, "openai", "w2") == 4
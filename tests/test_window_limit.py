@@ -12,3 +12,70 @@ def test_window_manager_unlimited_creation():
         assert w is not None
         ids.append(w.window_id)
     assert len(wm.windows) >= 7
+
+
+def test_window_manager_indexes_stay_consistent():
+    from bubble.models.ai_window import WindowManager, WindowState
+
+    wm = WindowManager()
+    a1 = wm.create_window("openai")
+    a2 = wm.create_window("openai")
+    k1 = wm.create_window("kimi")
+    assert wm.get_platform_window_ids("openai") == [a1.window_id, a2.window_id]
+    assert wm.get_platform_window_count("kimi") == 1
+
+    wm.set_active_window(a2.window_id)
+    k1.minimize()
+    a1.state = WindowState.LOADING  # direct assignment is tracked too
+    assert wm.count_in_state(WindowState.ACTIVE) == 1
+    assert wm.get_windows_in_state(WindowState.MINIMIZED) == [k1]
+    assert {w.window_id for w in wm.get_visible_windows()} == {a1.window_id, a2.window_id}
+    assert wm.check_consistency() == []
+
+    assert wm.close_platform_windows("openai") == 2
+    assert wm.get_platform_windows("openai") == []
+    # A removed window no longer feeds the index
+    a1.activate()
+    assert wm.count_in_state(WindowState.ACTIVE) == 0
+    assert wm.check_consistency() == []
+
+    restored = WindowManager.from_dict(wm.to_dict())
+    assert restored.get_platform_window_ids("kimi") == [k1.window_id]
+    assert restored.check_consistency() == []
+
+
+def test_window_manager_reencodes_only_changed_windows():
+    from bubble.models.ai_window import AIWindow, WindowManager
+
+    wm = WindowManager()
+    a = wm.create_window("openai")
+    b = wm.create_window("kimi")
+    first = wm.snapshot_changes()
+    assert set(first["changed"]) == {a.window_id, b.window_id}
+    assert first["removed"] == []
+
+    cached = a.serialized()
+    assert not a.dirty and wm.snapshot_changes()["changed"] == {}
+
+    # Resizing to the same frame keeps the fragment; a real resize re-encodes it
+    g = a.geometry
+    a.update_geometry(g.x, g.y, g.width, g.height)
+    assert a.serialized() is cached
+    a.update_geometry(10, 20, 300, 400)
+    assert a.dirty
+    b.set_session_data("scroll", 5)
+    wm.remove_window(b.window_id)
+    delta = wm.snapshot_changes()
+    assert list(delta["changed"]) == [a.window_id]
+    assert delta["changed"][a.window_id]["geometry"] == {"x": 10, "y": 20, "width": 300, "height": 400}
+    assert delta["removed"] == [b.window_id]
+
+    # to_dict hands out copies, so callers cannot corrupt the cache
+    copy = a.to_dict()
+    copy["geometry"]["x"] = -1
+    assert a.serialized()["geometry"]["x"] == 10
+    assert AIWindow.from_dict(copy).geometry.x == -1
+    # Direct geometry writes are tracked as well
+    a.geometry.width = 500
+    assert list(wm.snapshot_changes()["changed"]) == [a.window_id]
+    assert WindowManager.from_dict(wm.to_dict()).get_window(a.window_id) == a
@@ -0,0 +1,45 @@
+from bubble.utils.window_ring import WindowRing
+
+
+def _ring(*ids):
+    ring = WindowRing()
+    for i in ids:
+        ring.add(i)
+    return ring
+
+
+def test_next_prev_wrap_and_follow_insertion_order():
+    ring = _ring("a", "b", "c")
+    assert list(ring) == ["a", "b", "c"]
+    assert ring.next("c") == "a"
+    assert ring.prev("a") == "c"
+    # Unknown current id starts from the head in both directions (legacy behaviour)
+    assert ring.next(None) == "a"
+    assert ring.prev("zzz") == "a"
+
+
+def test_remove_keeps_ring_linked():
+    ring = _ring("a", "b", "c", "d")
+    assert ring.remove("a")
+    assert ring.head == "b"
+    ring.remove("c")
+    assert list(ring) == ["b", "d"]
+    assert ring.next("d") == "b"
+    ring.remove("b")
+    ring.remove("d")
+    assert len(ring) == 0 and ring.next(None) is None
+    ring.add("e")
+    assert ring.next("e") == "e"
+
+
+def test_nth_and_skip_predicate():
+    ring = _ring("a", "b", "c", "d")
+    assert ring.nth(1) == "a"
+    assert ring.nth(3) == "c"
+    assert ring.nth(-1) == "d"
+    assert ring.nth(5) is None
+
+    suspended = {"b", "c"}
+    assert ring.next("a", skip=suspended.__contains__) == "d"
+    assert ring.prev("a", skip=suspended.__contains__) == "d"
+    assert ring.next("a", skip=lambda _id: True) is None
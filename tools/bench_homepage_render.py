@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: homepage render with a cached static shell vs. a full rebuild.
+
+The homepage is a static shell (styles, driver.js CSS, scripts, localized
+strings) compiled once per (language, appearance), plus per-render platform
+rows and tour flags. Reported per render:
+- cold: shell cache dropped before each render (the pre-cache behaviour)
+- warm: cached shell, rows + tour flags only
+- rows / shell: the two halves in isolation
+- patch: row-state diff against the last rendered document (what a
+  window add/remove sends through applyPatch instead of a full reload)
+- asset reads: file reads by the shared asset cache during the timed runs
+  (should be 0 once icons and driver CSS are warm)
+
+With --scheme, styles, scripts and icons are referenced as bubble:// URLs
+(served by the app's scheme handler) instead of being inlined.
+
+Config is read from a scratch directory, so the real user config is untouched.
+Needs the macOS build environment (PyObjC).
+
+Usage:
+  PYTHONPATH=src python3 tools/bench_homepage_render.py [--windows 3] [--number 200] [--scheme]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from bubble.components.config_manager import ConfigManager  # noqa: E402
+
+SCRATCH = tempfile.mkdtemp(prefix="bubble_bench_")
+ConfigManager._new_app_support_dir = classmethod(lambda cls: SCRATCH)
+ConfigManager._old_app_support_dir = classmethod(lambda cls: SCRATCH + "/old")
+
+from bubble.components.homepage_manager import HomepageManager  # noqa: E402
+from bubble.components.homepage_template import current_appearance  # noqa: E402
+from bubble.utils.asset_cache import AssetCache  # noqa: E402
+from bubble.i18n import get_language  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--windows", type=int, default=3, help="pages per enabled platform")
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--scheme", action="store_true", help="reference assets via bubble:// instead of inlining")
+    args = parser.parse_args()
+
+    hm = HomepageManager.alloc().init()
+    hm.set_asset_scheme(args.scheme)
+    for pid in ("openai", "claude", "gemini"):
+        hm.add_platform(pid)
+        for i in range(args.windows):
+            hm.add_platform_window(pid, f"{pid}-{i}", {"createdAt": str(i)})
+
+    language, appearance = get_language(), current_appearance()
+
+    def cold():
+        hm._homepage_templates.invalidate()
+        return hm.show_homepage()
+
+    def per_call_ms(fn) -> float:
+        return timeit.timeit(fn, number=args.number) / args.number * 1e3
+
+    html = hm.show_homepage()
+    shell = hm._homepage_templates.get(language, appearance)
+    rows = hm._render_platform_rows()
+    print(f"html {len(html)} chars: shell {shell.static_size()} static + rows {len(rows)}")
+    reads_before = AssetCache.shared().stats()["reads"]
+    print(f"{'case':>6} {'ms/render':>10}")
+    for name, fn in (
+        ("cold", cold),
+        ("warm", hm.show_homepage),
+        ("rows", hm._render_platform_rows),
+        ("shell", lambda: hm._build_homepage_shell(language, appearance)),
+        ("patch", hm.homepage_patch),
+    ):
+        print(f"{name:>6} {per_call_ms(fn):>10.3f}")
+    hm.add_platform_window("claude", "claude-extra", {"createdAt": "9"})
+    patch = hm.homepage_patch(["claude"])
+    print(f"patch after adding a page: {len(json.dumps(patch, ensure_ascii=False))} chars (full html {len(html)})")
+    print(f"asset reads during runs: {AssetCache.shared().stats()['reads'] - reads_before}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-navigation full-DOM pointer-events sweep vs. the one-time user script.
+
+Writes a self-contained HTML page that builds a large synthetic chat DOM
+(a few nodes carry inline `pointer-events: none`) and measures in the
+browser:
+- legacy: `querySelectorAll('*')` + style check on every element (what
+  didFinishNavigation used to evaluate after each navigation)
+- user script: first run of POINTER_EVENTS_FIX_JS (attribute-selector sweep
+  + MutationObserver install), then the selector sweep alone
+- streaming: appending message chunks without / with the observer attached
+
+Open the page in Safari (same WebKit as WKWebView) and read the table.
+
+Usage:
+  python3 tools/bench_pointer_events.py [--nodes 50000] [--disabled 20] [--runs 15] [--open]
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import tempfile
+import webbrowser
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_fix_script() -> str:
+    # Load the module by path: importing bubble.components pulls in AppKit
+    path = ROOT / "src" / "bubble" / "components" / "webview_factory.py"
+    spec = importlib.util.spec_from_file_location("_bench_webview_factory", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.POINTER_EVENTS_FIX_JS
+
+
+PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>pointer-events sweep benchmark</title>
+<style>body{font:13px -apple-system,sans-serif;margin:16px} td,th{padding:2px 10px;text-align:right}</style>
+</head><body>
+<h3>pointer-events sweep: %(nodes)d nodes, %(disabled)d disabled, %(runs)d runs</h3>
+<table id="out"><tr><th>case</th><th>median ms</th><th>min ms</th></tr></table>
+<div id="chat"></div>
+<script>
+const NODES = %(nodes)d, DISABLED = %(disabled)d, RUNS = %(runs)d;
+const FIX_SRC = %(fix)s;
+
+function buildMessage(i) {
+  const msg = document.createElement('div');
+  msg.className = 'msg';
+  for (let p = 0; p < 4; p++) {
+    const para = document.createElement('p');
+    for (let s = 0; s < 3; s++) {
+      const span = document.createElement('span');
+      span.textContent = 'token ' + i + '.' + p + '.' + s + ' ';
+      para.appendChild(span);
+    }
+    msg.appendChild(para);
+  }
+  return msg;  // 17 elements
+}
+
+function build(root, count) {
+  const frag = document.createDocumentFragment();
+  for (let i = 0; i * 17 < count; i++) { frag.appendChild(buildMessage(i)); }
+  root.appendChild(frag);
+}
+
+function disableSome(root, k) {
+  const all = root.getElementsByTagName('*');
+  for (let i = 0; i < k; i++) {
+    all[Math.floor((i + 0.5) * all.length / k)].style.pointerEvents = 'none';
+  }
+}
+
+function legacySweep() {
+  document.body.style.pointerEvents = 'auto';
+  var elements = document.querySelectorAll('*');
+  for (var i = 0; i < elements.length; i++) {
+    if (elements[i].style.pointerEvents === 'none') { elements[i].style.pointerEvents = 'auto'; }
+  }
+}
+
+function selectorSweep() {
+  var found = document.documentElement.querySelectorAll('[style*="pointer-events"]');
+  for (var i = 0; i < found.length; i++) {
+    if (found[i].style.pointerEvents === 'none') { found[i].style.pointerEvents = 'auto'; }
+  }
+}
+
+function time(fn) { const t = performance.now(); fn(); return performance.now() - t; }
+
+function report(name, samples) {
+  samples.sort((a, b) => a - b);
+  const row = document.getElementById('out').insertRow();
+  row.insertCell().textContent = name;
+  row.insertCell().textContent = samples[samples.length >> 1].toFixed(3);
+  row.insertCell().textContent = samples[0].toFixed(3);
+}
+
+async function streamChunk(chat) {
+  const t = performance.now();
+  const msg = buildMessage(0);
+  msg.style.pointerEvents = 'none';
+  chat.appendChild(msg);
+  await Promise.resolve();  // MutationObserver callbacks run as microtasks before this resumes
+  return performance.now() - t;
+}
+
+async function main() {
+  const chat = document.getElementById('chat');
+  build(chat, NODES);
+  const samples = { legacy: [], selector: [], streamPlain: [], streamObserved: [] };
+  for (let r = 0; r < RUNS; r++) { disableSome(chat, DISABLED); samples.legacy.push(time(legacySweep)); }
+  for (let r = 0; r < RUNS; r++) { disableSome(chat, DISABLED); samples.selector.push(time(selectorSweep)); }
+  for (let r = 0; r < RUNS; r++) { samples.streamPlain.push(await streamChunk(chat)); }
+  disableSome(chat, DISABLED);
+  const first = time(() => new Function(FIX_SRC)());
+  for (let r = 0; r < RUNS; r++) { samples.streamObserved.push(await streamChunk(chat)); }
+  report('legacy full sweep (per navigation)', samples.legacy);
+  report('user script first run (once per page)', [first]);
+  report('attribute-selector sweep', samples.selector);
+  report('append message, no observer', samples.streamPlain);
+  report('append message, with observer', samples.streamObserved);
+}
+main();
+</script></body></html>
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=50_000)
+    parser.add_argument("--disabled", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--output", type=Path, default=Path(tempfile.gettempdir()) / "bubble_bench_pointer_events.html")
+    parser.add_argument("--open", action="store_true", help="open the page in the default browser")
+    args = parser.parse_args()
+
+    html = PAGE % {
+        "nodes": args.nodes,
+        "disabled": args.disabled,
+        "runs": args.runs,
+        "fix": json.dumps(_load_fix_script()),
+    }
+    args.output.write_text(html, encoding="utf-8")
+    print(f"Benchmark page written to {args.output}")
+    if args.open:
+        webbrowser.open(args.output.resolve().as_uri())
+
+
+if __name__ == "__main__":
+    main()
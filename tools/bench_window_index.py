@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: WindowManager platform/state lookups vs. number of windows.
+
+With the secondary indexes, per-call cost of count/lookup for one platform
+should stay flat from 10 to 10,000 windows (the old implementation scanned
+every window on each call).
+
+Usage:
+  PYTHONPATH=src python3 tools/bench_window_index.py
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from bubble.models.ai_window import WindowManager, WindowState  # noqa: E402
+
+PLATFORMS = ("openai", "claude", "gemini", "grok", "deepseek", "qwen", "kimi", "zai")
+
+
+def _linear_platform_scan(wm: WindowManager, platform_id: str):
+    # The pre-index implementation, kept here for comparison
+    return [w for w in wm.windows.values() if w.platform_id == platform_id]
+
+
+def bench(n: int, number: int = 2000) -> dict:
+    wm = WindowManager()
+    for i in range(n):
+        w = wm.create_window(PLATFORMS[i % len(PLATFORMS)])
+        if i % 3 == 0:
+            w.minimize()
+    # Look up a small platform so k stays constant while n grows
+    rare = wm.create_window("perplexity")
+    assert wm.check_consistency() == []
+
+    def per_call_us(stmt) -> float:
+        return timeit.timeit(stmt, number=number) / number * 1e6
+
+    return {
+        "n": n,
+        "count": per_call_us(lambda: wm.get_platform_window_count("perplexity")),
+        "can_create": per_call_us(lambda: wm.can_create_window("perplexity")),
+        "lookup": per_call_us(lambda: wm.get_platform_windows("perplexity")),
+        "state_count": per_call_us(lambda: wm.count_in_state(WindowState.MINIMIZED)),
+        "linear_scan": per_call_us(lambda: _linear_platform_scan(wm, rare.platform_id)),
+    }
+
+
+def main() -> None:
+    header = f"{'windows':>8} {'count':>10} {'can_create':>11} {'lookup':>10} {'state_cnt':>10} {'old_scan':>10}  (µs/call)"
+    print(header)
+    for n in (10, 100, 1_000, 10_000):
+        r = bench(n)
+        print(f"{r['n']:>8} {r['count']:>10.3f} {r['can_create']:>11.3f} {r['lookup']:>10.3f} "
+              f"{r['state_count']:>10.3f} {r['linear_scan']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: bytes per AIWindow, slotted model vs. the previous dataclass.
+
+Measures tracemalloc-attributed allocations for N restored window records
+(from_dict of the persisted format, i.e. the startup-restore path) and for N
+freshly created windows.
+
+Usage:
+  PYTHONPATH=src python3 tools/bench_window_memory.py [N]
+"""
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from bubble.models.ai_window import AIWindow, WindowGeometry, WindowState, WindowType  # noqa: E402
+
+
+# ----- Replica of the pre-slots dataclass model, for comparison -----
+@dataclass
+class LegacyGeometry:
+    x: int = 100
+    y: int = 100
+    width: int = 800
+    height: int = 600
+
+
+@dataclass
+class LegacyAIWindow:
+    window_id: str
+    platform_id: str
+    window_type: WindowType = WindowType.MAIN
+    state: WindowState = WindowState.INACTIVE
+    geometry: LegacyGeometry = field(default_factory=LegacyGeometry)
+    created_at: datetime = field(default_factory=datetime.now)
+    last_active_at: Optional[datetime] = None
+    url: Optional[str] = None
+    title: Optional[str] = None
+    user_agent: Optional[str] = None
+    session_data: Dict = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LegacyAIWindow":
+        g = data.get("geometry", {})
+        return cls(
+            window_id=data["window_id"],
+            platform_id=data["platform_id"],
+            window_type=WindowType(data.get("window_type", "main")),
+            state=WindowState(data.get("state", "inactive")),
+            geometry=LegacyGeometry(g.get("x", 100), g.get("y", 100), g.get("width", 800), g.get("height", 600)),
+            created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else datetime.now(),
+            last_active_at=datetime.fromisoformat(data["last_active_at"]) if data.get("last_active_at") else None,
+            url=data.get("url"),
+            title=data.get("title"),
+            user_agent=data.get("user_agent"),
+            session_data=data.get("session_data", {}),
+        )
+
+
+def _records(n: int):
+    now = datetime.now().isoformat()
+    return [
+        {
+            "window_id": str(uuid.uuid4()),
+            "platform_id": "openai",
+            "window_type": "main",
+            "state": "inactive",
+            "geometry": {"x": 100, "y": 100, "width": 800, "height": 600},
+            "created_at": now,
+            "last_active_at": now if i % 2 else None,
+            "url": "https://chatgpt.com/",
+            "title": None,
+            "user_agent": None,
+            "session_data": {},
+        }
+        for i in range(n)
+    ]
+
+
+def _measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objs = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objs
+    return size
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    records = _records(n)
+    # Window ids are shared with the records, so only the per-object overhead is counted
+    cases = {
+        "restore (from_dict)": (
+            lambda: [LegacyAIWindow.from_dict(r) for r in records],
+            lambda: [AIWindow.from_dict(r) for r in records],
+        ),
+        "create": (
+            lambda: [LegacyAIWindow(window_id=r["window_id"], platform_id="openai") for r in records],
+            lambda: [AIWindow(window_id=r["window_id"], platform_id="openai", geometry=WindowGeometry()) for r in records],
+        ),
+    }
+    print(f"N = {n}")
+    print(f"{'case':<22} {'legacy B/win':>13} {'slotted B/win':>14} {'saving':>8}")
+    for name, (legacy, slotted) in cases.items():
+        lb = _measure(legacy) / n
+        sb = _measure(slotted) / n
+        print(f"{name:<22} {lb:>13.0f} {sb:>14.0f} {1 - sb / lb:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: WindowManager serialization vs. number of changed windows.
+
+With per-window dirty tracking, snapshot cost should follow the number of
+windows touched since the last snapshot (here: resized), not the total
+window count. The full re-encode (the pre-cache behaviour) is shown for
+comparison.
+
+Usage:
+  PYTHONPATH=src python3 tools/bench_window_serialize.py
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from bubble.models.ai_window import WindowManager  # noqa: E402
+
+PLATFORMS = ("openai", "claude", "gemini", "grok", "deepseek", "qwen", "kimi", "zai")
+
+
+def bench(n: int, changed: int, number: int = 50) -> dict:
+    wm = WindowManager()
+    windows = [wm.create_window(PLATFORMS[i % len(PLATFORMS)]) for i in range(n)]
+    wm.snapshot_changes()
+    tick = [0]
+
+    def resize_and_snapshot():
+        tick[0] += 1
+        for w in windows[:changed]:
+            w.update_geometry(tick[0], tick[0], 800, 600)
+        return wm.snapshot_changes()
+
+    def full_encode():
+        return {w.window_id: w._encode() for w in windows}
+
+    assert len(resize_and_snapshot()["changed"]) == changed
+
+    def per_call_ms(fn) -> float:
+        return timeit.timeit(fn, number=number) / number * 1e3
+
+    return {
+        "n": n,
+        "changed": changed,
+        "incremental": per_call_ms(resize_and_snapshot),
+        "full": per_call_ms(full_encode),
+    }
+
+
+def main() -> None:
+    print(f"{'windows':>8} {'changed':>8} {'incremental':>12} {'full':>10}  (ms/snapshot)")
+    for n in (100, 1_000, 10_000):
+        for changed in sorted({1, 10, n // 10}):
+            r = bench(n, changed)
+            print(f"{r['n']:>8} {r['changed']:>8} {r['incremental']:>12.3f} {r['full']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()